@@ -10,13 +10,50 @@
 
 import heapq
 import random
-from collections import deque
-from typing import List, Tuple, Set, Dict, Optional
+import threading
+import time
+from itertools import combinations
+from typing import Callable, List, Tuple, Set, Dict, Optional
+
+from batch_eval import batch_path_lengths
+from bitboard import BitboardGrid, shape_of
+from d_star_lite import DStarLite
+from distance_field import DistanceField, WallProximityField
+from game_state import protected_mask
+from jump_point_search import jump_point_search
+from landmarks import LandmarkHeuristic
+from mcts import MonteCarloTreeSearch
+from search_board import SearchBoard
+from search_stats import SearchStats
+from wall_candidates import rank_wall_placements, shortest_path_dag
+from transposition import EXACT, LOWER_BOUND, UPPER_BOUND, TranspositionTable, ZobristKeys
+
+
+# Path planners MazeRunnerAI can use for its shortest path
+RUNNER_PLANNERS = ("astar", "jps", "dstar")
+
+# Search strategies MazeMasterAI can decide with
+MASTER_STRATEGIES = ("minimax", "mcts")
+
+# Null-window width for principal variation search (evaluations are floats)
+PVS_WINDOW = 1e-6
+
+# Moves that caused a cutoff remembered per ply
+KILLER_SLOTS = 2
+
+
+class SearchTimeout(Exception):
+    """Raised inside minimax when the per-move time budget runs out or the search is cancelled"""
+
 
 class MazeRunnerAI:
-    def __init__(self, grid_size: int):
+    def __init__(self, grid_size: int, planner: str = "astar"):
+        if planner not in RUNNER_PLANNERS:
+            raise ValueError(f"Unknown runner planner: {planner}")
         self.grid_size = grid_size
+        self.planner = planner  # "astar", "jps" (Jump Point Search) or "dstar" (incremental D* Lite)
         self.walls: Set[Tuple[int, int]] = set()
+        self.grid = BitboardGrid(grid_size)
         self.player_pos = (0, 0)
         self.end_pos = (grid_size - 1, grid_size - 1)
         self.skill_1_available = True
@@ -24,10 +61,26 @@ class MazeRunnerAI:
         self.skill_3_available = False
         self.rounds_since_skill3 = 0
         self.total_steps = 0
+        self.goal_field: Optional[DistanceField] = None  # Goal-rooted BFS distances for the current walls
+        self.d_star: Optional[DStarLite] = None  # D* Lite tree to the goal, kept across decisions
+        self.landmarks = LandmarkHeuristic(grid_size)  # ALT bounds for a_star_search, refreshed lazily
+        self.board_version = 0  # Bumped whenever update_state brings a different wall set
+        self.path: Optional[List[Tuple[int, int]]] = None  # Last planned path to the goal
+        self.path_index: Dict[Tuple[int, int], int] = {}  # Position -> index on self.path
+        self.path_start = 0  # Index on self.path from which it was last checked; earlier tiles may be stale
+        self.path_version = -1  # board_version the path was planned or last checked against
+        self.path_walls = 0  # Wall bitboard the path was planned or last checked against
+        self.stats = SearchStats()  # Statistics of the decision in progress
+        self.last_stats: Optional[SearchStats] = None  # Statistics of the last finished decision
+        self.stats_callback: Optional[Callable[[SearchStats], None]] = None  # Called with each decision's stats
 
     def update_state(self, walls: Set[Tuple[int, int]], player_pos: Tuple[int, int], rounds_since_last_skill3: int = None):
         """Update the AI's knowledge of the game state"""
         self.walls = walls
+        previous_walls = self.grid.walls
+        self.grid.set_walls(walls)
+        if self.grid.walls != previous_walls:
+            self.board_version += 1
         self.player_pos = player_pos
         
         # Update skill 3 availability based on rounds
@@ -41,31 +94,27 @@ class MazeRunnerAI:
         
     def get_valid_moves(self, pos: Tuple[int, int], max_distance: int = 1) -> List[Tuple[int, int]]:
         """Get all valid moves from current position"""
-        x, y = pos
-        valid_tiles = []
-        
-        # Regular movement (up, down, left, right)
-        for dx, dy in [(-1, 0), (1, 0), (0, -1), (0, 1)]:
-            new_x, new_y = x + dx, y + dy
-            if (0 <= new_x < self.grid_size and 
-                0 <= new_y < self.grid_size and 
-                (new_x, new_y) not in self.walls):
-                valid_tiles.append((new_x, new_y))
-                
-        return valid_tiles
+        # Regular movement (up, down, left, right) read straight off the bitboard
+        return self.grid.neighbors(pos)
 
     def a_star_search(self, start: Tuple[int, int], goal: Tuple[int, int]) -> Optional[List[Tuple[int, int]]]:
-        """A* search algorithm for pathfinding"""
-        def heuristic(pos: Tuple[int, int]) -> float:
-            return abs(pos[0] - goal[0]) + abs(pos[1] - goal[1])
+        """A* search algorithm for pathfinding, guided by landmark (ALT) distance bounds"""
+        builds = self.landmarks.builds
+        heuristic = self.landmarks.heuristic(self.grid, goal)
+        if self.landmarks.builds != builds:
+            self.stats.cache_misses += 1
+        else:
+            self.stats.cache_hits += 1
         
         frontier = []
-        heapq.heappush(frontier, (0, start))
+        heapq.heappush(frontier, (0, 0, start))
         came_from = {start: None}
         cost_so_far = {start: 0}
+        expanded = 0
         
         while frontier:
-            current = heapq.heappop(frontier)[1]
+            current = heapq.heappop(frontier)[2]
+            expanded += 1
             
             if current == goal:
                 break
@@ -75,8 +124,11 @@ class MazeRunnerAI:
                 if next_pos not in cost_so_far or new_cost < cost_so_far[next_pos]:
                     cost_so_far[next_pos] = new_cost
                     priority = new_cost + heuristic(next_pos)
-                    heapq.heappush(frontier, (priority, next_pos))
+                    # Ties go to the deeper node: with tight ALT bounds that runs straight down one shortest path
+                    heapq.heappush(frontier, (priority, -new_cost, next_pos))
                     came_from[next_pos] = current
+        self.stats.astar_calls += 1
+        self.stats.nodes += expanded
         
         # Reconstruct path
         if goal not in came_from:
@@ -90,41 +142,143 @@ class MazeRunnerAI:
         path.reverse()
         return path
 
+    def jump_point_search(self, start: Tuple[int, int], goal: Tuple[int, int]) -> Optional[List[Tuple[int, int]]]:
+        """Jump Point Search for the same shortest path length as a_star_search, expanding far fewer cells"""
+        self.stats.astar_calls += 1
+        return jump_point_search(self.grid, start, goal, self.stats)
+
+    def d_star_lite_search(self, start: Tuple[int, int]) -> Optional[List[Tuple[int, int]]]:
+        """Shortest path to the goal, repairing the D* Lite tree kept from earlier calls"""
+        self.stats.astar_calls += 1
+        if self.d_star is None:
+            self.d_star = DStarLite(self.grid_size, self.end_pos)
+        return self.d_star.plan(self.grid, start, self.stats)
+
+    def find_path(self, start: Tuple[int, int], goal: Tuple[int, int]) -> Optional[List[Tuple[int, int]]]:
+        """Shortest path with the selected planner"""
+        if self.planner == "jps":
+            return self.jump_point_search(start, goal)
+        if self.planner == "dstar" and goal == self.end_pos:
+            return self.d_star_lite_search(start)
+        return self.a_star_search(start, goal)
+
+    def plan_path(self) -> Optional[List[Tuple[int, int]]]:
+        """Path from the player to the goal, reusing the last one while it is still shortest.
+
+        The last path is kept while the player stands on it and the board is
+        unchanged. After a wall change it is only replanned when a new wall
+        lands on the part still ahead, or when a broken wall could open a
+        shortcut: a path through a broken tile is at least the manhattan
+        distance via that tile, so a tile no closer than the remaining path
+        cannot shorten it. Added walls elsewhere leave the path both open and
+        shortest.
+        """
+        start = self.player_pos
+        at = self.path_index.get(start, -1) if self.path is not None else -1
+        if at < self.path_start:
+            at = None
+        elif self.path_version != self.board_version:
+            walls = self.grid.walls
+            added = walls & ~self.path_walls
+            removed = self.path_walls & ~walls
+            remaining = len(self.path) - 1 - at
+            path_index = self.path_index
+            goal_x, goal_y = self.end_pos
+            if any(path_index.get(tile, -1) >= at for tile in self.grid.tiles_of(added)):
+                at = None
+            elif any(abs(x - start[0]) + abs(y - start[1]) + abs(x - goal_x) + abs(y - goal_y) < remaining
+                     for x, y in self.grid.tiles_of(removed)):
+                at = None
+            else:
+                self.path_version = self.board_version
+                self.path_walls = walls
+                self.path_start = at
+        if at is not None:
+            self.stats.cache_hits += 1
+            return self.path[at:]
+
+        self.stats.cache_misses += 1
+        path = self.find_path(start, self.end_pos)
+        self.path = path
+        self.path_index = {} if path is None else {pos: i for i, pos in enumerate(path)}
+        self.path_version = self.board_version
+        self.path_walls = self.grid.walls
+        self.path_start = 0
+        return path
+
+    def get_goal_field(self) -> DistanceField:
+        """Distance field rooted at the goal, rebuilt only when the walls change"""
+        if self.goal_field is None or not self.goal_field.is_current(self.grid):
+            self.stats.cache_misses += 1
+            self.goal_field = DistanceField(self.grid, self.end_pos)
+        else:
+            self.stats.cache_hits += 1
+        return self.goal_field
+
+    def find_wall_break(self) -> Optional[Tuple[int, int]]:
+        """Pick the wall whose removal opens the shortest path to the goal.
+
+        When the runner is cut off, any new path must pass through the broken
+        wall, so its length is (closest neighbor reachable from the player) +
+        (closest neighbor reachable from the goal) + 2 steps. One BFS from each
+        side scores every wall without touching the wall set.
+        """
+        player_field = DistanceField(self.grid, self.player_pos)
+        goal_field = self.get_goal_field()
+        player_dist = player_field.dist
+        goal_dist = goal_field.dist
+        neighbors = self.grid.tables.neighbors
+        size = self.grid_size
+
+        best_wall = None
+        best_path_length = float('inf')
+        best_distance_to_goal = float('inf')
+        for wall in self.walls:
+            index = wall[1] * size + wall[0]
+            from_player = min((player_dist[n] for n in neighbors[index] if player_dist[n] >= 0), default=None)
+            to_goal = min((goal_dist[n] for n in neighbors[index] if goal_dist[n] >= 0), default=None)
+            if from_player is None or to_goal is None:
+                continue
+
+            # Count tiles like len(path): steps to the wall, the wall itself, steps on to the goal
+            path_length = from_player + to_goal + 3
+            distance_to_goal = abs(wall[0] - self.end_pos[0]) + abs(wall[1] - self.end_pos[1])
+            # Prioritize walls that create shorter paths and are closer to the goal
+            if path_length < best_path_length or (path_length == best_path_length and distance_to_goal < best_distance_to_goal):
+                best_wall = wall
+                best_path_length = path_length
+                best_distance_to_goal = distance_to_goal
+        return best_wall
+
     def decide_move(self) -> Tuple[Tuple[int, int], str, bool]:
-        """Decide the next move and whether to use a skill"""
+        """Decide the next move and whether to use a skill; its statistics land in last_stats"""
+        self.stats = SearchStats()
+        try:
+            return self._decide_move()
+        finally:
+            self.last_stats = self.stats.finish()
+            if self.stats_callback is not None:
+                self.stats_callback(self.last_stats)
+
+    def _decide_move(self) -> Tuple[Tuple[int, int], str, bool]:
         # Try to find optimal path
-        path = self.a_star_search(self.player_pos, self.end_pos)
+        with self.stats.phase("path"):
+            path = self.plan_path()
         
         # If no path exists, we're blocked - try to use skills to unblock
         if not path:
             # First priority: Use wall break if available
             if self.skill_3_available:
                 # Find the most strategic wall to break
-                best_wall = None
-                best_path_length = float('inf')
-                best_distance_to_goal = float('inf')
-                
-                # Look for walls that might be blocking the path
-                for wall in self.walls:
-                    # Calculate manhattan distance to goal
-                    distance_to_goal = abs(wall[0] - self.end_pos[0]) + abs(wall[1] - self.end_pos[1])
-                    
-                    # Temporarily remove wall to check if it creates a path
-                    self.walls.remove(wall)
-                    test_path = self.a_star_search(self.player_pos, self.end_pos)
-                    self.walls.add(wall)
-                    
-                    if test_path:
-                        # Prioritize walls that create shorter paths and are closer to the goal
-                        path_length = len(test_path)
-                        if path_length < best_path_length or (path_length == best_path_length and distance_to_goal < best_distance_to_goal):
-                            best_wall = wall
-                            best_path_length = path_length
-                            best_distance_to_goal = distance_to_goal
+                with self.stats.phase("wall_break"):
+                    best_wall = self.find_wall_break()
                 
                 if best_wall:
                     return best_wall, "skill_3", True
 
+            # One goal-rooted distance map scores every teleport target and fallback move
+            goal_field = self.get_goal_field()
+
             # Second priority: Use teleport if available
             if self.skill_2_available:
                 # Try to teleport to a position that might lead to better options
@@ -136,15 +290,13 @@ class MazeRunnerAI:
                 for dx in range(-2, 3):
                     for dy in range(-2, 3):
                         new_x, new_y = x + dx, y + dy
-                        if (0 <= new_x < self.grid_size and 
-                            0 <= new_y < self.grid_size and 
-                            (new_x, new_y) not in self.walls):
+                        if self.grid.is_open((new_x, new_y)):
                             # Calculate manhattan distance to goal
                             distance_to_goal = abs(new_x - self.end_pos[0]) + abs(new_y - self.end_pos[1])
                             
-                            test_path = self.a_star_search((new_x, new_y), self.end_pos)
-                            if test_path:
-                                path_length = len(test_path)
+                            steps = goal_field.distance((new_x, new_y))
+                            if steps is not None:
+                                path_length = steps + 1
                                 if path_length < best_path_length or (path_length == best_path_length and distance_to_goal < best_distance_to_goal):
                                     best_teleport = (new_x, new_y)
                                     best_path_length = path_length
@@ -157,9 +309,10 @@ class MazeRunnerAI:
             # This helps stall for skill cooldowns
             valid_moves = self.get_valid_moves(self.player_pos)
             if valid_moves:
-                # Choose the move that gets us closest to the goal
-                best_move = min(valid_moves, 
-                              key=lambda pos: abs(pos[0] - self.end_pos[0]) + abs(pos[1] - self.end_pos[1]))
+                # Choose the move that gets us closest to the goal (no neighbor can reach it
+                # either, since they share the runner's cut-off region)
+                best_move = min(valid_moves,
+                                key=lambda pos: abs(pos[0] - self.end_pos[0]) + abs(pos[1] - self.end_pos[1]))
                 return best_move, "none", False
             return self.player_pos, "none", False
 
@@ -171,43 +324,85 @@ class MazeRunnerAI:
         
         # Check if using extended move (Skill 1) would be beneficial
         if self.skill_1_available and len(path) > 3:
+            # Indices on the full stored path; path is its suffix starting at the player
+            path_index = self.path_index
+            offset = path_index[self.player_pos]
             extended_moves = []
             x, y = self.player_pos
             # Check horizontal and vertical lines
             for dx, dy in [(1,0), (-1,0), (0,1), (0,-1)]:
                 for i in range(1, 5):
                     new_x, new_y = x + dx*i, y + dy*i
-                    if (new_x, new_y) in self.walls or not (0 <= new_x < self.grid_size and 0 <= new_y < self.grid_size):
+                    if not self.grid.is_open((new_x, new_y)):
                         break
-                    if (new_x, new_y) in path:
+                    if path_index.get((new_x, new_y), -1) > offset:
                         extended_moves.append((new_x, new_y))
             
             if extended_moves:
-                best_move = min(extended_moves, key=lambda pos: path.index(pos))
-                if path.index(best_move) > 1:  # Only use if it gets us further than regular move
+                best_move = min(extended_moves, key=path_index.__getitem__)
+                if path_index[best_move] - offset > 1:  # Only use if it gets us further than regular move
                     return best_move, "skill_1", True
         
         # Default to next position in optimal path
         return next_pos, "none", False
 
 class MazeMasterAI:
-    def __init__(self, grid_size: int):
+    def __init__(self, grid_size: int, workers: int = 0, strategy: str = "minimax"):
+        if strategy not in MASTER_STRATEGIES:
+            raise ValueError(f"Unknown Maze Master strategy: {strategy}")
         self.grid_size = grid_size
+        self.strategy = strategy  # "minimax" (iterative-deepening alpha-beta) or "mcts" (Monte Carlo Tree Search)
         self.walls: Set[Tuple[int, int]] = set()
+        self.grid = BitboardGrid(grid_size)
         self.player_pos = (0, 0)
         self.end_pos = (grid_size - 1, grid_size - 1)
         self.skill_1_cooldown = 0
         self.skill_2_used = False
         self.skill_3_cooldown = 0
         self.difficulty = 0.5  # 0.0 to 1.0, adjusts based on player performance
-        self.max_depth = 2  # Reduced depth for better performance
-        self.move_cache = {}  # Cache for storing evaluated positions
+        self.max_depth = 2  # Deepest iterative-deepening iteration
+        self.time_budget: Optional[float] = None  # Seconds per decision; None searches to max_depth
+        self.last_search_depth = 0  # Depth of the last fully completed iteration
+        self.principal_variation: List = []  # Best line found by the last completed iteration
+        self._deadline: Optional[float] = None
+        self._stop_event: Optional[threading.Event] = None  # Set by the caller to cancel a running search
+        self._pv_table: List[List] = []
+        self.killers: List[List] = []  # Per ply: the latest moves that caused a cutoff there, newest first
+        self.wall_history: Dict[tuple, int] = {}  # Maze Master move -> cutoff score
+        self.runner_history: Dict[Tuple[Tuple[int, int], Tuple[int, int]], int] = {}  # (from, to) -> cutoff score
+        self.move_cache = {}  # Leaf evaluations keyed by Zobrist position hash
+        self.move_cache_limit = 200000  # Evaluations kept across turns before the cache is flushed
+        self.zobrist = ZobristKeys(grid_size)
+        self.field_cache: Dict[int, DistanceField] = {}  # Goal distance fields keyed by wall hash
+        self.candidate_cache: Dict[int, List[Tuple[Tuple[int, int], bool]]] = {}  # Ranked walls per position hash
+        self.candidate_limit = 5  # Wall placements searched per Maze Master node
+        self.root_ranking: Optional[Tuple[int, List[Tuple[Tuple[int, int], bool]]]] = None  # (position key, root walls by batch score)
+        self.pair_candidates = 6  # Ranked placements paired up for Double Walls
+        self.pair_limit = 2  # Double Walls pairs searched per Maze Master node
+        self.pair_cache: Dict[Tuple[int, bool], List[Tuple[tuple, tuple]]] = {}  # Pair moves per (position hash, is root)
+        self.planned_second_wall: Optional[Tuple[Tuple[int, int], bool]] = None  # Second wall of the Double Walls just chosen
+        self.transpositions = TranspositionTable()  # Search results, kept across turns
+        self.goal_field: Optional[DistanceField] = None  # Goal-rooted BFS distances for the current walls
+        self.proximity = WallProximityField(self.grid)  # Nearest-wall distances, patched as walls change
         self.last_move = None  # Track last move to prevent infinite loops
+        self.workers = workers  # Worker processes for the root search; 0 or 1 searches in this process
+        self.ponder_positions = 4  # Likely runner positions searched while the runner moves
+        self.ponder_results: Dict[int, Tuple[tuple, int, float]] = {}  # Root key -> (move, depth, seconds)
+        self.ponder_hits = 0
+        self.stats = SearchStats()  # Statistics of the decision in progress (pool workers keep their own)
+        self.last_stats: Optional[SearchStats] = None  # Statistics of the last finished decision
+        self.stats_callback: Optional[Callable[[SearchStats], None]] = None  # Called with each decision's stats
+        self.mcts_playouts = 200  # MCTS iterations per decision when there is no time budget
+        self.mcts = MonteCarloTreeSearch(self) if strategy == "mcts" else None
 
-    def update_state(self, walls: Set[Tuple[int, int]], player_pos: Tuple[int, int], player_steps: int):
-        """Update the AI's knowledge of the game state and adjust difficulty"""
+    def update_state(self, walls: Set[Tuple[int, int]], player_pos: Tuple[int, int], player_steps: int,
+                     adjust_difficulty: bool = True):
+        """Update the AI's knowledge of the game state and adjust difficulty (once per master turn)"""
         self.walls = walls
+        self.grid.set_walls(walls)
         self.player_pos = player_pos
+        if not adjust_difficulty:
+            return
         
         # Adjust difficulty based on player performance
         optimal_path = self.find_shortest_path(self.player_pos, self.end_pos)
@@ -219,41 +414,27 @@ class MazeMasterAI:
                 self.difficulty = max(0.2, self.difficulty - 0.1)  # Player doing well, decrease difficulty
 
     def find_shortest_path(self, start: Tuple[int, int], goal: Tuple[int, int]) -> Optional[List[Tuple[int, int]]]:
-        """Find shortest path using BFS"""
-        queue = deque([[start]])
-        visited = {start}
-        
-        while queue:
-            path = queue.popleft()
-            current = path[-1]
-            
-            if current == goal:
-                return path
-                
-            for dx, dy in [(-1, 0), (1, 0), (0, -1), (0, 1)]:
-                next_pos = (current[0] + dx, current[1] + dy)
-                if (0 <= next_pos[0] < self.grid_size and 
-                    0 <= next_pos[1] < self.grid_size and 
-                    next_pos not in self.walls and 
-                    next_pos not in visited):
-                    visited.add(next_pos)
-                    queue.append(path + [next_pos])
-        
-        return None
+        """Find shortest path using a goal-rooted BFS distance field"""
+        if goal == self.end_pos:
+            field = self.get_goal_field()
+        else:
+            field = DistanceField(self.grid, goal)
+        return field.path_from(start)
+
+    def get_goal_field(self) -> DistanceField:
+        """Distance field rooted at the goal, rebuilt only when the walls change"""
+        if self.goal_field is None or not self.goal_field.is_current(self.grid):
+            self.stats.cache_misses += 1
+            self.goal_field = DistanceField(self.grid, self.end_pos)
+        else:
+            self.stats.cache_hits += 1
+        return self.goal_field
 
     def is_valid_wall_position(self, x: int, y: int, is_horizontal: bool) -> bool:
         """Check if a wall can be placed at a specific position"""
-        if is_horizontal:
-            wall_positions = [(x + i, y) for i in range(3)]
-        else:
-            wall_positions = [(x, y + i) for i in range(3)]
-        
-        return all(0 <= wx < self.grid_size and 
-                  0 <= wy < self.grid_size and 
-                  (wx, wy) != self.player_pos and 
-                  (wx, wy) != self.end_pos and 
-                  (wx, wy) not in self.walls
-                  for wx, wy in wall_positions)
+        # One mask test covers bounds, existing walls, the player/goal tiles and the goal's protected area
+        blocked = self.grid.bit(self.player_pos) | self.grid.bit(self.end_pos) | protected_mask(self.grid, self.end_pos)
+        return self.grid.can_place((x, y), shape_of(is_horizontal), blocked)
 
     def get_strategic_wall_positions(self) -> List[Tuple[Tuple[int, int], bool]]:
         """Get strategic positions for wall placement"""
@@ -291,30 +472,131 @@ class MazeMasterAI:
         
         return positions
 
-    def evaluate_position(self, player_pos: Tuple[int, int], walls: Set[Tuple[int, int]]) -> float:
+    def enclosure_wall(self) -> Optional[Tuple[Tuple[int, int], bool]]:
+        """Legal plain wall whose origin is nearest the runner, or None if no wall fits anywhere"""
+        grid = self.grid
+        tables = grid.tables
+        blocked = grid.bit(self.player_pos) | grid.bit(self.end_pos) | protected_mask(grid, self.end_pos)
+        legal = {is_horizontal: grid.legal_origins(shape_of(is_horizontal), blocked)
+                 for is_horizontal in (True, False)}
+        if not (legal[True] | legal[False]):
+            return None
+        # Grow a diamond around the runner (through walls) until it reaches a legal origin
+        near = grid.bit(self.player_pos)
+        while True:
+            for is_horizontal in (True, False):
+                hits = near & legal[is_horizontal]
+                if hits:
+                    return grid.position((hits & -hits).bit_length() - 1), is_horizontal
+            near |= (((near & tables.not_last_col) << 1) | ((near & tables.not_first_col) >> 1) |
+                     (near << grid.size) | (near >> grid.size)) & tables.full
+
+    def generate_candidates(self, board: SearchBoard) -> List[Tuple[Tuple[int, int], bool]]:
+        """Wall placements for a search node, ranked by how much they hurt the runner"""
+        cache_key = board.position_key
+        candidates = self.candidate_cache.get(cache_key)
+        if candidates is None:
+            self.stats.cache_misses += 1
+            started = time.perf_counter()
+            if len(self.candidate_cache) >= self.move_cache_limit:
+                self.candidate_cache.clear()
+            candidates = self.candidate_cache[cache_key] = rank_wall_placements(board)
+            self.stats.add_time("candidates", time.perf_counter() - started)
+        else:
+            self.stats.cache_hits += 1
+        return list(candidates)
+
+    def score_placements(self, board: SearchBoard,
+                         placements: List[Tuple[Tuple[int, int], bool]]) -> List[Optional[int]]:
+        """Runner path length after each placement on board (None if it traps the runner), in one batched search"""
+        grid = board.grid
+        masks = [grid.placement_mask(pos, shape_of(is_horizontal)) for pos, is_horizontal in placements]
+        return batch_path_lengths(grid, board.player_pos, self.end_pos, masks)
+
+    def root_candidates(self, board: SearchBoard) -> List[Tuple[Tuple[int, int], bool]]:
+        """Every ranked wall placement at the root, reordered by its exact path length after placement.
+
+        The root is searched once per iteration and its candidate list is
+        short, so all of them are scored in a single batched search instead
+        of relying on rank_wall_placements' estimates past the first few.
+        """
+        cache_key = board.position_key
+        if self.root_ranking is not None and self.root_ranking[0] == cache_key:
+            self.stats.cache_hits += 1
+            return list(self.root_ranking[1])
+        candidates = self.generate_candidates(board)
+        self.stats.cache_misses += 1
+        with self.stats.phase("root_scoring"):
+            lengths = self.score_placements(board, candidates)
+        # Trapping walls first, then the longest path; ties keep the candidate order
+        order = sorted(range(len(candidates)),
+                       key=lambda i: (lengths[i] is not None, -(lengths[i] or 0), i))
+        ranked = [candidates[i] for i in order]
+        self.root_ranking = (cache_key, ranked)
+        return list(ranked)
+
+    def evaluate_position(self, player_pos: Tuple[int, int], walls: Set[Tuple[int, int]],
+                          cache_key: Optional[int] = None) -> float:
         """Evaluate the current game position from Maze Master's perspective"""
-        # Cache key for this position
-        cache_key = (player_pos, frozenset(walls))
-        if cache_key in self.move_cache:
-            return self.move_cache[cache_key]
+        # Zobrist hash of (walls, player_pos); minimax passes it in already updated
+        if cache_key is None:
+            cache_key = self.zobrist.position_key(player_pos, walls)
+        score = self.move_cache.get(cache_key)
+        if score is not None:
+            self.stats.cache_hits += 1
+            return score
+        self.stats.cache_misses += 1
+        self.stats.leaves += 1
+        if len(self.move_cache) >= self.move_cache_limit:
+            self.move_cache.clear()
             
-        # Find shortest path for player
-        player_path = self.find_shortest_path(player_pos, self.end_pos)
+        # Find shortest path for player through this position's walls
+        node_grid = BitboardGrid(self.grid_size, walls)
+        steps = node_grid.distance(player_pos, self.end_pos)
         
-        if not player_path:
+        if steps is None:
             self.move_cache[cache_key] = float('inf')
             return float('inf')  # Player is trapped, best case for Maze Master
             
-        # Calculate score based on path length and wall coverage
-        path_length = len(player_path)
-        wall_coverage = len(walls) / (self.grid_size * self.grid_size)
+        # Distance from player to nearest wall, read off the proximity field
+        self.proximity.sync(node_grid)
+        min_wall_distance = self.proximity.distance(player_pos)
+        if min_wall_distance is None:
+            min_wall_distance = float('inf')
         
-        # Calculate distance from player to nearest wall
-        min_wall_distance = float('inf')
-        for wall in walls:
-            dist = abs(wall[0] - player_pos[0]) + abs(wall[1] - player_pos[1])
-            min_wall_distance = min(min_wall_distance, dist)
+        score = self.score_position(steps + 1, len(walls), min_wall_distance)
+        self.move_cache[cache_key] = score
+        return score
+
+    def evaluate_board(self, board: SearchBoard) -> float:
+        """evaluate_position for a search board, reusing its cached goal distances"""
+        cache_key = board.position_key
+        score = self.move_cache.get(cache_key)
+        stats = self.stats
+        if score is not None:
+            stats.cache_hits += 1
+            return score
+        stats.cache_misses += 1
+        stats.leaves += 1
+        started = time.perf_counter()
+        if len(self.move_cache) >= self.move_cache_limit:
+            self.move_cache.clear()
         
+        steps = board.goal_distance()
+        if steps is None:
+            score = float('inf')  # Player is trapped, best case for Maze Master
+        else:
+            min_wall_distance = board.wall_distance()
+            if min_wall_distance is None:
+                min_wall_distance = float('inf')
+            score = self.score_position(steps + 1, board.grid.wall_count, min_wall_distance)
+        self.move_cache[cache_key] = score
+        stats.add_time("evaluation", time.perf_counter() - started)
+        return score
+
+    def score_position(self, path_length: int, wall_count: int, min_wall_distance: float) -> float:
+        """Combine the evaluation terms into a single score"""
+        wall_coverage = wall_count / (self.grid_size * self.grid_size)
         if min_wall_distance == float('inf'):
             min_wall_distance = 0
             
@@ -322,126 +604,488 @@ class MazeMasterAI:
         # 1. Path length (longer is better for Maze Master)
         # 2. Wall coverage (more walls is better)
         # 3. Proximity to walls (closer walls are better)
-        score = (path_length * 10 + 
+        return (path_length * 10 + 
                 wall_coverage * 100 + 
                 (1.0 / (min_wall_distance + 1)) * 50)
-                
-        self.move_cache[cache_key] = score
-        return score
 
-    def minimax(self, depth: int, alpha: float, beta: float, is_maximizing: bool, 
-                player_pos: Tuple[int, int], walls: Set[Tuple[int, int]], 
-                skill_1_available: bool, skill_2_available: bool, skill_3_available: bool) -> Tuple[float, Optional[Tuple[Tuple[int, int], bool, str]]]:
-        """Minimax algorithm with alpha-beta pruning and optimizations"""
+    def skill_flags(self) -> Tuple[bool, bool, bool]:
+        """Which of the three Maze Master skills a search may use"""
+        return self.skill_1_cooldown == 0, not self.skill_2_used, self.skill_3_cooldown == 0
+
+    def new_search_board(self) -> SearchBoard:
+        """Root search position for the current game state"""
+        return SearchBoard(self.grid, self.zobrist, self.player_pos, self.end_pos, self.skill_flags(),
+                           maximizing=True, field_cache=self.field_cache, proximity=self.proximity)
+
+    def minimax(self, depth: int, alpha: float, beta: float, board: SearchBoard,
+                ply: int = 0) -> Tuple[float, Optional[tuple]]:
+        """Minimax algorithm with alpha-beta pruning and a transposition table.
+
+        Moves are applied to the shared board and undone after each child, so
+        no wall sets are copied during the search.
+        """
+        if self._deadline is not None and time.perf_counter() > self._deadline:
+            raise SearchTimeout()
+        if self._stop_event is not None and self._stop_event.is_set():
+            raise SearchTimeout()
+        stats = self.stats
+        stats.nodes += 1
+        if ply > stats.max_depth:
+            stats.max_depth = ply
+        if ply < len(self._pv_table):
+            self._pv_table[ply] = []
+
         # Early termination checks
         if depth == 0:
-            return self.evaluate_position(player_pos, walls), None
+            return self.evaluate_board(board), None
             
-        current_eval = self.evaluate_position(player_pos, walls)
-        if current_eval == float('inf') or player_pos == self.end_pos:
+        current_eval = self.evaluate_board(board)
+        if current_eval == float('inf') or board.player_pos == self.end_pos:
             return current_eval, None
 
-        if is_maximizing:  # Maze Master's turn
+        # Reuse stored results: exact values end the search, bounds narrow the window
+        key = board.key
+        alpha_orig, beta_orig = alpha, beta
+        tt_move = None
+        entry = self.transpositions.probe(key)
+        stats.tt_probes += 1
+        if entry is not None:
+            stats.tt_hits += 1
+            tt_move = entry[4]
+            if entry[1] >= depth:
+                value, bound = entry[2], entry[3]
+                if bound == EXACT:
+                    return value, tt_move
+                if bound == LOWER_BOUND:
+                    alpha = max(alpha, value)
+                elif bound == UPPER_BOUND:
+                    beta = min(beta, value)
+                if beta <= alpha:
+                    stats.cutoffs += 1
+                    return value, tt_move
+
+        if board.maximizing:  # Maze Master's turn
             max_eval = float('-inf')
             best_move = None
             
-            # Get strategic positions instead of trying all possible positions
-            wall_positions = self.get_strategic_wall_positions()[:5]  # Limit to top 5 positions
-            
-            # Try all available skills first
-            if skill_1_available and len(wall_positions) >= 2:
-                pos1, is_horizontal1 = wall_positions[0]
-                eval_score, _ = self.minimax(depth - 1, alpha, beta, False, player_pos, walls, 
-                                           False, skill_2_available, skill_3_available)
-                if eval_score > max_eval:
-                    max_eval = eval_score
-                    best_move = (pos1, is_horizontal1, "skill_1")
-                alpha = max(alpha, eval_score)
-            
-            if skill_2_available and not self.skill_2_used:
-                path = self.find_shortest_path(player_pos, self.end_pos)
-                if path and len(path) > 2:
-                    mid_point = path[len(path)//2]
-                    if 0 <= mid_point[0] < self.grid_size-2 and 0 <= mid_point[1] < self.grid_size-2:
-                        eval_score, _ = self.minimax(depth - 1, alpha, beta, False, player_pos, walls, 
-                                                   skill_1_available, False, skill_3_available)
-                        if eval_score > max_eval:
-                            max_eval = eval_score
-                            best_move = (mid_point, True, "skill_2")
-                        alpha = max(alpha, eval_score)
-            
-            if skill_3_available and self.skill_3_cooldown == 0:
-                eval_score, _ = self.minimax(depth - 1, alpha, beta, False, player_pos, walls, 
-                                           skill_1_available, skill_2_available, False)
+            moves = self.order_moves(self.master_moves(board, tt_move, ply), ply, tt_move,
+                                     lambda entry: entry[0],
+                                     lambda move: (-self.wall_history.get(move, 0),))
+            for index, (move, action) in enumerate(moves):
+                self.apply_master_action(board, action)
+                if index == 0 or alpha == float('-inf'):
+                    eval_score, _ = self.minimax(depth - 1, alpha, beta, board, ply + 1)
+                else:
+                    # Principal variation search: prove the move is no better with a null window
+                    eval_score, _ = self.minimax(depth - 1, alpha, alpha + PVS_WINDOW, board, ply + 1)
+                    if alpha < eval_score < beta:
+                        eval_score, _ = self.minimax(depth - 1, alpha, beta, board, ply + 1)
+                self.undo_master_action(board, action)
+                
                 if eval_score > max_eval:
                     max_eval = eval_score
-                    best_move = ((0, 0), False, "skill_3")
+                    best_move = move
+                    self.update_pv(ply, best_move)
+                
                 alpha = max(alpha, eval_score)
-            
-            # Try regular wall placements
-            for wall_pos, is_horizontal in wall_positions:
-                new_walls = walls.copy()
-                if is_horizontal:
-                    wall_tiles = [(wall_pos[0] + i, wall_pos[1]) for i in range(3)]
-                else:
-                    wall_tiles = [(wall_pos[0], wall_pos[1] + i) for i in range(3)]
-                    
-                if all(0 <= wx < self.grid_size and 0 <= wy < self.grid_size and 
-                      (wx, wy) not in walls for wx, wy in wall_tiles):
-                    new_walls.update(wall_tiles)
-                    eval_score, _ = self.minimax(depth - 1, alpha, beta, False, player_pos, new_walls, 
-                                               skill_1_available, skill_2_available, skill_3_available)
-                    
-                    if eval_score > max_eval:
-                        max_eval = eval_score
-                        best_move = (wall_pos, is_horizontal, "none")
-                    
-                    alpha = max(alpha, eval_score)
-                    if beta <= alpha:
-                        break
+                if beta <= alpha:
+                    stats.cutoffs += 1
+                    self.record_cutoff(ply, depth, move, self.wall_history, move)
+                    break
                         
-            return max_eval, best_move
+            result = max_eval, best_move
             
         else:  # Runner's turn
             min_eval = float('inf')
             best_move = None
             
-            # Get valid moves for runner
-            valid_moves = self.get_valid_moves(player_pos)
+            # Get valid moves for runner through this position's walls
+            valid_moves = board.grid.neighbors(board.player_pos)
             
-            # Sort moves by distance to goal to check most promising moves first
-            valid_moves.sort(key=lambda pos: abs(pos[0] - self.end_pos[0]) + abs(pos[1] - self.end_pos[1]))
+            # Steps that keep to a shortest path first, then by history (the field is cached per wall set)
+            goal_field = board.get_goal_field()
+            unreached = len(goal_field.dist)
+            runner_pos = board.player_pos
+            valid_moves = self.order_moves(
+                valid_moves, ply, tt_move, lambda pos: pos,
+                lambda pos: (unreached if goal_field.distance(pos) is None else goal_field.distance(pos),
+                             -self.runner_history.get((runner_pos, pos), 0)))
             
-            for move in valid_moves[:4]:  # Limit to 4 best moves for performance
-                eval_score, _ = self.minimax(depth - 1, alpha, beta, True, move, walls, 
-                                           skill_1_available, skill_2_available, skill_3_available)
+            for index, move in enumerate(valid_moves):
+                board.move_runner(move)
+                if index == 0 or beta == float('inf'):
+                    eval_score, _ = self.minimax(depth - 1, alpha, beta, board, ply + 1)
+                else:
+                    eval_score, _ = self.minimax(depth - 1, beta - PVS_WINDOW, beta, board, ply + 1)
+                    if alpha < eval_score < beta:
+                        eval_score, _ = self.minimax(depth - 1, alpha, beta, board, ply + 1)
+                board.undo()
                 
                 if eval_score < min_eval:
                     min_eval = eval_score
                     best_move = move
+                    self.update_pv(ply, best_move)
                 
                 beta = min(beta, eval_score)
                 if beta <= alpha:
+                    stats.cutoffs += 1
+                    self.record_cutoff(ply, depth, move, self.runner_history, (runner_pos, move))
                     break
                     
-            return min_eval, best_move
+            result = min_eval, best_move
 
-    def decide_move(self, walls_placed: int) -> Tuple[Tuple[int, int], bool, str]:
-        """Decide the next wall placement and whether to use a skill"""
-        # Clear the move cache before each decision
-        self.move_cache.clear()
+        value = result[0]
+        if value <= alpha_orig:
+            bound = UPPER_BOUND
+        elif value >= beta_orig:
+            bound = LOWER_BOUND
+        else:
+            bound = EXACT
+        self.transpositions.store(key, depth, value, bound, result[1])
+        return result
+
+    def master_moves(self, board: SearchBoard, tt_move=None, ply: int = 0,
+                     limit: Optional[int] = None) -> List[Tuple[tuple, tuple]]:
+        """Maze Master moves at a node in search order, each with the action that plays it on the board.
+
+        Skills come first, then the ranked wall placements (at most limit of
+        them, default candidate_limit). Double Walls moves carry both walls:
+        (pos, is_horizontal, "skill_1", (pos2, is_horizontal2)). Actions are
+        ("skill", index), ("wall", origin, shape) or ("pair", origin, shape,
+        origin2, shape2) so they can be replayed on another board (see
+        parallel_search).
+        """
+        skill_1_available, skill_2_available, skill_3_available = board.skills
+        if limit is None:
+            limit = self.candidate_limit
+        # Strongest placements for this node's runner and walls instead of all possible positions
+        if ply == 0:
+            wall_positions = self.root_candidates(board)[:limit]
+        else:
+            wall_positions = self.generate_candidates(board)[:limit]
+        # Search the stored best wall and then the previous iteration's PV wall first
+        # (each hint goes to the front, so the TT move is moved last)
+        for hint in (self.pv_move(ply), tt_move):
+            if hint is not None and hint[2] == "none":
+                placement = (hint[0], hint[1])
+                if placement in wall_positions:
+                    wall_positions.remove(placement)
+                    wall_positions.insert(0, placement)
+        
+        moves = []
+        if skill_1_available and len(wall_positions) >= 2:
+            # Double Walls is searched as one move per pair of walls
+            moves.extend(self.double_wall_moves(board, ply))
+        
+        if skill_2_available and not self.skill_2_used:
+            path = board.shortest_path()
+            if path and len(path) > 2:
+                mid_point = path[len(path)//2]
+                if 0 <= mid_point[0] < self.grid_size-2 and 0 <= mid_point[1] < self.grid_size-2:
+                    moves.append(((mid_point, True, "skill_2"), ("skill", 1)))
+        
+        if skill_3_available and self.skill_3_cooldown == 0:
+            moves.append((((0, 0), False, "skill_3"), ("skill", 2)))
         
+        grid = board.grid
+        blocked = grid.bit(board.player_pos) | grid.bit(self.end_pos) | protected_mask(grid, self.end_pos)
+        for wall_pos, is_horizontal in wall_positions:
+            shape = shape_of(is_horizontal)
+            if grid.can_place(wall_pos, shape, blocked):
+                moves.append(((wall_pos, is_horizontal, "none"), ("wall", wall_pos, shape)))
+        return moves
+
+    def order_moves(self, moves: List, ply: int, tt_move, move_of: Callable, rest_key: Callable) -> List:
+        """Search order at a node: the stored best move, the previous PV move, this ply's killers, then rest_key order.
+
+        move_of maps an entry of moves to the move the hints are compared
+        with; the sort is stable, so rest_key ties keep the given order.
+        """
+        pv_move = self.pv_move(ply)
+        killers = self.killers[ply] if ply < len(self.killers) else []
+
+        def rank(entry):
+            move = move_of(entry)
+            if move == tt_move:
+                return (0,)
+            if move == pv_move:
+                return (1,)
+            if move in killers:
+                return (2, killers.index(move))
+            return (3,) + rest_key(move)
+        return sorted(moves, key=rank)
+
+    def record_cutoff(self, ply: int, depth: int, move, history: Dict, history_key):
+        """Remember a move that caused a cutoff as a killer at ply and credit it in history"""
+        while len(self.killers) <= ply:
+            self.killers.append([])
+        killers = self.killers[ply]
+        if move in killers:
+            killers.remove(move)
+        killers.insert(0, move)
+        del killers[KILLER_SLOTS:]
+        # Deeper cutoffs save more work, so they count for more
+        history[history_key] = history.get(history_key, 0) + depth * depth
+
+    def age_history(self):
+        """Forget the killers and halve the history scores before a new decision"""
+        self.killers = []
+        self.wall_history = {move: score // 2 for move, score in self.wall_history.items() if score > 1}
+        self.runner_history = {move: score // 2 for move, score in self.runner_history.items() if score > 1}
+
+    def double_wall_moves(self, board: SearchBoard, ply: int) -> List[Tuple[tuple, tuple]]:
+        """Double Walls moves at a node: the strongest pairs of ranked placements, each searched as one move.
+
+        Pairs are unordered, since either wall first leaves the same board,
+        and both walls must fit together. A pair whose second wall adds no
+        steps over its stronger wall alone is dominated and dropped, unless
+        no pair does better. All pairs and single walls are measured in
+        one batched search.
+        """
+        cache_key = (board.position_key, ply == 0)
+        moves = self.pair_cache.get(cache_key)
+        if moves is not None:
+            self.stats.cache_hits += 1
+            return list(moves)
+        self.stats.cache_misses += 1
+        if len(self.pair_cache) >= self.move_cache_limit:
+            self.pair_cache.clear()
+        ranked = self.root_candidates(board) if ply == 0 else self.generate_candidates(board)
+        ranked = ranked[:self.pair_candidates]
+        grid = board.grid
+        masks = [grid.placement_mask(pos, shape_of(is_horizontal)) for pos, is_horizontal in ranked]
+        pairs = [(i, j) for i, j in combinations(range(len(ranked)), 2) if not masks[i] & masks[j]]
+        with self.stats.phase("pair_scoring"):
+            lengths = batch_path_lengths(grid, board.player_pos, self.end_pos,
+                                         masks + [masks[i] | masks[j] for i, j in pairs])
+        steps = [float('inf') if length is None else length for length in lengths]
+        single = steps[:len(ranked)]
+        # Pairs that gain over their single walls first, then the longest path, then the best-ranked walls
+        scored = sorted(((length > max(single[i], single[j]), length, -(i + j), i, j)
+                         for (i, j), length in zip(pairs, steps[len(ranked):])), reverse=True)
+        kept = [entry for entry in scored if entry[0]][:self.pair_limit] or scored[:1]
+        moves = []
+        for _, _, _, i, j in kept:
+            (pos1, is_horizontal1), (pos2, is_horizontal2) = ranked[i], ranked[j]
+            moves.append(((pos1, is_horizontal1, "skill_1", (pos2, is_horizontal2)),
+                          ("pair", pos1, shape_of(is_horizontal1), pos2, shape_of(is_horizontal2))))
+        self.pair_cache[cache_key] = moves
+        return list(moves)
+
+    def apply_master_action(self, board: SearchBoard, action: tuple):
+        """Play an action from master_moves on the board"""
+        if action[0] == "skill":
+            board.use_skill(action[1])
+        elif action[0] == "pair":
+            # Spending the skill and placing the first wall each pass the turn; the second wall passes it back
+            board.use_skill(0)
+            board.place_wall(action[1], action[2])
+            board.place_wall(action[3], action[4])
+        else:
+            board.place_wall(action[1], action[2])
+
+    def undo_master_action(self, board: SearchBoard, action: tuple):
+        """Take back an action played by apply_master_action"""
+        for _ in range(3 if action[0] == "pair" else 1):
+            board.undo()
+
+    def pv_move(self, ply: int):
+        """Move the previous iteration's principal variation played at this ply"""
+        if ply < len(self.principal_variation):
+            return self.principal_variation[ply]
+        return None
+
+    def update_pv(self, ply: int, move):
+        """Record move as the best line at ply, followed by the child's best line"""
+        if ply + 1 < len(self._pv_table):
+            self._pv_table[ply] = [move] + self._pv_table[ply + 1]
+
+    def iterative_deepening(self, time_budget: Optional[float] = None,
+                            stop_event: Optional[threading.Event] = None) -> Optional[tuple]:
+        """Search depth 1, 2, ... up to max_depth, returning the best move of the deepest finished iteration.
+
+        With a time budget the search stops at the deadline and the unfinished
+        iteration is discarded; setting stop_event stops it the same way. Each
+        iteration orders moves by the previous principal variation and the
+        transposition table.
+        """
+        self._deadline = time.perf_counter() + time_budget if time_budget is not None else None
+        self._stop_event = stop_event
+        self.principal_variation = []
+        self.last_search_depth = 0
+        self.age_history()
+        board = self.new_search_board()
+        pool = self.root_search_pool()
+        if pool is not None:
+            pool.new_search()
+        best_move = None
+        try:
+            for depth in range(1, self.max_depth + 1):
+                self._pv_table = [[] for _ in range(depth + 1)]
+                if pool is not None and depth > 1:
+                    # Root moves go to the workers; keep the result for the next iteration's ordering
+                    value, move = pool.search(self, board, depth, self._deadline)
+                    if move is not None:
+                        self.transpositions.store(board.key, depth, value, EXACT, move)
+                else:
+                    _, move = self.minimax(depth, float('-inf'), float('inf'), board)
+                if move is None:
+                    break
+                best_move = move
+                self.last_search_depth = depth
+                self.principal_variation = self._pv_table[0] or [move]
+        except SearchTimeout:
+            pass
+        finally:
+            self._deadline = None
+            self._stop_event = None
+            # The board shares self.proximity; take back whatever the interrupted iteration applied
+            board.unwind()
+        return best_move
+
+    def monte_carlo_search(self, time_budget: Optional[float] = None,
+                           stop_event: Optional[threading.Event] = None) -> Optional[tuple]:
+        """Best move by Monte Carlo Tree Search within the time budget (or mcts_playouts iterations)"""
+        # No principal variation steers the MCTS move lists
+        self.principal_variation = []
+        move = self.mcts.search(self.new_search_board(), time_budget, stop_event=stop_event)
+        self.principal_variation = self.mcts.principal_line()
+        self.last_search_depth = len(self.principal_variation)
+        return move
+
+    def likely_runner_positions(self, board: SearchBoard, steps: int) -> List[Tuple[int, int]]:
+        """Where the runner probably stands after steps more moves, most likely first.
+
+        Assumes the runner keeps to a shortest path: the candidates are the
+        shortest-path DAG cells steps moves ahead, ranked by how many
+        shortest paths run through them.
+        """
+        dag = shortest_path_dag(board)
+        if dag is None:
+            return [board.player_pos]
+        layers, forward, backward = dag
+        layer = layers[min(steps, len(layers) - 1)]
+        ranked = sorted(layer, key=lambda cell: -forward[cell] * backward[cell])
+        return [board.grid.position(cell) for cell in ranked[:self.ponder_positions]]
+
+    def ponder(self, walls: Set[Tuple[int, int]], player_pos: Tuple[int, int], steps_left: int,
+               stop_event: threading.Event):
+        """Search the positions the runner will likely reach this turn until stop_event is set.
+
+        Results land in the transposition table and in ponder_results, where
+        decide_move picks them up if the runner really ends up there. The
+        likely positions are deepened together, one depth at a time. The
+        MCTS strategy keeps no results between decisions, so it does not ponder.
+        """
+        if self.strategy != "minimax":
+            return
+        grid = BitboardGrid(self.grid_size, walls)
+        proximity = WallProximityField(grid)
+        here = SearchBoard(grid, self.zobrist, player_pos, self.end_pos, self.skill_flags(),
+                           maximizing=True, field_cache=self.field_cache, proximity=proximity)
+        boards = [SearchBoard(grid, self.zobrist, pos, self.end_pos, self.skill_flags(),
+                              maximizing=True, field_cache=self.field_cache, proximity=proximity)
+                  for pos in self.likely_runner_positions(here, steps_left)
+                  if pos != self.end_pos]
+        spent = [0.0] * len(boards)
+        self.transpositions.new_search()
+        self.stats = SearchStats()  # Pondering work is not counted against the next decision
+        self._stop_event = stop_event
+        try:
+            for depth in range(1, self.max_depth + 1):
+                for i, board in enumerate(boards):
+                    started = time.perf_counter()
+                    self._pv_table = [[] for _ in range(depth + 1)]
+                    self.principal_variation = []
+                    try:
+                        _, move = self.minimax(depth, float('-inf'), float('inf'), board)
+                    finally:
+                        spent[i] += time.perf_counter() - started
+                        board.unwind()
+                    if move is not None:
+                        self.ponder_results[board.key] = (move, depth, spent[i])
+        except SearchTimeout:
+            pass
+        finally:
+            self._stop_event = None
+
+    def pondered_move(self, board: SearchBoard, time_budget: Optional[float]):
+        """The pondered move for this root if it was searched at least as hard as a live search would be"""
+        result = self.ponder_results.get(board.key)
+        if result is None:
+            return None
+        move, depth, spent = result
+        if depth >= self.max_depth or (time_budget is not None and spent >= time_budget):
+            return move, depth
+        return None
+
+    def root_search_pool(self):
+        """Shared worker pool for parallel root searches, or None when searching in-process"""
+        if self.workers <= 1:
+            return None
+        # Imported on demand so single-process games never start multiprocessing
+        from parallel_search import pool_for
+        return pool_for(self.grid_size, self.workers)
+
+    def decide_move(self, walls_placed: int, time_budget: Optional[float] = None,
+                    stop_event: Optional[threading.Event] = None) -> Tuple[Tuple[int, int], bool, str]:
+        """Decide the next wall placement and whether to use a skill; its statistics land in last_stats.
+
+        Double Walls is searched as a pair of walls, but only the first is
+        returned; the second is kept in planned_second_wall and returned
+        without another search when the caller asks for it (walls_placed == 1).
+        """
+        self.stats = SearchStats()
         try:
-            # First try minimax with alpha-beta pruning
-            _, minimax_move = self.minimax(
-                self.max_depth, float('-inf'), float('inf'), True,
-                self.player_pos, self.walls,
-                self.skill_1_cooldown == 0,
-                not self.skill_2_used,
-                self.skill_3_cooldown == 0
-            )
+            return self._decide_move(walls_placed, time_budget, stop_event)
+        finally:
+            self.stats.completed_depth = self.last_search_depth
+            self.last_stats = self.stats.finish()
+            if self.stats_callback is not None:
+                self.stats_callback(self.last_stats)
+
+    def _decide_move(self, walls_placed: int, time_budget: Optional[float],
+                     stop_event: Optional[threading.Event]) -> Tuple[Tuple[int, int], bool, str]:
+        # Cached evaluations and search results stay valid across turns; just age the table
+        self.transpositions.new_search()
+        # Walls may have changed since update_state (e.g. the first wall of skill 1)
+        self.grid.set_walls(self.walls)
+        
+        # The second wall of Double Walls was searched together with the first
+        planned, self.planned_second_wall = self.planned_second_wall, None
+        if planned is not None and walls_placed == 1:
+            (x, y), is_horizontal = planned
+            if self.is_valid_wall_position(x, y, is_horizontal):
+                self.stats.cache_hits += 1
+                self.last_move = ((x, y), is_horizontal, "skill_1")
+                return self.last_move
+        
+        if time_budget is None:
+            time_budget = self.time_budget
+        
+        try:
+            # A finished ponder of this exact position answers at once; a shallower one
+            # has still filled the transposition table for the live search
+            with self.stats.phase("ponder_lookup"):
+                pondered = self.pondered_move(self.new_search_board(), time_budget)
+            self.ponder_results.clear()
+            if pondered is not None:
+                minimax_move, self.last_search_depth = pondered
+                self.ponder_hits += 1
+            elif self.mcts is not None:
+                with self.stats.phase("search"):
+                    minimax_move = self.monte_carlo_search(time_budget, stop_event)
+            else:
+                # First try iterative-deepening minimax with alpha-beta pruning
+                with self.stats.phase("search"):
+                    minimax_move = self.iterative_deepening(time_budget, stop_event)
             
             if minimax_move:
+                # A Double Walls pair is played one wall per decision
+                if len(minimax_move) > 3:
+                    minimax_move, second_wall = minimax_move[:3], minimax_move[3]
+                else:
+                    second_wall = None
                 # Prevent infinite loops by checking if this move is the same as last move
                 if self.last_move and self.last_move == minimax_move:
                     # If same move, try a different strategy
@@ -452,15 +1096,24 @@ class MazeMasterAI:
                         return self.last_move
                 
                 self.last_move = minimax_move
+                self.planned_second_wall = second_wall
                 return minimax_move
                 
         except Exception as e:
             print(f"Minimax error: {e}")  # Log the error for debugging
+            self.stats.error = f"{type(e).__name__}: {e}"
             
         # Fall back to original strategy
-        strategic_positions = self.get_strategic_wall_positions()
+        with self.stats.phase("fallback"):
+            strategic_positions = self.get_strategic_wall_positions()
         if not strategic_positions:
-            return (0, 0), False, "none"
+            # No path to block: the runner is walled in, so tighten the wall around it
+            wall = self.enclosure_wall()
+            if wall is None:
+                return (0, 0), False, "none"
+            pos, is_horizontal = wall
+            self.last_move = (pos, is_horizontal, "none")
+            return self.last_move
             
         # Rest of the original strategy remains unchanged
         if self.skill_1_cooldown == 0 and len(strategic_positions) >= 2 and random.random() < self.difficulty:
@@ -489,15 +1142,5 @@ class MazeMasterAI:
 
     def get_valid_moves(self, pos: Tuple[int, int], max_distance: int = 1) -> List[Tuple[int, int]]:
         """Get all valid moves from current position"""
-        x, y = pos
-        valid_tiles = []
-        
-        # Regular movement (up, down, left, right)
-        for dx, dy in [(-1, 0), (1, 0), (0, -1), (0, 1)]:
-            new_x, new_y = x + dx, y + dy
-            if (0 <= new_x < self.grid_size and 
-                0 <= new_y < self.grid_size and 
-                (new_x, new_y) not in self.walls):
-                valid_tiles.append((new_x, new_y))
-                
-        return valid_tiles 
\ No newline at end of file
+        # Regular movement (up, down, left, right) read straight off the bitboard
+        return self.grid.neighbors(pos) 
\ No newline at end of file
@@ -0,0 +1,87 @@
+# A3 Game with AI
+
+# Members:
+# Banuag, Carl
+# Deen, Marfred
+# Ferolino, Jilliane
+# Rodriguez, Andrea
+# Rulete, Jeric
+# Torres, John Angelo
+
+"""Background AI decisions for the pygame loop.
+
+The game hands each AI decision to a single worker thread and polls the
+future once per frame, so the window keeps drawing while the AI searches.
+Every job gets its own stop event; MazeMasterAI checks it next to its time
+budget, so cancelling a job ends its search within a node or two.
+
+Pondering jobs share the same thread but never lock the board: they are
+stopped as soon as a real decision is started, which then runs right after.
+"""
+
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Optional
+
+
+class AIThinker:
+    """Runs one AI decision at a time on a background thread"""
+
+    def __init__(self):
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="ai-thinker")
+        self.future: Optional[Future] = None
+        self.stop_event: Optional[threading.Event] = None
+        self.ponder_future: Optional[Future] = None
+        self.ponder_stop_event: Optional[threading.Event] = None
+
+    @property
+    def thinking(self) -> bool:
+        """Whether a decision has been started and not collected yet"""
+        return self.future is not None
+
+    @property
+    def pondering(self) -> bool:
+        """Whether a pondering job is queued or running"""
+        return self.ponder_future is not None and not self.ponder_future.done()
+
+    def start(self, job: Callable[..., object], *args):
+        """Run job(stop_event, *args) in the background, cancelling any decision still in flight"""
+        self.cancel()
+        self.stop_event = threading.Event()
+        self.future = self.executor.submit(job, self.stop_event, *args)
+
+    def ponder(self, job: Callable[..., object], *args):
+        """Run job(stop_event, *args) until the next decision starts, replacing any earlier pondering"""
+        self.stop_pondering()
+        self.ponder_stop_event = threading.Event()
+        self.ponder_future = self.executor.submit(job, self.ponder_stop_event, *args)
+
+    def stop_pondering(self):
+        if self.ponder_future is not None:
+            self.ponder_future.cancel()
+            self.ponder_stop_event.set()
+        self.ponder_future = None
+        self.ponder_stop_event = None
+
+    def poll(self):
+        """The finished decision (collected once), or None while the AI is still thinking"""
+        if self.future is None or not self.future.done():
+            return None
+        future = self.future
+        self.future = None
+        self.stop_event = None
+        return future.result()
+
+    def cancel(self):
+        """Drop the decision in flight; a running search is told to stop at once"""
+        self.stop_pondering()
+        if self.future is not None:
+            self.future.cancel()
+            self.stop_event.set()
+        self.future = None
+        self.stop_event = None
+
+    def shutdown(self):
+        """Cancel any decision or pondering and release the worker thread"""
+        self.cancel()
+        self.executor.shutdown(wait=False, cancel_futures=True)
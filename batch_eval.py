@@ -0,0 +1,182 @@
+# A3 Game with AI
+
+# Members:
+# Banuag, Carl
+# Deen, Marfred
+# Ferolino, Jilliane
+# Rodriguez, Andrea
+# Rulete, Jeric
+# Torres, John Angelo
+
+"""Runner path lengths for many candidate wall placements in one search.
+
+Scoring K placements one BFS at a time pays the interpreter's per-step
+overhead K times. Here all K boards (the base walls plus one placement
+each) advance together, one wavefront step per loop iteration:
+
+- With NumPy the boards are stacked into a (K, size, words) array of
+  uint64 rows, 64 cells to a word, and every step is a handful of
+  whole-array operations.
+- Without it the boards are laid side by side in a single big int, each
+  followed by a spare closed row so vertical shifts cannot leak from one
+  board into the next, and every step is a few big-int shifts and ands.
+
+Up to about 128x128 this runs 2-5x faster than one wavefront per board.
+Past that the work is memory-bound, so bigger grids run one bitboard
+wavefront per board, which can stop as soon as that board is done.
+"""
+
+from typing import List, Optional, Sequence, Tuple
+
+from bitboard import BitboardGrid, mask_from_indices, mask_indices
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; the big-int batch covers every case
+    np = None
+
+# Widest grid that is batched; bigger ones run one wavefront per board
+BATCH_MAX_SIZE = 128
+
+
+def batch_path_lengths(grid: BitboardGrid, start: Tuple[int, int], goal: Tuple[int, int],
+                       masks: Sequence[int], method: str = "auto") -> List[Optional[int]]:
+    """Steps from start to goal with each extra wall mask added to grid, None where trapped.
+
+    method is "numpy", "bigint", "single" (one bitboard wavefront per mask)
+    or "auto", which batches with NumPy when it is installed and the grid is
+    at most BATCH_MAX_SIZE wide.
+    """
+    if not masks:
+        return []
+    if method == "auto":
+        if grid.size > BATCH_MAX_SIZE:
+            method = "single"
+        else:
+            method = "numpy" if np is not None else "bigint"
+    if method == "numpy":
+        return _numpy_path_lengths(grid, start, goal, masks)
+    if method == "bigint":
+        return _bigint_path_lengths(grid, start, goal, masks)
+    if method == "single":
+        return _single_path_lengths(grid, start, goal, masks)
+    raise ValueError(f"Unknown batch method: {method}")
+
+
+def _single_path_lengths(grid: BitboardGrid, start: Tuple[int, int], goal: Tuple[int, int],
+                         masks: Sequence[int]) -> List[Optional[int]]:
+    board = grid.copy()
+    lengths = []
+    for mask in masks:
+        board.walls = grid.walls | mask
+        lengths.append(board.distance(start, goal))
+    return lengths
+
+
+def _numpy_path_lengths(grid: BitboardGrid, start: Tuple[int, int], goal: Tuple[int, int],
+                        masks: Sequence[int]) -> List[Optional[int]]:
+    if np is None:
+        raise RuntimeError("NumPy is required for the NumPy batch evaluator")
+    size = grid.size
+    count = len(masks)
+    words = (size + 63) // 64  # uint64 words per row; column x is bit x % 64 of word x // 64
+
+    # Pack the base board's open rows into words, then repeat it for every board
+    base = np.frombuffer(grid.open_flags(), dtype=np.uint8).reshape(size, size)
+    padded = np.zeros((size, words * 64), dtype=np.uint8)
+    padded[:, :size] = base
+    rows = np.packbits(padded, axis=1, bitorder="little").view("<u8")
+    open_cells = np.repeat(rows[np.newaxis], count, axis=0)
+
+    # Close each board's placement tiles
+    boards, tiles = [], []
+    for board, mask in enumerate(masks):
+        while mask:
+            low = mask & -mask
+            boards.append(board)
+            tiles.append(low.bit_length() - 1)
+            mask ^= low
+    if tiles:
+        tiles = np.array(tiles)
+        x, y = tiles % size, tiles // size
+        bits = np.left_shift(np.uint64(1), (x % 64).astype(np.uint64))
+        np.bitwise_and.at(open_cells, (np.array(boards), y, x // 64), ~bits)
+
+    lengths: List[Optional[int]] = [None] * count
+    sx, sy = start
+    gx, gy = goal
+    goal_word, goal_bit = gx // 64, np.uint64(gx % 64)
+    one, top = np.uint64(1), np.uint64(63)
+    frontier = np.zeros_like(open_cells)
+    frontier[:, sy, sx // 64] = open_cells[:, sy, sx // 64] & (one << np.uint64(sx % 64))
+    seen = frontier.copy()
+    active = np.arange(count)  # Board number of each row still in the arrays
+    step = 0
+    while True:
+        reached = ((frontier[:, gy, goal_word] >> goal_bit) & one).astype(bool)
+        if reached.any():
+            for row in np.flatnonzero(reached):
+                lengths[active[row]] = step
+            # Finished boards stop spreading
+            frontier[reached] = 0
+        alive = frontier.reshape(len(active), -1).any(axis=1)
+        if not alive.any():
+            return lengths
+        if alive.sum() * 2 <= len(active):
+            # Drop boards that are done or trapped once they make up half the batch
+            active = active[alive]
+            frontier, seen, open_cells = frontier[alive], seen[alive], open_cells[alive]
+        spread = (frontier << one) | (frontier >> one)
+        if words > 1:
+            # Carry the bits that cross a word boundary
+            spread[:, :, 1:] |= frontier[:, :, :-1] >> top
+            spread[:, :, :-1] |= frontier[:, :, 1:] << top
+        spread[:, 1:] |= frontier[:, :-1]
+        spread[:, :-1] |= frontier[:, 1:]
+        spread &= open_cells
+        spread &= ~seen
+        seen |= spread
+        frontier = spread
+        step += 1
+
+
+def _bigint_path_lengths(grid: BitboardGrid, start: Tuple[int, int], goal: Tuple[int, int],
+                         masks: Sequence[int]) -> List[Optional[int]]:
+    size = grid.size
+    cells = grid.tables.cells
+    stride = cells + size  # One board plus a spare closed row
+    count = len(masks)
+    total = stride * count
+
+    # Repeat the per-board masks once per lane; each lane then loses its own placement tiles
+    lanes = mask_from_indices(range(0, total, stride), total)
+    tiles = []
+    for board, mask in enumerate(masks):
+        offset = board * stride
+        while mask:
+            low = mask & -mask
+            tiles.append(offset + low.bit_length() - 1)
+            mask ^= low
+    open_cells = ((grid.tables.full & ~grid.walls) * lanes) & ~mask_from_indices(tiles, total)
+    not_first_col = grid.tables.not_first_col * lanes
+    not_last_col = grid.tables.not_last_col * lanes
+
+    frontier = (lanes << grid.index(start)) & open_cells
+    targets = lanes << grid.index(goal)
+    seen = frontier
+    lengths: List[Optional[int]] = [None] * count
+    step = 0
+    while frontier:
+        hits = frontier & targets
+        if hits:
+            # Finished boards keep spreading, but their goal no longer counts
+            targets ^= hits
+            for index in mask_indices(hits):
+                lengths[index // stride] = step
+            if not targets:
+                break
+        frontier = (((frontier & not_last_col) << 1) | ((frontier & not_first_col) >> 1) |
+                    (frontier << size) | (frontier >> size)) & open_cells & ~seen
+        seen |= frontier
+        step += 1
+    return lengths
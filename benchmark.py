@@ -0,0 +1,290 @@
+# A3 Game with AI
+
+# Members:
+# Banuag, Carl
+# Deen, Marfred
+# Ferolino, Jilliane
+# Rodriguez, Andrea
+# Rulete, Jeric
+# Torres, John Angelo
+
+"""Repeatable benchmarks for the ai_logic hot paths.
+
+Every case runs one AI entry point on a fixed, seeded position (empty,
+mid-game, near-trapped or maze-like) at a given grid size and reports the
+time per call, the bytes and blocks a call leaves allocated and its peak
+traced memory. Caches the call would otherwise hit are cleared before each
+call, outside the timed region.
+
+    python benchmark.py --sizes 24 64 --out bench.json
+    python benchmark.py --sizes 24 64 --baseline bench.json --threshold 0.25
+
+With --baseline the run fails (exit status 1) when a case's best time or
+peak memory grows past the baseline by more than the threshold.
+"""
+
+import argparse
+import gc
+import json
+import platform
+import random
+import sys
+import time
+import tracemalloc
+from typing import Callable, Dict, List, Optional, Sequence, Set, Tuple
+
+from ai_logic import MazeMasterAI, MazeRunnerAI
+from landmarks import LandmarkHeuristic
+from transposition import TranspositionTable
+
+SIZES = (24, 64, 256, 1024)
+POSITIONS = ("empty", "midgame", "near_trapped", "maze")
+TARGETS = ("a_star_search", "jump_point_search", "find_shortest_path", "evaluate_position", "minimax",
+           "runner_decide_move", "master_decide_move")
+SEED = 2024
+MIDGAME_COVERAGE = 0.15
+
+Walls = Set[Tuple[int, int]]
+
+
+# --- Positions ---------------------------------------------------------------
+
+def empty_position(size: int, rng: random.Random) -> Walls:
+    return set()
+
+
+def midgame_position(size: int, rng: random.Random) -> Walls:
+    """Random 3-tile walls up to MIDGAME_COVERAGE, kept off a staircase corridor so the goal stays reachable"""
+    corridor = {(i, i) for i in range(size)} | {(i + 1, i) for i in range(size - 1)}
+    walls: Walls = set()
+    target = int(size * size * MIDGAME_COVERAGE)
+    while len(walls) < target:
+        x, y = rng.randrange(size), rng.randrange(size)
+        tiles = [(x + i, y) for i in range(3)] if rng.random() < 0.5 else [(x, y + i) for i in range(3)]
+        if all(0 <= tx < size and 0 <= ty < size and (tx, ty) not in corridor for tx, ty in tiles):
+            walls.update(tiles)
+    return walls
+
+
+def near_trapped_position(size: int, rng: random.Random) -> Walls:
+    """A wall beside the runner with a single gap at the far end, so the only path is a long detour"""
+    return {(1, y) for y in range(size - 1)}
+
+
+def maze_position(size: int, rng: random.Random) -> Walls:
+    """Perfect maze carved by a seeded depth-first search over the even tiles"""
+    open_tiles = {(0, 0)}
+    stack = [(0, 0)]
+    while stack:
+        x, y = stack[-1]
+        steps = [(dx, dy) for dx, dy in ((2, 0), (-2, 0), (0, 2), (0, -2))
+                 if 0 <= x + dx < size and 0 <= y + dy < size and (x + dx, y + dy) not in open_tiles]
+        if not steps:
+            stack.pop()
+            continue
+        dx, dy = rng.choice(steps)
+        open_tiles.add((x + dx // 2, y + dy // 2))
+        open_tiles.add((x + dx, y + dy))
+        stack.append((x + dx, y + dy))
+    # Odd sizes end on a carved tile; even sizes need a short spur to the corner goal
+    goal = (size - 1, size - 1)
+    open_tiles.update((goal, (size - 1, size - 2), (size - 2, size - 1)))
+    return {(x, y) for x in range(size) for y in range(size) if (x, y) not in open_tiles}
+
+
+POSITION_BUILDERS: Dict[str, Callable[[int, random.Random], Walls]] = {
+    "empty": empty_position,
+    "midgame": midgame_position,
+    "near_trapped": near_trapped_position,
+    "maze": maze_position,
+}
+
+
+def build_position(name: str, size: int) -> Walls:
+    """Walls of a named position; the same name and size always give the same walls"""
+    return POSITION_BUILDERS[name](size, random.Random(f"{SEED}:{name}:{size}"))
+
+
+# --- Cases -------------------------------------------------------------------
+
+class Case:
+    """One benchmarked call: setup() runs untimed before every call()"""
+
+    def __init__(self, name: str, setup: Callable[[], None], call: Callable[[], object]):
+        self.name = name
+        self.setup = setup
+        self.call = call
+
+
+def build_case(target: str, position: str, size: int, walls: Walls, depth: int) -> Case:
+    name = f"{target}/{position}/{size}"
+    start, goal = (0, 0), (size - 1, size - 1)
+
+    if target in ("a_star_search", "jump_point_search", "runner_decide_move"):
+        runner = MazeRunnerAI(size)
+        runner.update_state(walls, start)
+
+        def reset_runner():
+            # Every call plans from scratch: no cached field or path to reuse
+            runner.goal_field = None
+            runner.landmarks = LandmarkHeuristic(size)  # The ALT table build is part of an A* call's cost
+            runner.path = None
+            runner.path_index = {}
+            runner.path_start = 0
+            runner.path_version = -1
+            runner.path_walls = 0
+            runner.board_version += 1
+
+        if target == "a_star_search":
+            return Case(name, reset_runner, lambda: runner.a_star_search(start, goal))
+        if target == "jump_point_search":
+            return Case(name, reset_runner, lambda: runner.jump_point_search(start, goal))
+        return Case(name, reset_runner, runner.decide_move)
+
+    master = MazeMasterAI(size)
+    master.max_depth = depth
+    master.update_state(walls, start, 0)
+
+    def reset_master():
+        # Every call starts cold: no cached fields, evaluations or search results
+        master.goal_field = None
+        master.move_cache.clear()
+        master.field_cache.clear()
+        master.candidate_cache.clear()
+        master.root_ranking = None
+        master.pair_cache.clear()
+        master.transpositions = TranspositionTable()
+        master.killers = []
+        master.wall_history = {}
+        master.runner_history = {}
+        master.last_move = None
+        master.grid.set_walls(walls)
+
+    if target == "find_shortest_path":
+        return Case(name, reset_master, lambda: master.find_shortest_path(start, goal))
+    if target == "evaluate_position":
+        return Case(name, reset_master, lambda: master.evaluate_position(start, walls))
+    if target == "minimax":
+        def run_minimax():
+            board = master.new_search_board()
+            master._pv_table = [[] for _ in range(depth + 1)]
+            try:
+                return master.minimax(depth, float('-inf'), float('inf'), board)
+            finally:
+                board.unwind()
+        return Case(name, reset_master, run_minimax)
+    return Case(name, reset_master, lambda: master.decide_move(0))
+
+
+# --- Measurement -------------------------------------------------------------
+
+def measure(case: Case, repeat: int, max_seconds: float) -> Dict[str, object]:
+    """Time case over up to repeat calls (at least one, stopping after max_seconds), then trace one more call"""
+    times: List[float] = []
+    started = time.perf_counter()
+    while len(times) < repeat and (not times or time.perf_counter() - started < max_seconds):
+        case.setup()
+        gc.collect()
+        begin = time.perf_counter()
+        case.call()
+        times.append(time.perf_counter() - begin)
+
+    # Allocation figures come from a separate call so tracing does not skew the timings
+    case.setup()
+    gc.collect()
+    tracemalloc.start()
+    try:
+        blocks_before = sys.getallocatedblocks()
+        before, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        result = case.call()
+        after, peak = tracemalloc.get_traced_memory()
+        blocks_after = sys.getallocatedblocks()
+    finally:
+        tracemalloc.stop()
+    del result
+
+    return {
+        "case": case.name,
+        "calls": len(times),
+        "mean_ms": sum(times) / len(times) * 1000,
+        "min_ms": min(times) * 1000,
+        "alloc_bytes": after - before,
+        "alloc_blocks": blocks_after - blocks_before,
+        "peak_bytes": peak - before,
+    }
+
+
+def run_benchmarks(sizes: Sequence[int], positions: Sequence[str], targets: Sequence[str],
+                   depth: int, repeat: int, max_seconds: float, report: Callable[[Dict[str, object]], None] = None
+                   ) -> List[Dict[str, object]]:
+    results = []
+    for size in sizes:
+        for position in positions:
+            walls = build_position(position, size)
+            for target in targets:
+                result = measure(build_case(target, position, size, walls, depth), repeat, max_seconds)
+                results.append(result)
+                if report is not None:
+                    report(result)
+    return results
+
+
+def compare(results: Sequence[Dict[str, object]], baseline: Sequence[Dict[str, object]],
+            threshold: float) -> List[str]:
+    """Regressions of results against baseline, as readable lines (empty when none)"""
+    previous = {entry["case"]: entry for entry in baseline}
+    regressions = []
+    for result in results:
+        base = previous.get(result["case"])
+        if base is None:
+            continue
+        for metric in ("min_ms", "peak_bytes"):
+            old, new = base[metric], result[metric]
+            if old > 0 and new > old * (1 + threshold):
+                regressions.append(f"{result['case']}: {metric} {old:.3f} -> {new:.3f} "
+                                   f"(+{(new / old - 1):.0%}, limit +{threshold:.0%})")
+    return regressions
+
+
+def print_result(result: Dict[str, object]):
+    print(f"{result['case']:<42} {result['calls']:4d} calls  mean {result['mean_ms']:10.3f} ms  "
+          f"min {result['min_ms']:10.3f} ms  alloc {result['alloc_bytes']:11d} B "
+          f"{result['alloc_blocks']:7d} blocks  peak {result['peak_bytes']:11d} B", flush=True)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the ai_logic hot paths.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(SIZES), help="grid sizes")
+    parser.add_argument("--positions", nargs="+", choices=POSITIONS, default=list(POSITIONS))
+    parser.add_argument("--targets", nargs="+", choices=TARGETS, default=list(TARGETS))
+    parser.add_argument("--depth", type=int, default=2, help="minimax and Maze Master decide_move depth")
+    parser.add_argument("--repeat", type=int, default=5, help="timed calls per case")
+    parser.add_argument("--max-seconds", type=float, default=2.0,
+                        help="stop repeating a case after this long (it always runs once)")
+    parser.add_argument("--out", default=None, help="write results to this JSON file")
+    parser.add_argument("--baseline", default=None, help="JSON results to compare against")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="allowed growth over the baseline before a case counts as a regression")
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(args.sizes, args.positions, args.targets, args.depth,
+                             args.repeat, args.max_seconds, print_result)
+    if args.out:
+        with open(args.out, "w") as out:
+            json.dump({"python": platform.python_version(), "depth": args.depth, "results": results}, out, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as source:
+            baseline = json.load(source)["results"]
+        regressions = compare(results, baseline, args.threshold)
+        for line in regressions:
+            print("REGRESSION " + line)
+        if regressions:
+            return 1
+        print(f"No regressions past +{args.threshold:.0%} of {args.baseline}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,314 @@
+# A3 Game with AI
+
+# Members:
+# Banuag, Carl
+# Deen, Marfred
+# Ferolino, Jilliane
+# Rodriguez, Andrea
+# Rulete, Jeric
+# Torres, John Angelo
+
+"""Bitboard grid engine shared by MazeRunnerAI and MazeMasterAI.
+
+Every tile (x, y) of a square grid maps to bit ``y * size + x`` of a Python
+int. Walls, open cells and search frontiers are all stored this way, so
+neighbor expansion, wall legality and coverage counts are a handful of
+shifts and ands instead of per-tile tuple lookups.
+"""
+
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+# Wall shapes the Maze Master can place (3 tiles each)
+HORIZONTAL = "horizontal"
+VERTICAL = "vertical"
+DIAGONAL_ULDR = "uldr"  # Upper left to lower right
+DIAGONAL_URDL = "urdl"  # Upper right to lower left
+WALL_SHAPES = (HORIZONTAL, VERTICAL, DIAGONAL_ULDR, DIAGONAL_URDL)
+
+# Tile offsets of each wall shape relative to the clicked origin tile
+SHAPE_OFFSETS = {
+    HORIZONTAL: ((0, 0), (1, 0), (2, 0)),
+    VERTICAL: ((0, 0), (0, 1), (0, 2)),
+    DIAGONAL_ULDR: ((0, 0), (1, 1), (2, 2)),
+    DIAGONAL_URDL: ((0, 0), (-1, 1), (-2, 2)),
+}
+
+# Same neighbor order the AIs have always used: left, right, up, down
+DIRECTIONS = ((-1, 0), (1, 0), (0, -1), (0, 1))
+
+
+def shape_of(is_horizontal: bool) -> str:
+    """Map the (pos, is_horizontal) wall convention to a shape name"""
+    return HORIZONTAL if is_horizontal else VERTICAL
+
+
+def wall_tiles(origin: Tuple[int, int], shape: str) -> List[Tuple[int, int]]:
+    """Tiles covered by a wall of the given shape placed at origin"""
+    x, y = origin
+    return [(x + dx, y + dy) for dx, dy in SHAPE_OFFSETS[shape]]
+
+
+def mask_from_indices(indices: Iterable[int], cells: int) -> int:
+    """Build a bitboard from flat cell indices in linear time"""
+    marks = bytearray((cells + 7) // 8)
+    for index in indices:
+        marks[index >> 3] |= 1 << (index & 7)
+    return int.from_bytes(marks, "little")
+
+
+def mask_indices(mask: int) -> Iterator[int]:
+    """Flat indices of the set bits of mask, lowest first, in linear time"""
+    bits = format(mask, "b")[::-1]
+    index = bits.find("1")
+    while index >= 0:
+        yield index
+        index = bits.find("1", index + 1)
+
+
+class GridTables:
+    """Precomputed masks for one grid size, shared by every BitboardGrid of that size"""
+
+    def __init__(self, size: int):
+        self.size = size
+        self.cells = size * size
+        self.full = (1 << self.cells) - 1
+
+        first_col = mask_from_indices(range(0, self.cells, size), self.cells)
+        self.not_first_col = self.full & ~first_col
+        self.not_last_col = self.full & ~(first_col << (size - 1))
+
+        # Each wall shape is a 3-bit pattern shifted to its origin bit, plus a
+        # bitboard of the origins where all three tiles stay on the grid. A
+        # placement mask is then `pattern << origin_index`, and every legal
+        # origin of a shape can be found with a few whole-board ands.
+        self.offsets: Dict[str, Tuple[int, ...]] = {}
+        self.patterns: Dict[str, int] = {}
+        self.origins: Dict[str, int] = {}
+        for shape, tile_offsets in SHAPE_OFFSETS.items():
+            offsets = tuple(dy * size + dx for dx, dy in tile_offsets)
+            self.offsets[shape] = offsets
+            self.patterns[shape] = sum(1 << offset for offset in offsets)
+            # Valid origins form a rectangle: a run of columns repeated on a run of rows
+            x_lo = max(0, -min(dx for dx, _ in tile_offsets))
+            x_hi = min(size, size - max(dx for dx, _ in tile_offsets))
+            y_hi = min(size, size - max(dy for _, dy in tile_offsets))
+            if x_lo < x_hi and y_hi > 0:
+                columns = ((1 << (x_hi - x_lo)) - 1) << x_lo
+                rows = (1 << (y_hi * size)) - 1
+                self.origins[shape] = (columns * first_col) & rows
+            else:
+                self.origins[shape] = 0
+
+        self._neighbors: Optional[List[Tuple[int, ...]]] = None
+
+    @property
+    def neighbors(self) -> List[Tuple[int, ...]]:
+        """Flat neighbor index lists per cell, in DIRECTIONS order (built on first use)"""
+        if self._neighbors is None:
+            size = self.size
+            self._neighbors = [
+                tuple((y + dy) * size + (x + dx)
+                      for dx, dy in DIRECTIONS
+                      if 0 <= x + dx < size and 0 <= y + dy < size)
+                for y in range(size) for x in range(size)
+            ]
+        return self._neighbors
+
+
+_TABLES: Dict[int, GridTables] = {}
+
+# Turns a wall bit string into open flags: "0" (no wall) -> 1, "1" (wall) -> 0
+_OPEN_FLAG_TABLE = str.maketrans("01", "\x01\x00")
+
+
+def tables_for(size: int) -> GridTables:
+    """Get (and build on first use) the precomputed tables for a grid size"""
+    tables = _TABLES.get(size)
+    if tables is None:
+        tables = _TABLES[size] = GridTables(size)
+    return tables
+
+
+class BitboardGrid:
+    """Square maze grid with walls held in a single big-int bitboard"""
+
+    __slots__ = ("size", "tables", "walls", "_flags", "_flags_walls")
+
+    floods = 0  # reachable/distance flood searches run in this process, for SearchStats
+
+    def __init__(self, size: int, walls: Iterable[Tuple[int, int]] = ()):
+        self.size = size
+        self.tables = tables_for(size)
+        self.walls = 0
+        self._flags: Optional[bytes] = None
+        self._flags_walls = -1
+        self.set_walls(walls)
+
+    # --- Conversions -------------------------------------------------------
+
+    def index(self, pos: Tuple[int, int]) -> int:
+        return pos[1] * self.size + pos[0]
+
+    def position(self, index: int) -> Tuple[int, int]:
+        return index % self.size, index // self.size
+
+    def bit(self, pos: Tuple[int, int]) -> int:
+        return 1 << (pos[1] * self.size + pos[0])
+
+    def mask_of(self, tiles: Iterable[Tuple[int, int]]) -> int:
+        """Build a bitboard from tile coordinates (out-of-bounds tiles are ignored)"""
+        size = self.size
+        return mask_from_indices((y * size + x for x, y in tiles
+                                  if 0 <= x < size and 0 <= y < size),
+                                 self.tables.cells)
+
+    def tiles_of(self, mask: int) -> List[Tuple[int, int]]:
+        """List the tile coordinates of every set bit in mask"""
+        size = self.size
+        tiles = []
+        while mask:
+            low = mask & -mask
+            index = low.bit_length() - 1
+            tiles.append((index % size, index // size))
+            mask ^= low
+        return tiles
+
+    # --- Wall state --------------------------------------------------------
+
+    def set_walls(self, walls: Iterable[Tuple[int, int]]):
+        """Replace the wall bitboard with the given wall tiles"""
+        self.walls = self.mask_of(walls)
+
+    def add_mask(self, mask: int):
+        self.walls |= mask
+
+    def remove_mask(self, mask: int):
+        self.walls &= ~mask
+
+    def copy(self) -> "BitboardGrid":
+        clone = BitboardGrid.__new__(BitboardGrid)
+        clone.size = self.size
+        clone.tables = self.tables
+        clone.walls = self.walls
+        clone._flags = self._flags
+        clone._flags_walls = self._flags_walls
+        return clone
+
+    @property
+    def open_cells(self) -> int:
+        return self.tables.full & ~self.walls
+
+    @property
+    def wall_count(self) -> int:
+        return self.walls.bit_count()
+
+    def coverage(self) -> float:
+        """Fraction of the grid covered by walls"""
+        return self.walls.bit_count() / self.tables.cells
+
+    def open_flags(self) -> bytes:
+        """Per-cell open flags (1 = open, 0 = wall) indexed like the bitboard.
+
+        Array-based searches index this instead of shifting the big int for
+        every cell, which matters once boards get large. The bytes are cached
+        until the walls change.
+        """
+        if self._flags_walls != self.walls:
+            cells = self.tables.cells
+            bits = format(self.walls, "b").zfill(cells)[::-1]
+            self._flags = bits.translate(_OPEN_FLAG_TABLE).encode("ascii")
+            self._flags_walls = self.walls
+        return self._flags
+
+    def in_bounds(self, pos: Tuple[int, int]) -> bool:
+        return 0 <= pos[0] < self.size and 0 <= pos[1] < self.size
+
+    def is_wall(self, pos: Tuple[int, int]) -> bool:
+        return self.in_bounds(pos) and (self.walls >> (pos[1] * self.size + pos[0])) & 1 == 1
+
+    def is_open(self, pos: Tuple[int, int]) -> bool:
+        return self.in_bounds(pos) and not (self.walls >> (pos[1] * self.size + pos[0])) & 1
+
+    # --- Movement ----------------------------------------------------------
+
+    def neighbors(self, pos: Tuple[int, int]) -> List[Tuple[int, int]]:
+        """Open orthogonal neighbors of pos (left, right, up, down)"""
+        size = self.size
+        walls = self.walls
+        result = []
+        for index in self.tables.neighbors[pos[1] * size + pos[0]]:
+            if not (walls >> index) & 1:
+                result.append((index % size, index // size))
+        return result
+
+    def expand(self, mask: int) -> int:
+        """Cells orthogonally adjacent to any cell in mask, restricted to open cells"""
+        tables = self.tables
+        size = self.size
+        spread = (((mask & tables.not_last_col) << 1) |
+                  ((mask & tables.not_first_col) >> 1) |
+                  (mask << size) |
+                  (mask >> size))
+        return spread & tables.full & ~self.walls
+
+    def reachable(self, start: Tuple[int, int]) -> int:
+        """Flood fill from start; returns the bitboard of every reachable open cell"""
+        BitboardGrid.floods += 1
+        if not self.is_open(start):
+            return 0
+        seen = frontier = self.bit(start)
+        while frontier:
+            frontier = self.expand(frontier) & ~seen
+            seen |= frontier
+        return seen
+
+    def distance(self, start: Tuple[int, int], goal: Tuple[int, int]) -> Optional[int]:
+        """Number of steps from start to goal by wavefront expansion, or None if unreachable"""
+        BitboardGrid.floods += 1
+        if not (self.is_open(start) and self.is_open(goal)):
+            return None
+        target = self.bit(goal)
+        seen = frontier = self.bit(start)
+        steps = 0
+        while frontier:
+            if frontier & target:
+                return steps
+            frontier = self.expand(frontier) & ~seen
+            seen |= frontier
+            steps += 1
+        return None
+
+    # --- Wall placement ----------------------------------------------------
+
+    def placement_mask(self, origin: Tuple[int, int], shape: str) -> Optional[int]:
+        """Bitboard of a wall placement, or None if it would leave the grid"""
+        if not self.in_bounds(origin):
+            return None
+        index = origin[1] * self.size + origin[0]
+        if not (self.tables.origins[shape] >> index) & 1:
+            return None
+        return self.tables.patterns[shape] << index
+
+    def can_place(self, origin: Tuple[int, int], shape: str, blocked: int = 0) -> bool:
+        """Whether a wall fits at origin without overlapping walls or blocked tiles"""
+        mask = self.placement_mask(origin, shape)
+        return mask is not None and not mask & (self.walls | blocked)
+
+    def legal_origins(self, shape: str, blocked: int = 0) -> int:
+        """Bitboard of every origin where shape fits on the current board"""
+        free = self.tables.full & ~(self.walls | blocked)
+        legal = self.tables.origins[shape] & free
+        for offset in self.tables.offsets[shape][1:]:
+            legal &= free >> offset
+        return legal
+
+    def legal_placements(self, shape: str, blocked: int = 0) -> List[Tuple[Tuple[int, int], int]]:
+        """Every (origin, mask) placement of shape that fits on the current board"""
+        pattern = self.tables.patterns[shape]
+        size = self.size
+        return [(origin, pattern << (origin[1] * size + origin[0]))
+                for origin in self.tiles_of(self.legal_origins(shape, blocked))]
+
+    def count_walls(self, mask: int) -> int:
+        """How many of the tiles in mask are walls"""
+        return (self.walls & mask).bit_count()
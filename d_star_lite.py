@@ -0,0 +1,167 @@
+# A3 Game with AI
+
+# Members:
+# Banuag, Carl
+# Deen, Marfred
+# Ferolino, Jilliane
+# Rodriguez, Andrea
+# Rulete, Jeric
+# Torres, John Angelo
+
+"""D* Lite incremental shortest paths to the goal as walls come and go.
+
+The planner searches backwards from the goal, so its g values are goal
+distances and stay valid while the runner moves; only the heuristic shifts,
+which the key modifier km absorbs. Between calls it diffs the grid's wall
+bitboard against the one it last saw and re-queues just the toggled cells
+and their neighbors, so a turn that adds one 3-tile wall repairs the few
+cells whose distance actually changed instead of searching the grid again.
+The first call costs about one A* run.
+"""
+
+import heapq
+from array import array
+from typing import List, Optional, Tuple
+
+from bitboard import BitboardGrid, mask_indices, tables_for
+
+
+class DStarLite:
+    """Goal-rooted D* Lite search tree for one grid size and goal, kept across plan() calls"""
+
+    def __init__(self, size: int, goal: Tuple[int, int]):
+        self.size = size
+        self.goal = goal
+        self.goal_index = goal[1] * size + goal[0]
+        cells = size * size
+        self.infinity = cells + 1  # Longer than any path on the grid
+        self.neighbors = tables_for(size).neighbors
+        self.open = bytearray(b"\x01") * cells  # Open flags as of the last sync
+        self.walls = 0  # Wall bitboard the tree matches
+        self.g = array("i", [self.infinity]) * cells
+        self.rhs = array("i", [self.infinity]) * cells
+        self.queued: List[Optional[Tuple[int, int]]] = [None] * cells  # Current key of each queued cell
+        self.queue: List[Tuple[int, int, int]] = []  # (k1, k2, index) heap; entries not matching queued are stale
+        self.km = 0
+        self.start: Optional[int] = None  # Start cell of the last plan
+        self.rhs[self.goal_index] = 0
+        self._push(self.goal_index, (0, 0))
+
+    def _heuristic(self, a: int, b: int) -> int:
+        size = self.size
+        return abs(a % size - b % size) + abs(a // size - b // size)
+
+    def _key(self, index: int) -> Tuple[int, int]:
+        best = min(self.g[index], self.rhs[index])
+        return best + self._heuristic(self.start, index) + self.km, best
+
+    def _push(self, index: int, key: Tuple[int, int]):
+        self.queued[index] = key
+        heapq.heappush(self.queue, (key[0], key[1], index))
+
+    def _update(self, index: int):
+        """Recompute rhs of a cell from its open neighbors and (re)queue it if inconsistent"""
+        g = self.g
+        if index != self.goal_index:
+            best = self.infinity
+            if self.open[index]:
+                open_flags = self.open
+                for n in self.neighbors[index]:
+                    if open_flags[n] and g[n] < best:
+                        best = g[n]
+                best = min(best + 1, self.infinity)
+            self.rhs[index] = best
+        if g[index] != self.rhs[index]:
+            self._push(index, self._key(index))
+        else:
+            self.queued[index] = None
+
+    def _top_key(self) -> Optional[Tuple[int, int]]:
+        """Smallest live key in the queue (None when empty), dropping stale entries on the way"""
+        queue = self.queue
+        queued = self.queued
+        while queue:
+            k1, k2, index = queue[0]
+            if queued[index] == (k1, k2):
+                return k1, k2
+            heapq.heappop(queue)
+        return None
+
+    def _compute(self) -> int:
+        """Settle cells until the start is consistent; returns the cells expanded"""
+        g, rhs, queued, neighbors = self.g, self.rhs, self.queued, self.neighbors
+        start = self.start
+        expanded = 0
+        while True:
+            top = self._top_key()
+            if top is None:
+                return expanded  # Nothing left to settle; an unreachable start keeps an infinite rhs
+            if top >= self._key(start) and rhs[start] <= g[start]:
+                return expanded
+            _, _, index = heapq.heappop(self.queue)
+            queued[index] = None
+            new_key = self._key(index)
+            if top < new_key:
+                self._push(index, new_key)
+                continue
+            expanded += 1
+            if g[index] > rhs[index]:
+                g[index] = rhs[index]
+                for n in neighbors[index]:
+                    self._update(n)
+            else:
+                g[index] = self.infinity
+                self._update(index)
+                for n in neighbors[index]:
+                    self._update(n)
+
+    def sync(self, grid: BitboardGrid):
+        """Re-queue the cells whose wall state changed since the last sync"""
+        changed = grid.walls ^ self.walls
+        if not changed:
+            return
+        self.walls = grid.walls
+        open_flags = self.open
+        touched = set()
+        for index in mask_indices(changed):
+            open_flags[index] ^= 1
+            touched.add(index)
+            touched.update(self.neighbors[index])
+        for index in touched:
+            self._update(index)
+
+    def plan(self, grid: BitboardGrid, start: Tuple[int, int], stats=None) -> Optional[List[Tuple[int, int]]]:
+        """Shortest path from start to the goal as a list of tiles, or None if unreachable.
+
+        stats, if given, is a SearchStats whose node count grows by the
+        cells this repair expanded.
+        """
+        size = self.size
+        start_index = start[1] * size + start[0]
+        if self.start is None:
+            self.start = start_index
+        elif start_index != self.start:
+            # The runner moved: old keys undershoot by at most the distance moved
+            self.km += self._heuristic(self.start, start_index)
+            self.start = start_index
+        self.sync(grid)
+        expanded = self._compute()
+        if stats is not None:
+            stats.nodes += expanded
+
+        g, open_flags, neighbors = self.g, self.open, self.neighbors
+        if not open_flags[start_index] or self.rhs[start_index] >= self.infinity:
+            return None
+        # Walk downhill on g, going straight on ties so the path keeps long straight runs
+        path = [start]
+        index = start_index
+        step = 0
+        while index != self.goal_index:
+            best = min((n for n in neighbors[index] if open_flags[n]), key=g.__getitem__)
+            ahead = index + step
+            if step and ahead in neighbors[index] and open_flags[ahead] and g[ahead] == g[best]:
+                best = ahead
+            step = best - index
+            index = best
+            path.append((index % size, index // size))
+        return path
@@ -0,0 +1,292 @@
+# A3 Game with AI
+
+# Members:
+# Banuag, Carl
+# Deen, Marfred
+# Ferolino, Jilliane
+# Rodriguez, Andrea
+# Rulete, Jeric
+# Torres, John Angelo
+
+"""Array-backed BFS distance fields over a BitboardGrid.
+
+A DistanceField runs one breadth-first search from a root cell (usually the
+goal) and keeps the distance and parent pointer of every cell in flat
+arrays. Path length, next step toward the root and full path reconstruction
+are then lookups instead of fresh searches.
+
+A WallProximityField holds the distance from every cell to its nearest wall
+and is patched in place as walls come and go.
+"""
+
+import heapq
+from array import array
+from typing import List, Optional, Tuple
+
+from bitboard import BitboardGrid, mask_indices
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; the pure-Python BFS covers every grid size
+    np = None
+
+UNREACHED = -1
+
+# Grids at least this big use the NumPy wavefront when NumPy is installed
+WAVEFRONT_MIN_CELLS = 256 * 256
+
+
+def distance_typecode(cells: int) -> str:
+    """Smallest array typecode that can hold any path length on the grid"""
+    return "h" if cells <= 0x7FFF else "i"
+
+
+def bfs_distances(grid: BitboardGrid, root: Tuple[int, int],
+                  parents: bool = True) -> Tuple[array, Optional[array]]:
+    """Flat BFS from root; returns (distances, parents) indexed like the bitboard"""
+    cells = grid.tables.cells
+    dist = array(distance_typecode(cells), [UNREACHED]) * cells
+    parent = array("i", [UNREACHED]) * cells if parents else None
+    if not grid.is_open(root):
+        return dist, parent
+
+    flags = grid.open_flags()
+    neighbors = grid.tables.neighbors
+    start = grid.index(root)
+    dist[start] = 0
+    queue = [start]
+    # The list grows while we iterate, which makes it a FIFO queue without deque overhead
+    for current in queue:
+        step = dist[current] + 1
+        for nxt in neighbors[current]:
+            if flags[nxt] and dist[nxt] == UNREACHED:
+                dist[nxt] = step
+                if parent is not None:
+                    parent[nxt] = current
+                queue.append(nxt)
+    return dist, parent
+
+
+def wavefront_distances(grid: BitboardGrid, root: Tuple[int, int]):
+    """Vectorized NumPy BFS: expands the whole frontier one layer per step.
+
+    Returns a (size, size) int32 array indexed [y, x] with UNREACHED for
+    cells the wave never touched. Requires NumPy.
+    """
+    if np is None:
+        raise RuntimeError("NumPy is required for the wavefront distance field")
+    size = grid.size
+    open_cells = np.frombuffer(grid.open_flags(), dtype=np.uint8).reshape(size, size).astype(bool)
+    dist = np.full((size, size), UNREACHED, dtype=np.int32)
+    if not grid.is_open(root):
+        return dist
+
+    frontier = np.zeros((size, size), dtype=bool)
+    frontier[root[1], root[0]] = True
+    unvisited = open_cells.copy()
+    unvisited[root[1], root[0]] = False
+    dist[root[1], root[0]] = 0
+    step = 0
+    spread = np.empty_like(frontier)
+    while True:
+        step += 1
+        spread[:] = False
+        spread[1:, :] |= frontier[:-1, :]
+        spread[:-1, :] |= frontier[1:, :]
+        spread[:, 1:] |= frontier[:, :-1]
+        spread[:, :-1] |= frontier[:, 1:]
+        np.logical_and(spread, unvisited, out=frontier)
+        if not frontier.any():
+            return dist
+        dist[frontier] = step
+        unvisited &= ~frontier
+
+
+class DistanceField:
+    """Distances (and parent pointers) from every cell to a single root cell"""
+
+    __slots__ = ("grid", "root", "walls", "dist", "parent")
+
+    builds = 0  # Fields computed in this process, for SearchStats
+
+    def __init__(self, grid: BitboardGrid, root: Tuple[int, int], method: str = "auto"):
+        DistanceField.builds += 1
+        self.grid = grid
+        self.root = root
+        # Walls the field was computed against, so callers can tell when it is stale
+        self.walls = grid.walls
+
+        if method == "auto":
+            use_wavefront = np is not None and grid.tables.cells >= WAVEFRONT_MIN_CELLS
+            method = "wavefront" if use_wavefront else "bfs"
+
+        if method == "wavefront":
+            flat = wavefront_distances(grid, root).ravel()
+            self.dist = array("i")
+            self.dist.frombytes(flat.astype(np.int32).tobytes())
+            # Parents are implied by the distances; next_step derives them on demand
+            self.parent = None
+        elif method == "bfs":
+            self.dist, self.parent = bfs_distances(grid, root)
+        else:
+            raise ValueError(f"Unknown distance field method: {method}")
+
+    def is_current(self, grid: BitboardGrid) -> bool:
+        """Whether the field still matches the walls on grid"""
+        return self.walls == grid.walls
+
+    def distance(self, pos: Tuple[int, int]) -> Optional[int]:
+        """Steps from pos to the root, or None if pos cannot reach it"""
+        if not self.grid.in_bounds(pos):
+            return None
+        d = self.dist[pos[1] * self.grid.size + pos[0]]
+        return None if d == UNREACHED else d
+
+    def next_index(self, index: int) -> int:
+        """Index of the neighbor one step closer to the root (UNREACHED at the root)"""
+        if self.parent is not None:
+            return self.parent[index]
+        d = self.dist[index]
+        if d <= 0:
+            return UNREACHED
+        for nxt in self.grid.tables.neighbors[index]:
+            if self.dist[nxt] == d - 1:
+                return nxt
+        return UNREACHED
+
+    def next_step(self, pos: Tuple[int, int]) -> Optional[Tuple[int, int]]:
+        """Neighbor of pos that is one step closer to the root"""
+        if not self.distance(pos):
+            return None
+        return self.grid.position(self.next_index(self.grid.index(pos)))
+
+    def path_from(self, start: Tuple[int, int]) -> Optional[List[Tuple[int, int]]]:
+        """Shortest path from start to the root (both included), or None"""
+        if self.distance(start) is None:
+            return None
+        size = self.grid.size
+        index = self.grid.index(start)
+        path = [start]
+        while self.dist[index] > 0:
+            index = self.next_index(index)
+            path.append((index % size, index // size))
+        return path
+
+
+class WallProximityField:
+    """Manhattan distance from every cell to its nearest wall, updated as walls change.
+
+    A breadth-first search from every wall at once that ignores walls as
+    obstacles gives exactly the Manhattan distance to the nearest wall. New
+    walls can only bring cells closer, so a brushfire from the new tiles
+    touches just the cells that changed; broken walls clear the cells they
+    were nearest to, which are then refilled from the cells around them.
+    """
+
+    __slots__ = ("grid_size", "tables", "walls", "dist", "source")
+
+    def __init__(self, grid: BitboardGrid):
+        self.grid_size = grid.size
+        self.tables = grid.tables
+        cells = grid.tables.cells
+        self.walls = 0
+        self.dist = array(distance_typecode(cells), [UNREACHED]) * cells
+        # Index of the wall each cell is nearest to, so breaking it knows what to clear
+        self.source = array("i", [UNREACHED]) * cells
+        self.sync(grid)
+
+    def distance(self, pos: Tuple[int, int]) -> Optional[int]:
+        """Manhattan distance from pos to the nearest wall, or None if there are no walls"""
+        d = self.dist[pos[1] * self.grid_size + pos[0]]
+        return None if d == UNREACHED else d
+
+    def sync(self, grid: BitboardGrid):
+        """Bring the field up to date with the walls on grid"""
+        removed = self.walls & ~grid.walls
+        if removed:
+            self.remove_walls(removed)
+        added = grid.walls & ~self.walls
+        if added:
+            self.add_walls(added)
+
+    def add_walls(self, mask: int, record: bool = False) -> Optional[List[Tuple[int, int, int]]]:
+        """Brushfire from the new wall tiles in mask.
+
+        With record=True, returns the (index, old distance, old source) of
+        every changed cell so restore can take the walls back off.
+        """
+        dist = self.dist
+        source = self.source
+        neighbors = self.tables.neighbors
+        changes = [] if record else None
+        queue = []
+        for index in mask_indices(mask & ~self.walls):
+            if record:
+                changes.append((index, dist[index], source[index]))
+            dist[index] = 0
+            source[index] = index
+            queue.append(index)
+        self.walls |= mask
+
+        # Every seed starts at 0, so the FIFO order settles each cell the first time it improves
+        for current in queue:
+            step = dist[current] + 1
+            nearest = source[current]
+            for nxt in neighbors[current]:
+                d = dist[nxt]
+                if d == UNREACHED or step < d:
+                    if record:
+                        changes.append((nxt, d, source[nxt]))
+                    dist[nxt] = step
+                    source[nxt] = nearest
+                    queue.append(nxt)
+        return changes
+
+    def restore(self, walls: int, changes: List[Tuple[int, int, int]]):
+        """Undo an add_walls(record=True), leaving the given walls"""
+        dist = self.dist
+        source = self.source
+        for index, d, nearest in reversed(changes):
+            dist[index] = d
+            source[index] = nearest
+        self.walls = walls
+
+    def remove_walls(self, mask: int):
+        """Break the wall tiles in mask and refill the cells that were nearest to them"""
+        dist = self.dist
+        source = self.source
+        neighbors = self.tables.neighbors
+        broken = set(mask_indices(mask & self.walls))
+        self.walls &= ~mask
+        if not broken:
+            return
+
+        # Clear every cell whose nearest wall is gone; those cells are connected to it
+        cleared = []
+        for index in broken:
+            dist[index] = UNREACHED
+            source[index] = UNREACHED
+            cleared.append(index)
+        for current in cleared:
+            for nxt in neighbors[current]:
+                if source[nxt] in broken:
+                    dist[nxt] = UNREACHED
+                    source[nxt] = UNREACHED
+                    cleared.append(nxt)
+
+        # Cells around the cleared area still have correct distances; grow back from them
+        frontier = [(dist[nxt], nxt) for current in cleared for nxt in neighbors[current]
+                    if dist[nxt] != UNREACHED]
+        heapq.heapify(frontier)
+        while frontier:
+            d, current = heapq.heappop(frontier)
+            if d != dist[current]:
+                continue
+            step = d + 1
+            nearest = source[current]
+            for nxt in neighbors[current]:
+                nd = dist[nxt]
+                if nd == UNREACHED or step < nd:
+                    dist[nxt] = step
+                    source[nxt] = nearest
+                    heapq.heappush(frontier, (step, nxt))
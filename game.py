@@ -11,8 +11,11 @@
 import pygame
 import random
 import sys
-import time
 from ai_logic import MazeRunnerAI, MazeMasterAI
+from ai_thinker import AIThinker
+from game_state import (BREAK_WALL, DIAGONAL_WALL, DOUBLE_WALL, EXTENDED_MOVE, MOVE, PLACE_WALL, RUNNER,
+                        RUNNER_MOVES_PER_TURN, TELEPORT, TELEPORT_RUNNER, GameState, master_action,
+                        runner_action, sync_master_ai, sync_runner_ai)
 
 # Constants
 GRID_SIZE = 24
@@ -20,7 +23,11 @@ TILE_SIZE = 25
 SCREEN_WIDTH = GRID_SIZE * TILE_SIZE
 SCREEN_HEIGHT = GRID_SIZE * TILE_SIZE + 50
 MAX_AI_THINKING_TIME = 0.5  # Maximum time in seconds for AI to think
-AI_THINKING_DEPTH = 3  # Depth for minimax search
+AI_THINKING_DEPTH = 8  # Deepest minimax iteration; MAX_AI_THINKING_TIME decides how far it gets
+AI_SEARCH_WORKERS = 0  # Processes sharing the Maze Master's root search; 0 keeps it in this process
+AI_PONDERING = True  # Let the Maze Master AI search while the human runner is moving
+AI_RUNNER_PLANNER = "astar"  # Runner AI path planner: "astar", "jps" (Jump Point Search) or "dstar" (D* Lite)
+AI_MASTER_STRATEGY = "minimax"  # Maze Master AI search: "minimax" or "mcts" (Monte Carlo Tree Search)
 
 # Colors
 WHITE = (255, 255, 255)
@@ -45,31 +52,16 @@ clock = pygame.time.Clock()
 font = pygame.font.Font(None, 30)
 small_font = pygame.font.Font(None, 20)
 
-# Player start position
-player_x, player_y = 0, 0
-end_x, end_y = GRID_SIZE - 1, GRID_SIZE - 1
-walls = set()
-walls_placed = 0
-player_turns = 0
-player_skill_active = False
-player_skill_active_used=False
-maze_skill1_active = False
-maze_skill1_cooldown = 0
-skill_2_active = False  # Skill 2 activation flag
-skill_2_used = False  # Track if skill 2 has been used
-skill_3_active = False  # Skill 3 (wall break) activation flag
-skill_3_used = False  # Track if skill 3 has been used
-skill_3_available = False  # Track if skill 3 is available
-maze_skill_3_active = False  # Tracks if Maze Master's teleport skill is active
-maze_skill_3_cooldown = 0    # Cooldown timer for Maze Master's teleport skill
-MAZE_SKILL_3_COOLDOWN_MAX = 3  # Number of turns before skill can be used again
-game_won = False  # Flag to track if the player has won
-maze_skill2_active = False  # Tracks if Maze Master's diagonal wall skill is active
-maze_skill2_used = False    # Tracks if diagonal wall skill has been used
-
-# Track game progress for skill 3 availability
-total_player_steps = 0
-rounds_since_last_skill3 = 0  # Track moves since last skill 3 availability
+# Rules state of the current game; everything below only draws it or turns clicks into actions
+state = GameState(GRID_SIZE)
+end_x, end_y = state.end_pos
+
+# Skills the human has selected but not played yet
+player_skill_active = False  # Runner skill 1 (Extended Move) selected
+skill_2_active = False  # Runner skill 2 (Teleport) selected
+skill_3_active = False  # Runner skill 3 (Wall Break) selected
+maze_skill1_selected = False  # Maze Master skill 1 (Double Walls) selected before the first wall
+maze_skill2_active = False  # Maze Master skill 2 (Diagonal Walls) selected
 
 # Animation variables for turn text
 animation_time = 0
@@ -97,21 +89,18 @@ def draw_buttons():
     pygame.draw.rect(screen, RED, reset_button)
 
     # Player's turn buttons
-    if player_turns < 4:
+    if state.runner_to_move:
         # Skill 1 button (Extended Move)
-        # if player_skill_active_used:
-        #     skill_1_color = GRAY
-        # el
         if player_skill_active:
             skill_1_color = ACTIVE_SKILL_COLOR
         else:
-            skill_1_color = BLUE if player_turns <= 2 else GRAY  # Gray out if less than 2 turns left
+            skill_1_color = BLUE if state.can_extended_move() else GRAY  # Gray out if less than 2 turns left
         pygame.draw.rect(screen, skill_1_color, skill_1_button)
         
         # Skill 2 button (Teleport)
         if skill_2_active:
             skill_2_color = ACTIVE_SKILL_COLOR
-        elif skill_2_used:
+        elif state.skill_2_used:
             skill_2_color = GRAY
         else:
             skill_2_color = BLUE
@@ -120,7 +109,7 @@ def draw_buttons():
         # Skill 3 button (Wall Break)
         if skill_3_active:
             skill_3_color = WALL_BREAK_COLOR
-        elif not skill_3_available or skill_3_used:
+        elif not state.skill_3_available or state.skill_3_used:
             skill_3_color = GRAY
         else:
             skill_3_color = BLUE
@@ -128,10 +117,10 @@ def draw_buttons():
     # Maze Master's turn buttons
     else:
         # Skill 1 button (Double Walls)
-        if maze_skill1_active:
+        if maze_skill1_selected or state.maze_skill1_active:
             skill_1_color = ACTIVE_SKILL_COLOR
-        # elif maze_skill1_cooldown > 0:
-        #     skill_1_color = GRAY
+        elif state.maze_skill1_cooldown > 0:
+            skill_1_color = GRAY
         else:
             skill_1_color = BLUE
         pygame.draw.rect(screen, skill_1_color, skill_1_button)
@@ -139,16 +128,14 @@ def draw_buttons():
         # Skill 2 button (Diagonal Walls)
         if maze_skill2_active:
             skill_2_color = ACTIVE_SKILL_COLOR
-        elif maze_skill2_used:
+        elif state.maze_skill2_used:
             skill_2_color = GRAY
         else:
             skill_2_color = BLUE
         pygame.draw.rect(screen, skill_2_color, skill_2_button)
         
         # Skill 3 button (Teleport Player)
-        if maze_skill_3_active:
-            skill_3_color = ACTIVE_SKILL_COLOR
-        elif maze_skill_3_cooldown > 0:
+        if state.maze_skill_3_cooldown > 0:
             skill_3_color = GRAY
         else:
             skill_3_color = BLUE
@@ -168,15 +155,13 @@ def draw_buttons():
         draw_active_indicator(skill_2_button)
     if skill_3_active:
         draw_active_indicator(skill_3_button, WALL_BREAK_COLOR)
-    if maze_skill1_active:
+    if maze_skill1_selected or state.maze_skill1_active:
         draw_active_indicator(skill_1_button)
     if maze_skill2_active:
         draw_active_indicator(skill_2_button)
-    if maze_skill_3_active:
-        draw_active_indicator(skill_3_button)
     
     # Unlocked indicators
-    if skill_3_available and not skill_3_used and not skill_3_active and player_turns < 4:
+    if state.can_break_wall() and not skill_3_active and state.runner_to_move:
         draw_unlocked_indicator(skill_3_button)
 
 def draw_active_indicator(button, color=WHITE):
@@ -189,31 +174,18 @@ def draw_unlocked_indicator(button):
     text_x = button.x + (button.width - unlock_text.get_width()) // 2
     screen.blit(unlock_text, (text_x, button.y + button.height + 2))
 
-def is_valid_diagonal_wall_position(x, y, direction):
-    """Check if a diagonal wall can be placed at (x,y) in given direction."""
-    wall_positions = []
-    for i in range(3):
-        if direction == "uldr":  # Upper left to lower right
-            wx, wy = x + i, y + i
-        else:  # Upper right to lower left
-            wx, wy = x - i, y + i
-        wall_positions.append((wx, wy))
-    
-    return all(0 <= wx < GRID_SIZE and 0 <= wy < GRID_SIZE and 
-              (wx, wy) not in walls and
-              (wx, wy) != (player_x, player_y) and
-              (wx, wy) != (end_x, end_y)
-              for wx, wy in wall_positions), wall_positions
-
 
 def draw_turn_text(custom_message=None):
     # Determine the current turn or show a custom message
     if custom_message:
         turn_text = custom_message
-    elif game_won:
+    elif state.winner == RUNNER:
         turn_text = "Congratulations!"
     else:
-        turn_text = "Player's Turn" if player_turns < 4 else "Maze Master's Turn"
+        turn_text = "Player's Turn" if state.runner_to_move else "Maze Master's Turn"
+        if ai_thinker.thinking:
+            # Animated dots while the AI searches in the background
+            turn_text += " (thinking" + "." * (pygame.time.get_ticks() // 300 % 4) + ")"
     
     # Get the base text render
     base_text = font.render(turn_text, True, BLUE)
@@ -243,7 +215,7 @@ def draw_turn_text(custom_message=None):
         screen.blit(skill_info, (x_pos, y_pos + 20))
 
     # Add active skill info (Maze Master)
-    if maze_skill1_active:
+    if maze_skill1_selected or state.maze_skill1_active:
         active_skill = "Double Walls"
         active_color = ACTIVE_SKILL_COLOR
 
@@ -254,7 +226,7 @@ def draw_turn_text(custom_message=None):
 def show_turn_change_notification():
     global show_turn_notification, turn_notification_timer
     
-    notification_text = "Your Turn!" if player_turns < 4 else "Maze Master's Turn!"
+    notification_text = "Your Turn!" if state.runner_to_move else "Maze Master's Turn!"
     
     # Create a semi-transparent surface for the notification
     notification_surface = pygame.Surface((350, 80), pygame.SRCALPHA)
@@ -295,78 +267,13 @@ def show_turn_change_notification():
         show_turn_notification = False
         turn_notification_timer = 0
 
-def get_valid_moves(x, y, max_distance):
-    """Get all valid moves from current position within max_distance."""
-    valid_tiles = []
-    
-    # For skill 2 (teleport), use a square area around the player
+def get_valid_moves():
+    """Tiles the runner can click with the selected skill (the rules live in GameState)"""
     if skill_2_active:
-        for dx in range(-max_distance, max_distance + 1):
-            for dy in range(-max_distance, max_distance + 1):
-                new_x, new_y = x + dx, y + dy
-                if (0 <= new_x < GRID_SIZE and 
-                    0 <= new_y < GRID_SIZE and 
-                    (new_x, new_y) not in walls):
-                    valid_tiles.append((new_x, new_y))
-    elif player_skill_active:
-        # Horizontal line
-        for dx in range(1, 5):  # Moving right
-            new_x, new_y = x + dx, y
-            if new_x >= GRID_SIZE or (new_x, new_y) in walls:
-                break
-            valid_tiles.append((new_x, new_y))
-        for dx in range(1, 5):  # Moving left
-            new_x, new_y = x - dx, y
-            if new_x < 0 or (new_x, new_y) in walls:
-                break
-            valid_tiles.append((new_x, new_y))
-        # Vertical line
-        for dy in range(1, 5):  # Moving down
-            new_x, new_y = x, y + dy
-            if new_y >= GRID_SIZE or (new_x, new_y) in walls:
-                break
-            valid_tiles.append((new_x, new_y))
-        for dy in range(1, 5):  # Moving up
-            new_x, new_y = x, y - dy
-            if new_y < 0 or (new_x, new_y) in walls:
-                break
-            valid_tiles.append((new_x, new_y))
-    else:
-        # Regular movement (up, down, left, right)
-        for dx, dy in [(-1, 0), (1, 0), (0, -1), (0, 1)]:
-            new_x, new_y = x + dx, y + dy
-            if (0 <= new_x < GRID_SIZE and 
-                0 <= new_y < GRID_SIZE and 
-                (new_x, new_y) not in walls):
-                valid_tiles.append((new_x, new_y))
-    return valid_tiles
-
-def is_valid_wall_position(x, y, is_horizontal):
-    """Check if a wall can be placed at a specific position."""
-    if is_horizontal:
-        wall_positions = [(x + i, y) for i in range(3)]
-    else:
-        wall_positions = [(x, y + i) for i in range(3)]
-
-    # Define a protected area around the endpoint
-    protected_area = {
-        (px, py)
-        for px in range(end_x - 6, end_x + 6)
-        for py in range(end_y - 6, end_y + 6)
-        if 0 <= px < GRID_SIZE and 0 <= py < GRID_SIZE
-    }
-
-    valid = all(
-        0 <= wx < GRID_SIZE and
-        0 <= wy < GRID_SIZE and
-        (wx, wy) != (player_x, player_y) and
-        (wx, wy) != (end_x, end_y) and
-        (wx, wy) not in walls and
-        (wx, wy) not in protected_area
-        for wx, wy in wall_positions
-    )
-
-    return valid
+        return state.teleport_targets()
+    if player_skill_active:
+        return state.extended_move_targets()
+    return state.move_targets()
 
 def highlight_clickable_areas():
     """Highlight all valid moves or wall placements based on current game state."""
@@ -374,28 +281,18 @@ def highlight_clickable_areas():
     highlight_surface = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
     
     # Player's turn
-    if player_turns < 4:
-        # Player's turn highlighting (existing code)
+    if state.runner_to_move:
         if skill_3_active:
             # Highlight all wall pieces that can be broken
-            for wx, wy in walls:
+            for wx, wy in state.wall_set():
                 pygame.draw.rect(highlight_surface, (255, 100, 0, 100), 
                                (wx * TILE_SIZE, wy * TILE_SIZE + 50, TILE_SIZE, TILE_SIZE))
         else:
-            # Determine movement range based on skill
-            max_move = 4 if player_skill_active else 1
-            max_teleport = 2 if skill_2_active else 0
-            
-            # Get valid moves
-            if skill_2_active:
-                valid_tiles = get_valid_moves(player_x, player_y, max_teleport)
-                highlight_color = (255, 255, 0, 100)  # Yellow for teleport
-            else:
-                valid_tiles = get_valid_moves(player_x, player_y, max_move)
-                highlight_color = (0, 255, 0, 100)  # Green for normal movement
+            # Yellow for teleport, green for normal movement
+            highlight_color = (255, 255, 0, 100) if skill_2_active else (0, 255, 0, 100)
                 
             # Draw highlights for valid moves
-            for tx, ty in valid_tiles:
+            for tx, ty in get_valid_moves():
                 pygame.draw.rect(highlight_surface, highlight_color, 
                                (tx * TILE_SIZE, ty * TILE_SIZE + 50, TILE_SIZE, TILE_SIZE))
                 
@@ -405,12 +302,12 @@ def highlight_clickable_areas():
             # Highlight valid diagonal wall placements
             for x in range(GRID_SIZE):
                 for y in range(GRID_SIZE):
-                    if (x, y) in walls or (x, y) == (player_x, player_y) or (x, y) == (end_x, end_y):
+                    if state.is_wall((x, y)) or (x, y) == state.player_pos or (x, y) == state.end_pos:
                         continue
                     
                     # Check both diagonal directions
-                    uldr_valid, _ = is_valid_diagonal_wall_position(x, y, "uldr")
-                    urdl_valid, _ = is_valid_diagonal_wall_position(x, y, "urdl")
+                    uldr_valid, _ = state.is_valid_diagonal_wall_position(x, y, "uldr")
+                    urdl_valid, _ = state.is_valid_diagonal_wall_position(x, y, "urdl")
                     
                     if uldr_valid or urdl_valid:
                         pygame.draw.rect(highlight_surface, DIAGONAL_WALL_COLOR + (100,), 
@@ -420,10 +317,10 @@ def highlight_clickable_areas():
             is_horizontal = not pygame.key.get_pressed()[pygame.K_LSHIFT]
             for x in range(GRID_SIZE):
                 for y in range(GRID_SIZE):
-                    if (x, y) in walls or (x, y) == (player_x, player_y) or (x, y) == (end_x, end_y):
+                    if state.is_wall((x, y)) or (x, y) == state.player_pos or (x, y) == state.end_pos:
                         continue
                     
-                    if is_valid_wall_position(x, y, is_horizontal):
+                    if state.is_valid_wall_position(x, y, is_horizontal):
                         wall_positions = [(x + i, y) for i in range(3)] if is_horizontal else [(x, y + i) for i in range(3)]
                         for wx, wy in wall_positions:
                             pygame.draw.rect(highlight_surface, LIGHT_ORANGE, 
@@ -432,7 +329,7 @@ def highlight_clickable_areas():
 
 def draw_skill_info():
     """Draw skill info based on what's active"""
-    if player_turns < 4:  # Only show during player's turn
+    if state.runner_to_move:  # Only show during player's turn
         info_text = ""
         info_color = WHITE
         
@@ -469,7 +366,7 @@ def draw_skill_info():
             screen.blit(skill_info, (text_x, text_y))
         
         # Check if skill 3 just became available
-        elif skill_3_available and not skill_3_used and not skill_3_active:
+        elif state.can_break_wall() and not skill_3_active:
             unlock_text = "Skill 3 (Wall Break) is now available!"
             unlock_info = font.render(unlock_text, True, WALL_BREAK_COLOR)
             text_width, text_height = unlock_info.get_size()
@@ -489,38 +386,28 @@ def draw_skill_info():
             screen.blit(unlock_info, (text_x, text_y))
 
 def reset_game():
-    global player_x, player_y, walls, player_turns, player_skill_active, skill_2_active, skill_2_used
-    global show_turn_notification, turn_notification_timer, skill_3_active, skill_3_used, skill_3_available
-    global total_player_steps, rounds_since_last_skill3, maze_skill_3_active, maze_skill_3_cooldown
-    global maze_skill2_active, maze_skill2_used, player_skill_active_used, game_won
-    global runner_ai, master_ai, game_mode
-
-    # Reset player position and skills
-    player_x, player_y = 0, 0
-    walls.clear()
-    player_turns = 0
+    global state, player_skill_active, skill_2_active, skill_3_active, maze_skill1_selected, maze_skill2_active
+    global show_turn_notification, turn_notification_timer
+    global runner_ai, master_ai, game_mode, last_ponder_state
+
+    # Stop any AI search still running for the old game
+    ai_thinker.cancel()
+
+    # Fresh rules state and no selected skills
+    state = GameState(GRID_SIZE)
     player_skill_active = False
-    player_skill_active_used = False
-    maze_skill1_active = False
     skill_2_active = False
-    skill_2_used = False
     skill_3_active = False
-    skill_3_used = False
-    skill_3_available = False
-    game_won = False
-    total_player_steps = 0
-    rounds_since_last_skill3 = 0
-    maze_skill_3_active = False
-    maze_skill_3_cooldown = 0
+    maze_skill1_selected = False
     maze_skill2_active = False
-    maze_skill2_used = False
+    last_ponder_state = None
 
     # Re-initialize AI objects based on game mode
     if game_mode == "runner":
-        master_ai = MazeMasterAI(GRID_SIZE)
+        master_ai = MazeMasterAI(GRID_SIZE, AI_SEARCH_WORKERS, AI_MASTER_STRATEGY)
         master_ai.max_depth = AI_THINKING_DEPTH  # Set the minimax depth
     elif game_mode == "master":
-        runner_ai = MazeRunnerAI(GRID_SIZE)
+        runner_ai = MazeRunnerAI(GRID_SIZE, AI_RUNNER_PLANNER)
 
     # Show turn notification after reset
     show_turn_notification = True
@@ -535,27 +422,35 @@ show_turn_notification = True
 mouse_x, mouse_y = 0, 0
 
 
-# Add this new function after the other skill-related functions
+def play(action):
+    """Apply an action to the game state; False if the rules reject it"""
+    try:
+        state.apply(action)
+    except ValueError:
+        return False
+    return True
+
 def teleport_player_random():
-    """
-    Teleports the player to a random valid location on the grid.
-    
-    Returns:
-        bool: True if teleport was successful, False if no valid positions found
-    """
-    global player_x, player_y
-    
-    # Get all valid positions (excluding walls and end point)
-    valid_positions = [
-        (x, y) for x in range(GRID_SIZE) 
-        for y in range(GRID_SIZE)
-        if (x, y) not in walls and (x, y) != (end_x, end_y)
-    ]
-    
-    if valid_positions:
-        player_x, player_y = random.choice(valid_positions)
-        return True
-    return False
+    """Maze Master skill 3: teleport the runner to a random open tile (False if there is none)"""
+    targets = state.runner_teleport_targets()
+    return bool(targets) and play((TELEPORT_RUNNER, random.choice(targets)))
+
+# Background AI jobs; each gets the AI object and a snapshot of the game state it needs
+def master_ai_turn(stop_event, ai, snapshot):
+    """One Maze Master AI decision"""
+    sync_master_ai(ai, snapshot)
+    # Iterative deepening stops at the time limit with its best finished move
+    return ai.decide_move(snapshot.walls_placed, MAX_AI_THINKING_TIME, stop_event)
+
+def master_ai_ponder(stop_event, ai, snapshot):
+    """Maze Master AI searching ahead while the human runner is still moving"""
+    sync_master_ai(ai, snapshot, adjust_difficulty=False)
+    ai.ponder(snapshot.wall_set(), snapshot.player_pos, RUNNER_MOVES_PER_TURN - snapshot.player_turns, stop_event)
+
+def runner_ai_turn(stop_event, ai, snapshot):
+    """One Runner AI move"""
+    sync_runner_ai(ai, snapshot)
+    return ai.decide_move()
 
 # Get game mode from command line argument
 game_mode = "pvp"  # default mode
@@ -565,15 +460,17 @@ if len(sys.argv) > 1:
 # Initialize AI if needed
 runner_ai = None
 master_ai = None
+ai_thinker = AIThinker()  # Runs AI decisions off the game loop
+last_ponder_state = None  # Runner position/turn the Maze Master AI is currently pondering
 if game_mode == "runner":
-    master_ai = MazeMasterAI(GRID_SIZE)
+    master_ai = MazeMasterAI(GRID_SIZE, AI_SEARCH_WORKERS, AI_MASTER_STRATEGY)
     master_ai.max_depth = AI_THINKING_DEPTH  # Set the minimax depth
 elif game_mode == "master":
-    runner_ai = MazeRunnerAI(GRID_SIZE)
+    runner_ai = MazeRunnerAI(GRID_SIZE, AI_RUNNER_PLANNER)
 
 # Game loop
 running = True
-last_turn_state = player_turns < 4  # Track turn state to detect changes
+last_turn_state = state.runner_to_move  # Track turn state to detect changes
 while running:
     screen.fill(OFF_WHITE)
 
@@ -581,163 +478,54 @@ while running:
     mouse_x, mouse_y = pygame.mouse.get_pos()
 
     # AI moves if it's their turn
-    if not game_won:
-        if game_mode == "runner" and player_turns >= 4:
-            # Maze Master AI's turn
-            master_ai.update_state(walls, (player_x, player_y), total_player_steps)
-            
-            # Get AI move with time limit
-            start_time = time.time()
-            wall_pos, is_horizontal, skill = master_ai.decide_move(walls_placed)
-            thinking_time = time.time() - start_time
-            
-            # If AI took too long, reduce depth for next time
-            if thinking_time > MAX_AI_THINKING_TIME:
-                master_ai.max_depth = max(1, master_ai.max_depth - 1)
-            
-            if skill == "skill_1":
-                maze_skill1_active = True
-                pos1 = wall_pos
-                is_horizontal1 = is_horizontal
-
-                if is_valid_wall_position(pos1[0], pos1[1], is_horizontal1):
-                    walls.update([(pos1[0] + i, pos1[1]) for i in range(3)] if is_horizontal1 else [(pos1[0], pos1[1] + i) for i in range(3)])
-
-                walls_placed += 1
-
-                if walls_placed < 2:
-                    wall_pos, is_horizontal, skill = master_ai.decide_move(walls_placed)
-                    pos1 = wall_pos
-                    is_horizontal1 = is_horizontal
-
-                    if is_valid_wall_position(pos1[0], pos1[1], is_horizontal1):
-                        walls.update([(pos1[0] + i, pos1[1]) for i in range(3)] if is_horizontal1 else [(pos1[0], pos1[1] + i) for i in range(3)])
-
-                    walls_placed += 1
-
-                if walls_placed == 2:
-                    player_turns = 0
-                    walls_placed = 0
-                    master_ai.skill_1_cooldown = 3
-                    maze_skill1_active = False
-
-                show_turn_notification = True
-                turn_notification_timer = 0
-                rounds_since_last_skill3 += 1
-                
-            elif skill == "skill_2":
-                maze_skill2_active = True
-                maze_skill2_used = True
-                direction = "urdl" if pygame.key.get_pressed()[pygame.K_LSHIFT] else "uldr"
-                valid, wall_positions = is_valid_diagonal_wall_position(wall_pos[0], wall_pos[1], direction)
-                if valid:
-                    walls.update(wall_positions)
-                    maze_skill2_active = False
-                    master_ai.skill_2_used = True
-                    player_turns = 0
-                    show_turn_notification = True
-                    turn_notification_timer = 0
-                    rounds_since_last_skill3 += 1
-                
-            elif skill == "skill_3" and maze_skill_3_cooldown == 0:
-                if teleport_player_random():
-                    master_ai.skill_3_cooldown = MAZE_SKILL_3_COOLDOWN_MAX
-                    player_turns = 0
-                    show_turn_notification = True
-                    turn_notification_timer = 0
+    if not state.game_over:
+        if game_mode == "runner" and not state.runner_to_move:
+            # Maze Master AI's turn, searched in the background on a snapshot of the game
+            if not ai_thinker.thinking:
+                ai_thinker.start(master_ai_turn, master_ai, state.clone())
             
-            if not any([maze_skill1_active, maze_skill2_active, maze_skill_3_active]):
-                # Place wall using AI's decision
-                if is_valid_wall_position(wall_pos[0], wall_pos[1], is_horizontal):
-                    if is_horizontal:
-                        wall_positions = [(wall_pos[0] + i, wall_pos[1]) for i in range(3)]
-                    else:
-                        wall_positions = [(wall_pos[0], wall_pos[1] + i) for i in range(3)]
-                    walls.update(wall_positions)
-                    player_turns = 0
-                    show_turn_notification = True
-                    turn_notification_timer = 0
-                    rounds_since_last_skill3 += 1
-                    
-                    # Check if walls cover 30% of the grid
-                    total_tiles = GRID_SIZE * GRID_SIZE
-                    if len(walls) >= total_tiles * 0.3:
-                        game_won = True
-                        draw_turn_text("Maze Master Wins!")
-                        pygame.display.flip()
-                        pygame.time.delay(2000)
-                        reset_game()
-                        continue
-
-            if master_ai.skill_1_cooldown > 0:
-                master_ai.skill_1_cooldown -= 1
-            if master_ai.skill_3_cooldown > 0:
-                master_ai.skill_3_cooldown -= 1
+            decision = ai_thinker.poll()
+            if decision is not None:
+                # An illegal decision falls back to a legal wall instead of stalling the turn;
+                # the second wall of Double Walls comes from the next background decision,
+                # which returns the wall planned with the first without searching again
+                play(master_action(state, decision))
         
-        elif game_mode == "master" and player_turns < 4:
-            # Runner AI's turn
-            runner_ai.update_state(walls, (player_x, player_y), rounds_since_last_skill3)
-            next_pos, skill, use_skill = runner_ai.decide_move()
-            
-            if use_skill:
-                if skill == "skill_1":
-                    player_skill_active = True
-                elif skill == "skill_2":
-                    # Instead of just activating the skill, complete the teleport in one step
-                    skill_2_active = True
-                    valid_tiles = get_valid_moves(player_x, player_y, 2)  # Get valid teleport destinations
-                    if valid_tiles and next_pos in valid_tiles:
-                        player_x, player_y = next_pos
-                        skill_2_active = False
-                        skill_2_used = True
-                        player_turns += 1
-                        total_player_steps += 1
-                    else:
-                        # If we can't teleport to the desired position, choose any valid position
-                        if valid_tiles:
-                            player_x, player_y = random.choice(valid_tiles)
-                            skill_2_active = False
-                            skill_2_used = True
-                            player_turns += 1
-                            total_player_steps += 1
-                        else:
-                            # If no valid tiles for teleport, just disable the skill
-                            skill_2_active = False
-                elif skill == "skill_3" and skill_3_available and not skill_3_used:
-                    # Execute wall break immediately when AI decides to use it
-                    if next_pos in walls:  # next_pos contains the wall position to break
-                        walls.remove(next_pos)
-                        skill_3_used = True
-                        skill_3_active = False
-                        player_turns += 1
-                        total_player_steps += 1
-                        rounds_since_last_skill3 = 0  # Reset the counter after using skill 3
-                        print(f"AI broke wall at position {next_pos}")  # Debug message
+        elif game_mode == "runner" and AI_PONDERING:
+            # Human runner's turn: the Maze Master searches where the runner is heading meanwhile
+            ponder_state = (state.player_pos, state.player_turns, state.grid.walls)
+            if ponder_state != last_ponder_state:
+                ai_thinker.ponder(master_ai_ponder, master_ai, state.clone())
+                last_ponder_state = ponder_state
+        
+        elif game_mode == "master" and state.runner_to_move:
+            # Runner AI's turn, decided in the background on a snapshot of the game
+            if not ai_thinker.thinking:
+                ai_thinker.start(runner_ai_turn, runner_ai, state.clone())
             
-            if not any([player_skill_active, skill_2_active, skill_3_active]):
-                # Move to AI's decided position
-                if next_pos in get_valid_moves(player_x, player_y, 1):
-                    player_x, player_y = next_pos
-                    player_turns += 1
-                    total_player_steps += 1
-
-    # Check if the player has reached the goal
-    if player_x == end_x and player_y == end_y:
-        game_won = True
-        if game_mode == "runner":
-            draw_turn_text("Congratulations!")  # Show "Congratulations!" for runner
-        elif game_mode == "master":
-            draw_turn_text("You Lose!")  # Show "You Lose!" for master
+            decision = ai_thinker.poll()
+            if decision is not None:
+                play(runner_action(state, decision))
+
+    # Check if the game is over: runner at the goal, walls at 30% coverage or the runner trapped
+    if state.game_over:
+        if state.winner == RUNNER:
+            if game_mode == "master":
+                draw_turn_text("You Lose!")  # Show "You Lose!" for master
+            else:
+                draw_turn_text("Congratulations!")  # Show "Congratulations!" for runner
+        else:
+            draw_turn_text("Maze Master Wins!")
         pygame.display.flip()
         pygame.time.delay(2000)  # Display message for 2 seconds
         reset_game()
         continue  # Restart the loop after resetting
-    
-    # Check if Skill 3 should become available (after 4 moves total and every 4 moves thereafter)
-    if rounds_since_last_skill3 >= 4 and (skill_3_used or not skill_3_available):
-        skill_3_available = True
-        skill_3_used = False
-        rounds_since_last_skill3 = 0
+
+    # Selected runner skills do not carry over into the Maze Master's turn
+    if not state.can_extended_move():
+        player_skill_active = False
+    if not state.runner_to_move:
+        skill_2_active = skill_3_active = False
 
     # Draw the grid
     for x in range(0, SCREEN_WIDTH, TILE_SIZE):
@@ -745,13 +533,14 @@ while running:
             pygame.draw.rect(screen, BLACK, pygame.Rect(x, y, TILE_SIZE, TILE_SIZE), 1)
     
     # Draw walls
-    for wx, wy in walls:
+    for wx, wy in state.wall_set():
         pygame.draw.rect(screen, GRAY, (wx * TILE_SIZE, wy * TILE_SIZE + 50, TILE_SIZE, TILE_SIZE))
     
     # Highlight valid moves
     highlight_clickable_areas()
     
     # Draw player and end positions (on top of highlights)
+    player_x, player_y = state.player_pos
     pygame.draw.rect(screen, GREEN, (player_x * TILE_SIZE, player_y * TILE_SIZE + 50, TILE_SIZE, TILE_SIZE))
     pygame.draw.rect(screen, RED, (end_x * TILE_SIZE, end_y * TILE_SIZE + 50, TILE_SIZE, TILE_SIZE))
     
@@ -763,7 +552,7 @@ while running:
     draw_skill_info()
     
     # Check if turn state has changed
-    current_turn_state = player_turns < 4
+    current_turn_state = state.runner_to_move
     if current_turn_state != last_turn_state:
         show_turn_notification = True
         turn_notification_timer = 0
@@ -788,161 +577,87 @@ while running:
                 reset_game()
                 continue
             
+            # Board and skills stay locked while the AI is deciding its move
+            if ai_thinker.thinking or state.game_over:
+                continue
+            
             # Skill button handling
             if skill_1_button.collidepoint(mx, my):
-                if player_turns < 4:
+                if state.runner_to_move:
                     # Only allow activation if player has at least 2 turns remaining
-                    if player_turns < 3:
+                    if state.can_extended_move():
                         player_skill_active = True
-                elif player_turns >= 4 and maze_skill1_cooldown == 0:
-                    maze_skill1_active = True
-                    maze_skill1_cooldown = 0
+                elif state.can_double_wall():
+                    maze_skill1_selected = True
+                    maze_skill2_active = False
                 continue
             
             if skill_2_button.collidepoint(mx, my):
-                if player_turns < 4 and not skill_2_used:
+                if state.runner_to_move and state.can_teleport():
                     skill_2_active = not skill_2_active
                     if skill_2_active:
                         player_skill_active = False
                         skill_3_active = False
-                elif player_turns >= 4 and not maze_skill2_used:
+                elif not state.runner_to_move and state.can_diagonal_wall():
                     maze_skill2_active = not maze_skill2_active
                     if maze_skill2_active:
-                        maze_skill1_active = False
+                        maze_skill1_selected = False
                 continue
                 
             if skill_3_button.collidepoint(mx, my):
-                if player_turns < 4 and skill_3_available and not skill_3_used:
+                if state.runner_to_move and state.can_break_wall():
                     skill_3_active = not skill_3_active
                     if skill_3_active:
                         player_skill_active = False
                         skill_2_active = False
-                elif player_turns >= 4 and maze_skill_3_cooldown == 0:
-                    maze_skill_3_active = True
-                    if teleport_player_random():
-                        maze_skill_3_cooldown = MAZE_SKILL_3_COOLDOWN_MAX
-                        player_turns = 0
-                        show_turn_notification = True
-                        turn_notification_timer = 0
-                    maze_skill_3_active = False
+                elif not state.runner_to_move and state.can_teleport_runner():
+                    teleport_player_random()
                 continue
             
             if my < 50:
                 continue
 
-            clicked_x = mx // TILE_SIZE
-            clicked_y = (my - 50) // TILE_SIZE
+            clicked = (mx // TILE_SIZE, (my - 50) // TILE_SIZE)
             
             # Player actions
-            if player_turns < 4:
+            if state.runner_to_move:
                 # Only allow player movement if NOT in master mode (playing as Maze Master)
                 if game_mode != "master":
-                    if skill_3_active and (clicked_x, clicked_y) in walls:
-                        walls.remove((clicked_x, clicked_y))
-                        skill_3_active = False
-                        skill_3_used = True
-                        player_turns += 1
-                        total_player_steps += 1
+                    if skill_3_active and state.is_wall(clicked):
+                        if play((BREAK_WALL, clicked)):
+                            skill_3_active = False
                         continue
 
                     if skill_2_active:
-                        valid_tiles = get_valid_moves(player_x, player_y, 2)  # Get valid tiles within teleport range
-                        if (clicked_x, clicked_y) in valid_tiles and (clicked_x, clicked_y) not in walls:
-                            player_x, player_y = clicked_x, clicked_y
+                        if play((TELEPORT, clicked)):
                             skill_2_active = False
-                            skill_2_used = True
-                            player_turns += 1
-                            total_player_steps += 1
                         continue
 
                     if player_skill_active:
-                        if player_turns < 2:
-                            player_skill_active_used = True
-                        valid_moves = get_valid_moves(player_x, player_y, 1)
-                        if (clicked_x, clicked_y) in valid_moves:
-                            player_x, player_y = clicked_x, clicked_y
-                            player_turns += 2
-                            total_player_steps += 1
+                        if play((EXTENDED_MOVE, clicked)):
                             player_skill_active = False
                     else:
-                        valid_moves = get_valid_moves(player_x, player_y, 1)
-                        if (clicked_x, clicked_y) in valid_moves:
-                            player_x, player_y = clicked_x, clicked_y
-                            player_turns += 1
-                            total_player_steps += 1
-            # Maze Master actions
-            else:
-                if (clicked_x, clicked_y) == (player_x, player_y) or (clicked_x, clicked_y) == (end_x, end_y):
+                        play((MOVE, clicked))
+            # Maze Master actions (only when a human plays the Maze Master)
+            elif game_mode != "runner":
+                if clicked == state.player_pos or clicked == state.end_pos:
                     continue
                     
                 if maze_skill2_active:
                     direction = "urdl" if pygame.key.get_pressed()[pygame.K_LSHIFT] else "uldr"
-                    valid, wall_positions = is_valid_diagonal_wall_position(clicked_x, clicked_y, direction)
-                    if valid:
-                        walls.update(wall_positions)
+                    if play((DIAGONAL_WALL, clicked, direction)):
                         maze_skill2_active = False
-                        maze_skill2_used = True
-                        player_turns = 0
-                        show_turn_notification = True
-                        turn_notification_timer = 0
-                        rounds_since_last_skill3 += 1
-
-                elif maze_skill1_active:   # Skill 1 is activated (Maze master)
-
-                        if walls_placed < 2:    # Required to place 2 walls
-                            if pygame.key.get_pressed()[pygame.K_LSHIFT]:
-                                wall_positions = [(clicked_x, clicked_y + i) for i in range(3)]
-                            else:
-                                wall_positions = [(clicked_x + i, clicked_y) for i in range(3)]
-                            
-                            valid = all(0 <= wx < GRID_SIZE and 0 <= wy < GRID_SIZE and 
-                                        (wx, wy) != (player_x, player_y) and (wx, wy) != (end_x, end_y) and 
-                                        (wx, wy) not in walls for wx, wy in wall_positions)
-                            
-                            if valid:
-                                walls.update(wall_positions)
-                                walls_placed += 1  # Increment only if valid
-                            
-                            # End turn if invalid placement or two walls are placed
-                            if walls_placed >= 2:
-                                player_turns = 0  # End Maze Master's turn
-                                walls_placed = 0  # Reset walls counter
-                                maze_skill1_active = False  # Reset Skill 1 activation
-                                continue
-                        
-                        # Reset Skill 1 activation if no walls were placed
-                        if walls_placed == 0:
-                            maze_skill1_active = False
-                            walls_placed = 0
-                            player_turns = 0
-                            continue
+
+                elif maze_skill1_selected or state.maze_skill1_active:   # Skill 1 is activated (Maze master)
+                    # Two walls this turn; the turn ends after the second
+                    is_horizontal = not pygame.key.get_pressed()[pygame.K_LSHIFT]
+                    if play((DOUBLE_WALL, clicked, is_horizontal)) and not state.maze_skill1_active:
+                        maze_skill1_selected = False
                 else:
                     is_horizontal = not pygame.key.get_pressed()[pygame.K_LSHIFT]
-
-                    if is_valid_wall_position(clicked_x, clicked_y, is_horizontal):
-                        wall_positions = [(clicked_x + i, clicked_y) for i in range(3)] if is_horizontal else [(clicked_x, clicked_y + i) for i in range(3)]
-                        walls.update(wall_positions)
-                        player_turns = 0
-                        show_turn_notification = True
-                        turn_notification_timer = 0
-                        rounds_since_last_skill3 += 1
-
-                        # Check if walls cover 50% of the grid
-                        total_tiles = GRID_SIZE * GRID_SIZE
-                        if len(walls) >= total_tiles * 0.3:
-                            game_won = True
-                            draw_turn_text("Maze Master Wins!")
-                            pygame.display.flip()
-                            pygame.time.delay(2000)
-                            reset_game()
-                            continue
-                        
-                # Update cooldowns
-                if maze_skill1_cooldown > 0:
-                    maze_skill1_cooldown -= 1
-                if maze_skill_3_cooldown > 0:
-                    maze_skill_3_cooldown -= 1
+                    play((PLACE_WALL, clicked, is_horizontal))
     pygame.display.flip()
     clock.tick(60)
 
-pygame.quit()
\ No newline at end of file
+ai_thinker.shutdown()
+pygame.quit()
@@ -0,0 +1,453 @@
+# A3 Game with AI
+
+# Members:
+# Banuag, Carl
+# Deen, Marfred
+# Ferolino, Jilliane
+# Rodriguez, Andrea
+# Rulete, Jeric
+# Torres, John Angelo
+
+"""Headless rules engine for Endless Laibyrinth.
+
+GameState holds everything the rules need - walls, runner position, turn
+counter, skill flags and cooldowns - and changes only through apply(action).
+It never imports pygame, so games can be simulated as fast as the AIs can
+decide; game.py draws a GameState and turns clicks into actions.
+
+Actions are tuples whose first item is the action kind:
+
+    (MOVE, pos)                         Runner steps to an orthogonal neighbor
+    (EXTENDED_MOVE, pos)                Runner skill 1: up to 4 tiles in a line, costs 2 moves
+    (TELEPORT, pos)                     Runner skill 2: any open tile within 2, once per game
+    (BREAK_WALL, pos)                   Runner skill 3: remove one wall tile
+    (PLACE_WALL, origin, is_horizontal) Maze Master places a 3-tile wall
+    (DOUBLE_WALL, origin, is_horizontal) Maze Master skill 1: one of two walls this turn
+    (DIAGONAL_WALL, origin, direction)  Maze Master skill 2: a diagonal wall, once per game
+    (TELEPORT_RUNNER, pos)              Maze Master skill 3: send the runner to pos
+"""
+
+import random
+from typing import Dict, List, Optional, Set, Tuple
+
+from bitboard import BitboardGrid, DIAGONAL_ULDR, DIAGONAL_URDL, shape_of, wall_tiles
+
+# Rule constants
+RUNNER_MOVES_PER_TURN = 4
+EXTENDED_MOVE_RANGE = 4
+TELEPORT_RANGE = 2
+SKILL_3_UNLOCK_ROUNDS = 4  # Maze Master turns before the runner's wall break unlocks again
+MAZE_SKILL_1_COOLDOWN_MAX = 3
+MAZE_SKILL_3_COOLDOWN_MAX = 3
+WIN_COVERAGE = 0.3  # The Maze Master wins once walls cover this share of the grid
+PROTECTED_RADIUS = 6  # Plain walls may not be placed this close to the goal
+
+# Action kinds
+MOVE = "move"
+EXTENDED_MOVE = "extended_move"
+TELEPORT = "teleport"
+BREAK_WALL = "break_wall"
+PLACE_WALL = "wall"
+DOUBLE_WALL = "double_wall"
+DIAGONAL_WALL = "diagonal_wall"
+TELEPORT_RUNNER = "teleport_runner"
+
+# Winners
+RUNNER = "runner"
+MASTER = "master"
+
+_PROTECTED: Dict[Tuple[int, Tuple[int, int]], int] = {}
+
+
+def protected_mask(grid: BitboardGrid, end_pos: Tuple[int, int]) -> int:
+    """Tiles around the goal where plain walls may not go (cached per grid size and goal)"""
+    key = (grid.size, end_pos)
+    mask = _PROTECTED.get(key)
+    if mask is None:
+        end_x, end_y = end_pos
+        mask = _PROTECTED[key] = grid.mask_of(
+            (px, py)
+            for px in range(end_x - PROTECTED_RADIUS, end_x + PROTECTED_RADIUS)
+            for py in range(end_y - PROTECTED_RADIUS, end_y + PROTECTED_RADIUS))
+    return mask
+
+
+class GameState:
+    """Complete rules state of one game"""
+
+    __slots__ = ("size", "grid", "end_pos", "player_pos", "player_turns", "total_player_steps",
+                 "skill_2_used", "skill_3_available", "skill_3_used", "rounds_since_last_skill3",
+                 "maze_skill1_active", "walls_placed", "maze_skill1_cooldown", "maze_skill2_used",
+                 "maze_skill_3_cooldown", "winner")
+
+    def __init__(self, size: int = 24):
+        self.size = size
+        self.grid = BitboardGrid(size)
+        self.end_pos = (size - 1, size - 1)
+        self.player_pos = (0, 0)
+        self.player_turns = 0  # Runner moves used this round; the Maze Master plays once it hits 4
+        self.total_player_steps = 0
+        self.skill_2_used = False
+        self.skill_3_available = False
+        self.skill_3_used = False
+        self.rounds_since_last_skill3 = 0
+        self.maze_skill1_active = False  # Between the two walls of Double Walls
+        self.walls_placed = 0
+        self.maze_skill1_cooldown = 0
+        self.maze_skill2_used = False
+        self.maze_skill_3_cooldown = 0
+        self.winner: Optional[str] = None
+
+    def clone(self) -> "GameState":
+        """Independent copy (walls are a single int, so this is a handful of assignments)"""
+        clone = GameState.__new__(GameState)
+        for name in GameState.__slots__:
+            setattr(clone, name, getattr(self, name))
+        clone.grid = self.grid.copy()
+        return clone
+
+    # --- Queries -----------------------------------------------------------
+
+    @property
+    def runner_to_move(self) -> bool:
+        return self.player_turns < RUNNER_MOVES_PER_TURN
+
+    @property
+    def game_over(self) -> bool:
+        return self.winner is not None
+
+    def wall_set(self) -> Set[Tuple[int, int]]:
+        """Wall tiles as a set, the form the AIs and the renderer use"""
+        return set(self.grid.tiles_of(self.grid.walls))
+
+    def is_wall(self, pos: Tuple[int, int]) -> bool:
+        return self.grid.is_wall(pos)
+
+    def coverage(self) -> float:
+        return self.grid.coverage()
+
+    def is_valid_wall_position(self, x: int, y: int, is_horizontal: bool) -> bool:
+        """Whether a 3-tile wall fits at (x, y) clear of the runner, the goal and its protected area"""
+        grid = self.grid
+        blocked = grid.bit(self.player_pos) | grid.bit(self.end_pos) | protected_mask(grid, self.end_pos)
+        return grid.can_place((x, y), shape_of(is_horizontal), blocked)
+
+    def is_valid_diagonal_wall_position(self, x: int, y: int, direction: str) -> Tuple[bool, List[Tuple[int, int]]]:
+        """Whether a diagonal wall fits at (x, y), and the tiles it would cover"""
+        shape = DIAGONAL_ULDR if direction == DIAGONAL_ULDR else DIAGONAL_URDL
+        grid = self.grid
+        blocked = grid.bit(self.player_pos) | grid.bit(self.end_pos)
+        return grid.can_place((x, y), shape, blocked), wall_tiles((x, y), shape)
+
+    def move_targets(self) -> List[Tuple[int, int]]:
+        """Open orthogonal neighbors of the runner"""
+        return self.grid.neighbors(self.player_pos)
+
+    def extended_move_targets(self) -> List[Tuple[int, int]]:
+        """Tiles up to EXTENDED_MOVE_RANGE away in a straight line, stopping at walls"""
+        x, y = self.player_pos
+        size, walls = self.size, self.grid.walls
+        targets = []
+        for dx, dy in ((1, 0), (-1, 0), (0, 1), (0, -1)):
+            for i in range(1, EXTENDED_MOVE_RANGE + 1):
+                tx, ty = x + dx * i, y + dy * i
+                if not (0 <= tx < size and 0 <= ty < size) or (walls >> (ty * size + tx)) & 1:
+                    break
+                targets.append((tx, ty))
+        return targets
+
+    def teleport_targets(self) -> List[Tuple[int, int]]:
+        """Open tiles in the square of radius TELEPORT_RANGE around the runner"""
+        x, y = self.player_pos
+        size, walls = self.size, self.grid.walls
+        return [(tx, ty)
+                for tx in range(max(x - TELEPORT_RANGE, 0), min(x + TELEPORT_RANGE + 1, size))
+                for ty in range(max(y - TELEPORT_RANGE, 0), min(y + TELEPORT_RANGE + 1, size))
+                if (tx, ty) != (x, y) and not (walls >> (ty * size + tx)) & 1]
+
+    def runner_teleport_targets(self) -> List[Tuple[int, int]]:
+        """Where the Maze Master's teleport may send the runner: any open tile but the goal"""
+        return [pos for pos in self.grid.tiles_of(self.grid.open_cells) if pos != self.end_pos]
+
+    def can_extended_move(self) -> bool:
+        return self.player_turns <= RUNNER_MOVES_PER_TURN - 2
+
+    def can_teleport(self) -> bool:
+        return not self.skill_2_used
+
+    def can_break_wall(self) -> bool:
+        return self.skill_3_available and not self.skill_3_used and self.grid.walls != 0
+
+    def can_double_wall(self) -> bool:
+        return self.maze_skill1_active or self.maze_skill1_cooldown == 0
+
+    def can_diagonal_wall(self) -> bool:
+        return not self.maze_skill1_active and not self.maze_skill2_used
+
+    def can_teleport_runner(self) -> bool:
+        return not self.maze_skill1_active and self.maze_skill_3_cooldown == 0
+
+    def runner_actions(self) -> List[tuple]:
+        """Every legal runner action"""
+        actions = [(MOVE, pos) for pos in self.move_targets()]
+        if self.can_extended_move():
+            actions.extend((EXTENDED_MOVE, pos) for pos in self.extended_move_targets())
+        if self.can_teleport():
+            actions.extend((TELEPORT, pos) for pos in self.teleport_targets())
+        if self.can_break_wall():
+            actions.extend((BREAK_WALL, pos) for pos in self.grid.tiles_of(self.grid.walls))
+        return actions
+
+    def master_actions(self) -> List[tuple]:
+        """Every legal Maze Master action (a runner teleport is listed once per target)"""
+        grid = self.grid
+        blocked = grid.bit(self.player_pos) | grid.bit(self.end_pos)
+        plain_blocked = blocked | protected_mask(grid, self.end_pos)
+        kinds = [DOUBLE_WALL] if self.maze_skill1_active else [PLACE_WALL]
+        if not self.maze_skill1_active and self.can_double_wall():
+            kinds.append(DOUBLE_WALL)
+        actions = []
+        for is_horizontal in (True, False):
+            for origin in grid.tiles_of(grid.legal_origins(shape_of(is_horizontal), plain_blocked)):
+                actions.extend((kind, origin, is_horizontal) for kind in kinds)
+        if self.can_diagonal_wall():
+            for direction in (DIAGONAL_ULDR, DIAGONAL_URDL):
+                actions.extend((DIAGONAL_WALL, origin, direction)
+                               for origin in grid.tiles_of(grid.legal_origins(direction, blocked)))
+        if self.can_teleport_runner():
+            actions.extend((TELEPORT_RUNNER, pos) for pos in self.runner_teleport_targets())
+        return actions
+
+    def legal_actions(self) -> List[tuple]:
+        """Legal actions of the side to move (none once the game is over)"""
+        if self.winner is not None:
+            return []
+        return self.runner_actions() if self.runner_to_move else self.master_actions()
+
+    def random_action(self, rng: random.Random = random, attempts: int = 64) -> Optional[tuple]:
+        """A random legal action for playouts, without listing every Maze Master action.
+
+        The Maze Master samples plain walls (the pending Double Walls wall
+        mid-skill) by rejection and only enumerates when that keeps failing.
+        """
+        if self.winner is not None:
+            return None
+        if self.runner_to_move:
+            return rng.choice(self.runner_actions())
+        grid = self.grid
+        kind = DOUBLE_WALL if self.maze_skill1_active else PLACE_WALL
+        blocked = grid.walls | grid.bit(self.player_pos) | grid.bit(self.end_pos) | protected_mask(grid, self.end_pos)
+        size = self.size
+        for _ in range(attempts):
+            origin = (rng.randrange(size), rng.randrange(size))
+            is_horizontal = rng.random() < 0.5
+            mask = grid.placement_mask(origin, shape_of(is_horizontal))
+            if mask is not None and not mask & blocked:
+                return (kind, origin, is_horizontal)
+        actions = self.master_actions()
+        return rng.choice(actions) if actions else None
+
+    def is_runner_trapped(self) -> bool:
+        """The runner cannot move, teleport or break a wall"""
+        return not (self.move_targets()
+                    or (self.can_extended_move() and self.extended_move_targets())
+                    or (self.can_teleport() and self.teleport_targets())
+                    or self.can_break_wall())
+
+    # --- Rules -------------------------------------------------------------
+
+    def apply(self, action: tuple):
+        """Play an action for the side to move; raises ValueError if it is not legal"""
+        if self.winner is not None:
+            raise ValueError("The game is already over")
+        kind = action[0]
+        if self.runner_to_move:
+            self._apply_runner(kind, action)
+        else:
+            self._apply_master(kind, action)
+
+    def _apply_runner(self, kind: str, action: tuple):
+        pos = action[1]
+        cost = 1
+        x, y = self.player_pos
+        dx, dy = pos[0] - x, pos[1] - y
+        if kind == MOVE:
+            if abs(dx) + abs(dy) != 1 or not self.grid.is_open(pos):
+                raise ValueError(f"Runner cannot move to {pos}")
+        elif kind == EXTENDED_MOVE:
+            if not self.can_extended_move() or not self._line_is_open(dx, dy):
+                raise ValueError(f"Runner cannot make an extended move to {pos}")
+            cost = 2
+        elif kind == TELEPORT:
+            if (not self.can_teleport() or max(abs(dx), abs(dy)) > TELEPORT_RANGE
+                    or not (dx or dy) or not self.grid.is_open(pos)):
+                raise ValueError(f"Runner cannot teleport to {pos}")
+            self.skill_2_used = True
+        elif kind == BREAK_WALL:
+            if not self.can_break_wall() or not self.grid.is_wall(pos):
+                raise ValueError(f"Runner cannot break a wall at {pos}")
+            self.grid.walls &= ~self.grid.bit(pos)
+            self.skill_3_used = True
+            pos = self.player_pos
+        else:
+            raise ValueError(f"Not a runner action: {action}")
+
+        self.player_pos = pos
+        self.player_turns += cost
+        self.total_player_steps += 1
+        if pos == self.end_pos:
+            self.winner = RUNNER
+        elif self.runner_to_move and self.is_runner_trapped():
+            # Trapped partway through its own turn, e.g. after breaking a wall that was no way out
+            self.winner = MASTER
+
+    def _line_is_open(self, dx: int, dy: int) -> bool:
+        """Whether the straight line of up to EXTENDED_MOVE_RANGE tiles from the runner by (dx, dy) is open"""
+        steps = abs(dx) + abs(dy)
+        if (dx and dy) or not 0 < steps <= EXTENDED_MOVE_RANGE:
+            return False
+        x, y = self.player_pos
+        step_x, step_y = dx // steps, dy // steps
+        return all(self.grid.is_open((x + step_x * i, y + step_y * i)) for i in range(1, steps + 1))
+
+    def _apply_master(self, kind: str, action: tuple):
+        grid = self.grid
+        if kind in (PLACE_WALL, DOUBLE_WALL):
+            _, origin, is_horizontal = action
+            allowed = self.can_double_wall() if kind == DOUBLE_WALL else not self.maze_skill1_active
+            if not allowed or not self.is_valid_wall_position(origin[0], origin[1], is_horizontal):
+                raise ValueError(f"Maze Master cannot place {action}")
+            grid.walls |= grid.placement_mask(origin, shape_of(is_horizontal))
+            if kind == PLACE_WALL:
+                self._end_master_turn(True)
+            else:
+                self.maze_skill1_active = True
+                self.walls_placed += 1
+                if self.walls_placed == 2:
+                    self.maze_skill1_active = False
+                    self.walls_placed = 0
+                    self._end_master_turn(True)
+                    self.maze_skill1_cooldown = MAZE_SKILL_1_COOLDOWN_MAX
+        elif kind == DIAGONAL_WALL:
+            _, origin, direction = action
+            valid, _ = self.is_valid_diagonal_wall_position(origin[0], origin[1], direction)
+            if not self.can_diagonal_wall() or not valid:
+                raise ValueError(f"Maze Master cannot place {action}")
+            grid.walls |= grid.placement_mask(origin, direction)
+            self.maze_skill2_used = True
+            self._end_master_turn(True)
+        elif kind == TELEPORT_RUNNER:
+            pos = action[1]
+            if not self.can_teleport_runner() or not grid.is_open(pos) or pos == self.end_pos:
+                raise ValueError(f"Maze Master cannot teleport the runner to {pos}")
+            self.player_pos = pos
+            self._end_master_turn(False)
+            self.maze_skill_3_cooldown = MAZE_SKILL_3_COOLDOWN_MAX
+        else:
+            raise ValueError(f"Not a Maze Master action: {action}")
+
+    def _end_master_turn(self, placed_walls: bool):
+        """Hand the turn back to the runner and settle cooldowns and win conditions"""
+        self.player_turns = 0
+        if placed_walls:
+            self.rounds_since_last_skill3 += 1
+        if self.maze_skill1_cooldown > 0:
+            self.maze_skill1_cooldown -= 1
+        if self.maze_skill_3_cooldown > 0:
+            self.maze_skill_3_cooldown -= 1
+
+        # Wall break unlocks every SKILL_3_UNLOCK_ROUNDS Maze Master turns
+        if self.rounds_since_last_skill3 >= SKILL_3_UNLOCK_ROUNDS and (self.skill_3_used or not self.skill_3_available):
+            self.skill_3_available = True
+            self.skill_3_used = False
+            self.rounds_since_last_skill3 = 0
+
+        if self.grid.coverage() >= WIN_COVERAGE or self.is_runner_trapped():
+            self.winner = MASTER
+
+
+# --- AI adapters -----------------------------------------------------------
+# The AIs predate GameState and keep their own view of the skills; these copy
+# the rule state in and turn their (pos, ..., skill) decisions into actions.
+
+def sync_runner_ai(ai, state: GameState):
+    """Give a MazeRunnerAI the walls, position and skills of state"""
+    ai.update_state(state.wall_set(), state.player_pos, state.rounds_since_last_skill3)
+    ai.skill_1_available = state.can_extended_move()
+    ai.skill_2_available = state.can_teleport()
+    ai.skill_3_available = state.can_break_wall()
+
+
+def sync_master_ai(ai, state: GameState, adjust_difficulty: bool = True):
+    """Give a MazeMasterAI the walls, runner and skill cooldowns of state.
+
+    Pass adjust_difficulty=False for anything but the real per-turn decision
+    (e.g. pondering), so the difficulty still moves once per master turn.
+    """
+    if state.maze_skill1_active:
+        # Second wall of Double Walls: same turn, so only the walls changed
+        ai.walls = state.wall_set()
+    else:
+        ai.update_state(state.wall_set(), state.player_pos, state.total_player_steps, adjust_difficulty)
+    ai.skill_1_cooldown = 0 if state.can_double_wall() else state.maze_skill1_cooldown
+    ai.skill_2_used = state.maze_skill2_used
+    ai.skill_3_cooldown = state.maze_skill_3_cooldown
+
+
+def runner_action(state: GameState, decision: Tuple[Tuple[int, int], str, bool],
+                  rng: random.Random = random, fallbacks: Optional[List[tuple]] = None) -> tuple:
+    """Legal action for a MazeRunnerAI decision, falling back to a plain step if it is not legal.
+
+    A decision that had to be replaced is appended to fallbacks, if given.
+    """
+    pos, skill, use_skill = decision
+    if use_skill:
+        kind = {"skill_1": EXTENDED_MOVE, "skill_2": TELEPORT, "skill_3": BREAK_WALL}.get(skill, MOVE)
+    else:
+        kind = MOVE
+    action = (kind, pos)
+    if _is_legal(state, action):
+        return action
+    if fallbacks is not None:
+        fallbacks.append(decision)
+    # A plain step in the direction the AI wanted to go, else anything legal
+    moves = state.move_targets()
+    if moves:
+        return (MOVE, min(moves, key=lambda step: abs(step[0] - pos[0]) + abs(step[1] - pos[1])))
+    return rng.choice(state.runner_actions())
+
+
+def master_action(state: GameState, decision: Tuple[Tuple[int, int], bool, str],
+                  rng: random.Random = random, fallbacks: Optional[List[tuple]] = None) -> tuple:
+    """Legal action for a MazeMasterAI decision, falling back to the legal wall nearest the runner.
+
+    A decision that had to be replaced is appended to fallbacks, if given.
+    """
+    pos, is_horizontal, skill = decision
+    if state.maze_skill1_active or skill == "skill_1":
+        action = (DOUBLE_WALL, pos, is_horizontal)
+    elif skill == "skill_2":
+        action = (DIAGONAL_WALL, pos, DIAGONAL_ULDR)
+    elif skill == "skill_3":
+        targets = state.runner_teleport_targets()
+        action = (TELEPORT_RUNNER, rng.choice(targets)) if targets else (PLACE_WALL, pos, is_horizontal)
+    else:
+        action = (PLACE_WALL, pos, is_horizontal)
+    if _is_legal(state, action):
+        return action
+    if fallbacks is not None:
+        fallbacks.append(decision)
+    walls = [a for a in state.master_actions() if a[0] == action[0] or a[0] == PLACE_WALL]
+    if not walls:
+        return rng.choice(state.master_actions())
+    # Near the runner a wall still hems it in; a random one would just be noise
+    px, py = state.player_pos
+    return min(walls, key=lambda wall: abs(wall[1][0] - px) + abs(wall[1][1] - py))
+
+
+def _is_legal(state: GameState, action: tuple) -> bool:
+    try:
+        state.clone().apply(action)
+    except ValueError:
+        return False
+    return True
@@ -0,0 +1,181 @@
+# A3 Game with AI
+
+# Members:
+# Banuag, Carl
+# Deen, Marfred
+# Ferolino, Jilliane
+# Rodriguez, Andrea
+# Rulete, Jeric
+# Torres, John Angelo
+
+"""Jump Point Search on the 4-connected maze grid.
+
+Plain A* pushes every open cell it reaches; JPS only stops at jump points,
+cells where an optimal path may have to turn. Ties between equally short
+paths are broken by turning from vertical to horizontal freely and from
+horizontal to vertical only when forced:
+
+- A cell reached horizontally keeps going; it may also turn up or down,
+  but only where the tile beside the previous cell on that side is a wall
+  (otherwise the turn could have been taken one cell earlier).
+- A cell reached vertically keeps going and may turn left or right at every
+  step, so a vertical jump stops wherever a horizontal scan from it finds
+  the goal or a forced turn.
+
+Horizontal scans run on the grid's open-flag bytes with bytes.find, so a
+run of open cells costs one C-level search instead of a Python loop, and
+the open/closed sets are flat arrays indexed by cell. On open 512x512
+boards this expands a few hundred jump points where A* expands most of
+the grid.
+"""
+
+import heapq
+from array import array
+from typing import List, Optional, Tuple
+
+from bitboard import BitboardGrid
+
+_WALL = b"\x00"
+_WALL_THEN_OPEN = b"\x00\x01"  # Moving right: a turn is forced just past a wall in the side row
+_OPEN_THEN_WALL = b"\x01\x00"  # Moving left: a turn is forced just before a wall in the side row
+
+
+def _jump_horizontal(flags: bytes, size: int, index: int, dx: int, goal: int) -> int:
+    """Next jump point scanning from index by dx along its row, or -1 if the scan dead-ends"""
+    row_start = index - index % size
+    row_end = row_start + size
+    cells = len(flags)
+    if dx > 0:
+        wall = flags.find(_WALL, index + 1, row_end)
+        stop = row_end if wall < 0 else wall  # First cell past the open run
+        best = stop
+        if row_start <= goal < stop and goal > index:
+            best = goal
+        if row_start > 0:
+            p = flags.find(_WALL_THEN_OPEN, index - size, stop - size)
+            if p >= 0 and p + 1 + size < best:
+                best = p + 1 + size
+        if row_end < cells:
+            p = flags.find(_WALL_THEN_OPEN, index + size, stop + size)
+            if p >= 0 and p + 1 - size < best:
+                best = p + 1 - size
+        return -1 if best == stop else best
+    wall = flags.rfind(_WALL, row_start, index)
+    stop = row_start - 1 if wall < 0 else wall  # First cell past the open run
+    best = stop
+    if stop < goal < index:
+        best = goal
+    if row_start > 0:
+        p = flags.rfind(_OPEN_THEN_WALL, stop + 1 - size, index - size + 1)
+        if p >= 0 and p + size > best:
+            best = p + size
+    if row_end < cells:
+        p = flags.rfind(_OPEN_THEN_WALL, stop + 1 + size, index + size + 1)
+        if p >= 0 and p - size > best:
+            best = p - size
+    return -1 if best == stop else best
+
+
+def _jump_vertical(flags: bytes, size: int, index: int, dy: int, goal: int) -> int:
+    """Next jump point stepping from index by dy rows, or -1 if the column dead-ends"""
+    step = dy * size
+    cells = len(flags)
+    index += step
+    while 0 <= index < cells and flags[index]:
+        if index == goal:
+            return index
+        if (_jump_horizontal(flags, size, index, 1, goal) >= 0
+                or _jump_horizontal(flags, size, index, -1, goal) >= 0):
+            return index
+        index += step
+    return -1
+
+
+def jump_point_search(grid: BitboardGrid, start: Tuple[int, int], goal: Tuple[int, int],
+                      stats=None) -> Optional[List[Tuple[int, int]]]:
+    """Shortest path from start to goal as a list of every tile on it, or None if unreachable.
+
+    stats, if given, is a SearchStats whose node count grows by the jump
+    points expanded.
+    """
+    if not (grid.is_open(start) and grid.is_open(goal)):
+        return None
+    size = grid.size
+    flags = grid.open_flags()
+    start_index = grid.index(start)
+    goal_index = grid.index(goal)
+    gx, gy = goal
+
+    g = array("i", [-1]) * len(flags)  # Best known cost; -1 = not yet reached
+    parent = array("i", [-1]) * len(flags)
+    closed = bytearray(len(flags))
+    direction = bytearray(len(flags))  # How the jump point was entered: 0 start, 1 horizontal, 2 vertical
+    g[start_index] = 0
+    frontier = [(abs(start[0] - gx) + abs(start[1] - gy), start_index)]
+    expanded = 0
+
+    while frontier:
+        _, index = heapq.heappop(frontier)
+        if closed[index]:
+            continue
+        closed[index] = 1
+        expanded += 1
+        if index == goal_index:
+            break
+
+        x, y = index % size, index // size
+        came = direction[index]
+        if came == 0:
+            moves = ((1, 0), (-1, 0), (0, 1), (0, -1))
+        elif came == 1:
+            # Reached horizontally: keep going, turn only where the previous column is walled on that side
+            from_index = parent[index]
+            dx = 1 if index > from_index else -1
+            moves = [(dx, 0)]
+            behind = index - dx
+            if y > 0 and flags[index - size] and not flags[behind - size]:
+                moves.append((0, -1))
+            if y < size - 1 and flags[index + size] and not flags[behind + size]:
+                moves.append((0, 1))
+        else:
+            # Reached vertically: keep going or turn either way
+            from_index = parent[index]
+            dy = 1 if index > from_index else -1
+            moves = ((0, dy), (1, 0), (-1, 0))
+
+        cost = g[index]
+        for dx, dy in moves:
+            if dy == 0:
+                nxt = _jump_horizontal(flags, size, index, dx, goal_index)
+                entered = 1
+            else:
+                nxt = _jump_vertical(flags, size, index, dy, goal_index)
+                entered = 2
+            if nxt < 0 or closed[nxt]:
+                continue
+            nx, ny = nxt % size, nxt // size
+            new_cost = cost + abs(nx - x) + abs(ny - y)
+            if g[nxt] < 0 or new_cost < g[nxt]:
+                g[nxt] = new_cost
+                parent[nxt] = index
+                direction[nxt] = entered
+                heapq.heappush(frontier, (new_cost + abs(nx - gx) + abs(ny - gy), nxt))
+
+    if stats is not None:
+        stats.nodes += expanded
+    if not closed[goal_index]:
+        return None
+
+    # Jump points are joined by straight segments; fill in the tiles between them
+    points = []
+    index = goal_index
+    while index >= 0:
+        points.append(index)
+        index = parent[index]
+    points.reverse()
+    path = [start]
+    for a, b in zip(points, points[1:]):
+        step = (1 if b > a else -1) * (1 if a // size == b // size else size)
+        for cell in range(a + step, b + step, step):
+            path.append((cell % size, cell // size))
+    return path
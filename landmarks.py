@@ -0,0 +1,95 @@
+# A3 Game with AI
+
+# Members:
+# Banuag, Carl
+# Deen, Marfred
+# Ferolino, Jilliane
+# Rodriguez, Andrea
+# Rulete, Jeric
+# Torres, John Angelo
+
+"""ALT (A*, landmarks, triangle inequality) heuristic for grid searches.
+
+A few landmark cells keep BFS distance fields. For any landmark L the
+triangle inequality gives |d(L, goal) - d(L, v)| <= d(v, goal), and the
+largest of these bounds (never below manhattan distance) steers A* around
+walls that manhattan distance cannot see.
+
+The tables are refreshed lazily. Adding walls only lengthens distances, so
+tables built on an older board with fewer walls still give lower bounds
+and stay admissible; they are rebuilt once walls have been broken since,
+or once enough new walls have piled up that the bounds are getting loose.
+"""
+
+from typing import Callable, List, Tuple
+
+from bitboard import BitboardGrid
+from distance_field import UNREACHED, DistanceField
+
+
+class LandmarkHeuristic:
+    """Distance fields from landmark cells near the grid corners, kept across searches"""
+
+    def __init__(self, size: int, refresh_after: int = 16):
+        self.size = size
+        self.refresh_after = refresh_after  # New wall tiles tolerated before the tables are rebuilt
+        self.fields: List[DistanceField] = []
+        self.walls = 0  # Wall bitboard the fields were built on
+        self.builds = 0
+
+    def landmark_cells(self, grid: BitboardGrid) -> List[Tuple[int, int]]:
+        """The open cell nearest each corner (by manhattan distance), without duplicates"""
+        size = self.size
+        cells = []
+        for cx, cy in ((0, 0), (size - 1, 0), (0, size - 1), (size - 1, size - 1)):
+            sx = 1 if cx == 0 else -1
+            sy = 1 if cy == 0 else -1
+            found = None
+            for ring in range(2 * size - 1):
+                for i in range(ring + 1):
+                    pos = (cx + sx * i, cy + sy * (ring - i))
+                    if grid.in_bounds(pos) and grid.is_open(pos):
+                        found = pos
+                        break
+                if found is not None:
+                    break
+            if found is not None and found not in cells:
+                cells.append(found)
+        return cells
+
+    def is_stale(self, grid: BitboardGrid) -> bool:
+        """Whether the tables must be rebuilt before they can bound distances on grid"""
+        if not self.fields:
+            return True
+        if self.walls & ~grid.walls:
+            return True  # A broken wall may have shortened paths the tables do not know about
+        return (grid.walls & ~self.walls).bit_count() > self.refresh_after
+
+    def refresh(self, grid: BitboardGrid):
+        """Rebuild the tables now if they are stale"""
+        if self.is_stale(grid):
+            self.fields = [DistanceField(grid, cell) for cell in self.landmark_cells(grid)]
+            self.walls = grid.walls
+            self.builds += 1
+
+    def heuristic(self, grid: BitboardGrid, goal: Tuple[int, int]) -> Callable[[Tuple[int, int]], int]:
+        """Admissible distance-to-goal estimate for positions on grid"""
+        self.refresh(grid)
+        size = self.size
+        goal_x, goal_y = goal
+        goal_index = goal_y * size + goal_x
+        tables = [(field.dist, field.dist[goal_index]) for field in self.fields
+                  if field.dist[goal_index] != UNREACHED]
+
+        def estimate(pos: Tuple[int, int]) -> int:
+            x, y = pos
+            best = abs(x - goal_x) + abs(y - goal_y)
+            index = y * size + x
+            for dist, to_goal in tables:
+                d = dist[index]
+                if d != UNREACHED:
+                    bound = to_goal - d if to_goal > d else d - to_goal
+                    if bound > best:
+                        best = bound
+            return best
+        return estimate
@@ -0,0 +1,372 @@
+# A3 Game with AI
+
+# Members:
+# Banuag, Carl
+# Deen, Marfred
+# Ferolino, Jilliane
+# Rodriguez, Andrea
+# Rulete, Jeric
+# Torres, John Angelo
+
+"""Monte Carlo Tree Search for MazeMasterAI.
+
+The tree holds Maze Master decisions only. Between two of them the runner
+is assumed to walk greedily down the goal distances for a full turn, so
+every edge is one Maze Master move plus that deterministic reply, and the
+same UCT rule picks children at every level. Children are opened in order
+of strength (at the root the Maze Master's own ranked moves, deeper down
+the walls across the runner's path that lengthen it most) and a node may
+only open 1 + sqrt(visits) of them, so the search widens its best-ranked
+branches first.
+
+Iterations replay their moves on a bare wall bitboard instead of a
+SearchBoard, and each new leaf is scored by a playout on bitboards: the
+Maze Master drops random walls across the runner's path just ahead of it,
+the runner keeps walking greedily, and after a few rounds the result is
+the delay - the steps the runner lost to walls since the root.
+
+The runner's own skills are left out of the model, like in minimax.
+"""
+
+import math
+import random
+import time
+from typing import Dict, List, Optional
+
+from batch_eval import batch_path_lengths
+from bitboard import DIAGONAL_ULDR, HORIZONTAL, SHAPE_OFFSETS, VERTICAL, BitboardGrid, shape_of
+from distance_field import DistanceField
+from game_state import RUNNER_MOVES_PER_TURN, WIN_COVERAGE, protected_mask
+from search_board import SearchBoard
+
+# UCT exploration constant (rewards lie in [0, 1])
+EXPLORATION = 0.7
+# A node with n visits may have 1 + WIDENING * sqrt(n) children
+WIDENING = 1.0
+# Ranked wall placements a tree node can ever open
+TREE_CANDIDATE_LIMIT = 16
+# Walls over the runner's path scored for a node below the root
+PATH_WALL_POOL = 48
+# Walls opened before the skills in the root's move order
+WALLS_BEFORE_SKILLS = 2
+# Maze Master turns simulated past a new leaf
+PLAYOUT_ROUNDS = 3
+# Path tiles past the runner's stop this turn that playout walls aim for
+PLAYOUT_LOOKAHEAD = 8
+# Tries at a legal playout wall before the Maze Master passes that round
+PLAYOUT_ATTEMPTS = 8
+# Delay (in runner steps) that scores 0.5
+DELAY_SCALE = 8
+
+
+def goal_layers(grid: BitboardGrid, goal: int, runner: int) -> Optional[List[int]]:
+    """Bitboards of the cells 0, 1, 2, ... steps from goal, out to the runner's layer (None if cut off)"""
+    target = 1 << runner
+    frontier = seen = (1 << goal) & ~grid.walls
+    layers = []
+    while frontier:
+        layers.append(frontier)
+        if frontier & target:
+            return layers
+        frontier = grid.expand(frontier) & ~seen
+        seen |= frontier
+    return None
+
+
+class MCTSNode:
+    """One Maze Master decision point and its running reward total"""
+
+    __slots__ = ("move", "action", "children", "moves", "visits", "total", "terminal")
+
+    def __init__(self, move=None, action=None):
+        self.move = move  # (pos, is_horizontal, skill[, second wall]) decision that led here
+        self.action = action  # Matching master_moves action
+        self.children: List["MCTSNode"] = []
+        self.moves: Optional[List[tuple]] = None  # Moves in opening order, listed on the first visit
+        self.visits = 0
+        self.total = 0.0
+        self.terminal: Optional[float] = None  # Fixed reward once the game is decided here
+
+    def best_child(self) -> Optional["MCTSNode"]:
+        """Most visited child, ties going to the higher mean reward"""
+        if not self.children:
+            return None
+        return max(self.children, key=lambda child: (child.visits, child.total / child.visits))
+
+
+class MonteCarloTreeSearch:
+    """UCT search with progressive widening over a MazeMasterAI's moves"""
+
+    def __init__(self, ai, rng: random.Random = random):
+        self.ai = ai  # Owning MazeMasterAI: supplies the root moves and the stats
+        self.rng = rng
+        self.grid = BitboardGrid(ai.grid_size)  # Walls of the node an iteration has reached
+        self.runner = (0, 0)  # Runner tile at that node
+        self.end_pos = ai.end_pos
+        self.fields: Dict[int, DistanceField] = {}  # Goal distances by wall bitboard, for one search
+        self.root_walls = 0
+        self.root_runner = (0, 0)
+        self.root_distance = 0
+        self.last_root: Optional[MCTSNode] = None
+
+    def search(self, board: SearchBoard, time_budget: Optional[float] = None,
+               playouts: Optional[int] = None, stop_event=None) -> Optional[tuple]:
+        """Most visited root move after the budget is spent, or None if there is none.
+
+        Moves are master_moves moves, so a Double Walls pair has its second
+        wall as a fourth item.
+
+        Stops at whichever comes first of time_budget seconds, playouts
+        iterations and stop_event being set; with neither budget given it
+        runs the AI's mcts_playouts iterations. The board is only read.
+        """
+        ai = self.ai
+        deadline = time.perf_counter() + time_budget if time_budget is not None else None
+        if playouts is None and deadline is None:
+            playouts = ai.mcts_playouts
+        root = self.last_root = MCTSNode()
+        distance = board.goal_distance()
+        if distance is None or board.player_pos == board.end_pos:
+            return None
+        self.end_pos = board.end_pos
+        self.root_walls = board.grid.walls
+        self.root_runner = board.player_pos
+        self.root_distance = distance
+        self.fields = {}
+        ai.stats.nodes += 1
+        root.moves = self.root_moves(board)
+        iterations = 0
+        while root.moves and (playouts is None or iterations < playouts):
+            if deadline is not None and time.perf_counter() > deadline:
+                break
+            if stop_event is not None and stop_event.is_set():
+                break
+            self.iterate(root)
+            iterations += 1
+        self.fields = {}
+        best = root.best_child()
+        return best.move if best is not None else None
+
+    def principal_line(self) -> List[tuple]:
+        """Most visited line from the last search's root"""
+        line = []
+        node = self.last_root.best_child() if self.last_root is not None else None
+        while node is not None:
+            line.append(node.move)
+            node = node.best_child()
+        return line
+
+    # --- One iteration ---------------------------------------------------
+
+    def iterate(self, root: MCTSNode):
+        """Select from the root, open one child, play out from it and back the reward up"""
+        stats = self.ai.stats
+        self.grid.walls = self.root_walls
+        self.runner = self.root_runner
+        node = root
+        path = [root]
+        walked = 0
+        while True:
+            if node.terminal is not None:
+                reward = node.terminal
+                break
+            if node.moves is None:
+                node.moves = self.path_walls()
+            opened = len(node.children)
+            allowed = 1 + int(WIDENING * math.sqrt(node.visits))
+            if opened < len(node.moves) and opened < allowed:
+                # Open the next move in order and score it with a playout
+                move, action = node.moves[opened]
+                child = MCTSNode(move, action)
+                node.children.append(child)
+                path.append(child)
+                stats.nodes += 1
+                steps = self.advance(child)
+                if steps is None:
+                    child.terminal = 1.0
+                elif self.runner == self.end_pos:
+                    child.terminal = self.reward(walked + steps)
+                if child.terminal is not None:
+                    reward = child.terminal
+                else:
+                    stats.leaves += 1
+                    rest = self.playout()
+                    reward = 1.0 if rest is None else self.reward(walked + steps + rest)
+                break
+            if not node.children:
+                # No wall fits here: score the position as it stands
+                stats.leaves += 1
+                rest = self.playout()
+                reward = 1.0 if rest is None else self.reward(walked + rest)
+                break
+            node = self.select(node)
+            path.append(node)
+            if node.terminal is None:
+                walked += self.advance(node)
+
+        if len(path) - 1 > stats.max_depth:
+            stats.max_depth = len(path) - 1
+        for visited in path:
+            visited.visits += 1
+            visited.total += reward
+
+    def select(self, node: MCTSNode) -> MCTSNode:
+        """Child with the highest upper confidence bound"""
+        log_visits = math.log(node.visits)
+        best, best_bound = None, -1.0
+        for child in node.children:
+            bound = child.total / child.visits + EXPLORATION * math.sqrt(log_visits / child.visits)
+            if bound > best_bound:
+                best, best_bound = child, bound
+        return best
+
+    def root_moves(self, board: SearchBoard) -> List[tuple]:
+        """The AI's own moves at the root, with the skills moved behind its strongest walls"""
+        moves = self.ai.master_moves(board, None, 0, TREE_CANDIDATE_LIMIT)
+        walls = [entry for entry in moves if entry[1][0] == "wall"]
+        skills = [entry for entry in moves if entry[1][0] != "wall"]
+        return walls[:WALLS_BEFORE_SKILLS] + skills + walls[WALLS_BEFORE_SKILLS:]
+
+    def path_walls(self) -> List[tuple]:
+        """Legal walls over the runner's next path tiles at the current node, longest resulting path first.
+
+        Below the root this replaces the full candidate ranking: all the
+        placements are measured in one batched search.
+        """
+        path = self.goal_field().path_from(self.runner)
+        if not path:
+            return []
+        grid = self.grid
+        blocked = grid.bit(self.runner) | grid.bit(self.end_pos) | protected_mask(grid, self.end_pos)
+        placements = []
+        for x, y in path[1:-1]:
+            for is_horizontal in (True, False):
+                shape = shape_of(is_horizontal)
+                for dx, dy in SHAPE_OFFSETS[shape]:
+                    placement = ((x - dx, y - dy), is_horizontal)
+                    if placement not in placements and grid.can_place(placement[0], shape, blocked):
+                        placements.append(placement)
+            if len(placements) >= PATH_WALL_POOL:
+                break
+        masks = [grid.placement_mask(origin, shape_of(is_horizontal)) for origin, is_horizontal in placements]
+        lengths = batch_path_lengths(grid, self.runner, self.end_pos, masks)
+        # Trapping walls first, then the longest path; ties keep the nearer tiles first
+        order = sorted(range(len(placements)),
+                       key=lambda i: (lengths[i] is not None, -(lengths[i] or 0), i))
+        moves = []
+        for i in order[:TREE_CANDIDATE_LIMIT]:
+            origin, is_horizontal = placements[i]
+            moves.append(((origin, is_horizontal, "none"), ("wall", origin, shape_of(is_horizontal))))
+        return moves
+
+    def goal_field(self) -> DistanceField:
+        """Goal distances for the current node's walls, shared by the nodes with the same walls"""
+        walls = self.grid.walls
+        field = self.fields.get(walls)
+        if field is None:
+            field = self.fields[walls] = DistanceField(self.grid, self.end_pos, "bfs")
+        return field
+
+    def advance(self, node: MCTSNode) -> Optional[int]:
+        """Play a node's move and the runner's greedy reply; runner steps taken, or None if it is trapped.
+
+        Double Walls places both walls of its pair. Swapping the runner's
+        position with skill 3 is not modeled.
+        """
+        pos, _, skill = node.move[:3]
+        action = node.action
+        grid = self.grid
+        if action[0] == "wall":
+            grid.walls |= grid.placement_mask(action[1], action[2])
+        elif action[0] == "pair":
+            grid.walls |= grid.placement_mask(action[1], action[2]) | grid.placement_mask(action[3], action[4])
+        elif skill == "skill_2":
+            if grid.can_place(pos, DIAGONAL_ULDR, grid.bit(self.runner) | grid.bit(self.end_pos)):
+                grid.walls |= grid.placement_mask(pos, DIAGONAL_ULDR)
+        if grid.coverage() >= WIN_COVERAGE:
+            return None
+        field = self.goal_field()
+        distance = field.distance(self.runner)
+        if distance is None:
+            return None
+        steps = min(distance, RUNNER_MOVES_PER_TURN)
+        for _ in range(steps):
+            self.runner = field.next_step(self.runner)
+        return steps
+
+    def reward(self, steps: int) -> float:
+        """Map the runner's total steps to the goal onto [0, 1) by how much walls delayed it"""
+        delay = max(steps - self.root_distance, 0)
+        return delay / (delay + DELAY_SCALE)
+
+    # --- Playouts --------------------------------------------------------
+
+    def playout(self) -> Optional[int]:
+        """Runner steps to the goal after a few random Maze Master rounds from the current node.
+
+        Counts the steps walked plus the distance left at the end, or
+        returns None if the Maze Master wins during the playout. The walls
+        of the current node are restored afterwards.
+        """
+        grid = self.grid
+        node_walls = grid.walls
+        neighbors = grid.tables.neighbors
+        goal = grid.index(self.end_pos)
+        runner = grid.index(self.runner)
+        blocked = grid.bit(self.end_pos) | protected_mask(grid, self.end_pos)
+        layers = goal_layers(grid, goal, runner)
+        walked = 0
+        try:
+            for _ in range(PLAYOUT_ROUNDS):
+                if runner == goal:
+                    break
+                mask = self.playout_wall(grid, layers, runner, blocked | (1 << runner))
+                if mask:
+                    grid.walls |= mask
+                    if grid.coverage() >= WIN_COVERAGE:
+                        return None
+                    layers = goal_layers(grid, goal, runner)
+                    if layers is None:
+                        return None
+                # Greedy runner: a full turn of steps into the next layer toward the goal
+                distance = len(layers) - 1
+                for _ in range(min(distance, RUNNER_MOVES_PER_TURN)):
+                    distance -= 1
+                    closer = layers[distance]
+                    for nxt in neighbors[runner]:
+                        if (closer >> nxt) & 1:
+                            runner = nxt
+                            break
+                    walked += 1
+                del layers[distance + 1:]
+            return walked + len(layers) - 1
+        finally:
+            grid.walls = node_walls
+
+    def playout_wall(self, grid: BitboardGrid, layers: List[int], runner: int, blocked: int) -> int:
+        """Mask of a random legal wall across the runner's path just ahead of it, 0 if none was found"""
+        tables = grid.tables
+        neighbors = tables.neighbors
+        ahead = []
+        cell = runner
+        distance = len(layers) - 1
+        while distance > 1 and len(ahead) < RUNNER_MOVES_PER_TURN + PLAYOUT_LOOKAHEAD:
+            distance -= 1
+            closer = layers[distance]
+            for nxt in neighbors[cell]:
+                if (closer >> nxt) & 1:
+                    cell = nxt
+                    break
+            ahead.append(cell)
+        if not ahead:
+            return 0
+        rng = self.rng
+        taken = grid.walls | blocked
+        for _ in range(PLAYOUT_ATTEMPTS):
+            shape = HORIZONTAL if rng.random() < 0.5 else VERTICAL
+            origin = rng.choice(ahead) - rng.choice(tables.offsets[shape])
+            if origin >= 0 and (tables.origins[shape] >> origin) & 1:
+                mask = tables.patterns[shape] << origin
+                if not mask & taken:
+                    return mask
+        return 0
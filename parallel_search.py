@@ -0,0 +1,213 @@
+# A3 Game with AI
+
+# Members:
+# Banuag, Carl
+# Deen, Marfred
+# Ferolino, Jilliane
+# Rodriguez, Andrea
+# Rulete, Jeric
+# Torres, John Angelo
+
+"""Root-parallel minimax for MazeMasterAI over a process pool.
+
+The root's skills and wall placements are searched by separate worker
+processes. The first root move is searched alone so its value can serve as
+alpha for the rest; after that every finished move raises a shared alpha
+that workers pick up when they start their next move. The best move is the
+highest value, ties going to the earliest move in root order, so the choice
+does not depend on which worker finished first.
+
+Worker processes stay alive between searches and keep a MazeMasterAI each,
+so their transposition tables, evaluation caches and distance fields stay
+warm from one turn to the next.
+"""
+
+import atexit
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeout
+from typing import Dict, Optional, Tuple
+
+from ai_logic import MazeMasterAI, SearchTimeout
+from search_board import SearchBoard
+
+# Workers search with alpha just below the best value found so far, so a move
+# that ties the best still returns its exact value instead of a bound
+ALPHA_MARGIN = 1e-6
+
+# Extra seconds to wait for a worker past the deadline before giving up on it
+RESULT_GRACE = 0.25
+
+# How often a waiting root search checks whether it was cancelled
+STOP_POLL_INTERVAL = 0.02
+
+# Worker process state, set up once by _init_worker
+_worker_ai = None
+_worker_bound = None  # Shared [iteration id, alpha] array
+_worker_search_id = -1
+
+
+class _IterationStop:
+    """Stop flag for a worker task: set once the coordinator abandons its iteration"""
+
+    def __init__(self, iteration: int):
+        self.iteration = iteration
+
+    def is_set(self) -> bool:
+        return _worker_bound[0] != self.iteration
+
+
+def _init_worker(grid_size: int, bound):
+    global _worker_ai, _worker_bound
+    _worker_ai = MazeMasterAI(grid_size)
+    _worker_bound = bound
+
+
+def _search_root_move(snapshot: tuple, action: tuple, iteration: int, depth: int,
+                      alpha: float, time_left: Optional[float]) -> Optional[float]:
+    """Value of one root move at depth, or None if the deadline passed"""
+    global _worker_search_id
+
+    search_id, walls, player_pos, skills, skill_2_used, skill_3_cooldown, candidate_limit = snapshot
+    ai = _worker_ai
+    if search_id != _worker_search_id:
+        # New decision: age the table and move-ordering history once, like decide_move does
+        ai.transpositions.new_search()
+        ai.age_history()
+        _worker_search_id = search_id
+    ai.grid.walls = walls
+    ai.player_pos = player_pos
+    ai.skill_2_used = skill_2_used
+    ai.skill_3_cooldown = skill_3_cooldown
+    ai.candidate_limit = candidate_limit
+    ai.principal_variation = []
+    ai._pv_table = []
+
+    board = SearchBoard(ai.grid, ai.zobrist, player_pos, ai.end_pos, skills,
+                        maximizing=True, field_cache=ai.field_cache, proximity=ai.proximity)
+    ai.apply_master_action(board, action)
+
+    # A trapped-runner (infinite) alpha cannot be lowered by the margin; skip it
+    shared = _worker_bound[1]
+    if _worker_bound[0] == iteration and shared != float('inf'):
+        alpha = max(alpha, shared - ALPHA_MARGIN)
+
+    ai._deadline = time.perf_counter() + time_left if time_left is not None else None
+    ai._stop_event = _IterationStop(iteration)
+    try:
+        value, _ = ai.minimax(depth - 1, alpha, float('inf'), board, 1)
+    except SearchTimeout:
+        return None
+    finally:
+        ai._deadline = None
+        ai._stop_event = None
+        board.unwind()
+
+    with _worker_bound.get_lock():
+        if _worker_bound[0] == iteration and value > _worker_bound[1]:
+            _worker_bound[1] = value
+    return value
+
+
+class RootSearchPool:
+    """Warm worker processes that split MazeMasterAI root searches between them"""
+
+    def __init__(self, grid_size: int, workers: int):
+        self.grid_size = grid_size
+        self.workers = workers
+        self.bound = multiprocessing.Array("d", [0.0, float('-inf')])
+        self.executor = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                            initargs=(grid_size, self.bound))
+        self.search_id = 0
+        self.iteration = 0
+
+    def new_search(self):
+        """Start a new decision (workers age their tables on the next task)"""
+        self.search_id += 1
+
+    def search(self, ai: MazeMasterAI, board: SearchBoard, depth: int, deadline: Optional[float]):
+        """Parallel root search of ai's position at depth.
+
+        Returns (value, move) like minimax at the root and raises SearchTimeout
+        if the deadline passes before every root move is finished.
+        """
+        entry = ai.transpositions.probe(board.key)
+        tt_move = entry[4] if entry is not None else None
+        moves = ai.master_moves(board, tt_move, 0)
+        if not moves:
+            return float('-inf'), None
+
+        snapshot = (self.search_id, board.grid.walls, board.player_pos, tuple(board.skills),
+                    ai.skill_2_used, ai.skill_3_cooldown, ai.candidate_limit)
+        self.iteration += 1
+        with self.bound.get_lock():
+            self.bound[0] = self.iteration
+            self.bound[1] = float('-inf')
+
+        def submit(action, alpha):
+            time_left = None if deadline is None else max(0.0, deadline - time.perf_counter())
+            return self.executor.submit(_search_root_move, snapshot, action, self.iteration,
+                                        depth, alpha, time_left)
+
+        # The first move (TT/PV move first) sets the shared bound the others start from
+        stop_event = ai._stop_event
+        futures = [submit(moves[0][1], float('-inf'))]
+        try:
+            values = [self._result(futures[0], deadline, stop_event)]
+            futures += [submit(action, float('-inf')) for _, action in moves[1:]]
+            for future in futures[1:]:
+                values.append(self._result(future, deadline, stop_event))
+        except BaseException:
+            for future in futures:
+                future.cancel()
+            # Workers still searching this iteration see it abandoned and stop
+            with self.bound.get_lock():
+                self.bound[0] = 0
+            raise
+
+        best = max(range(len(values)), key=lambda i: (values[i], -i))
+        return values[best], moves[best][0]
+
+    @staticmethod
+    def _result(future, deadline: Optional[float], stop_event) -> float:
+        """Wait for a worker, giving up at the deadline or as soon as the search is cancelled"""
+        give_up = None if deadline is None else deadline + RESULT_GRACE
+        while True:
+            if stop_event is not None and stop_event.is_set():
+                raise SearchTimeout()
+            timeout = STOP_POLL_INTERVAL
+            if give_up is not None:
+                timeout = min(timeout, give_up - time.perf_counter())
+                if timeout <= 0:
+                    raise SearchTimeout()
+            try:
+                value = future.result(timeout=timeout)
+                break
+            except FutureTimeout:
+                continue
+        if value is None:
+            raise SearchTimeout()
+        return value
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+
+_POOLS: Dict[Tuple[int, int], RootSearchPool] = {}
+
+
+def pool_for(grid_size: int, workers: int) -> RootSearchPool:
+    """Get (and start on first use) the shared worker pool for a grid size and worker count"""
+    pool = _POOLS.get((grid_size, workers))
+    if pool is None:
+        if not _POOLS:
+            atexit.register(shutdown_pools)
+        pool = _POOLS[(grid_size, workers)] = RootSearchPool(grid_size, workers)
+    return pool
+
+
+def shutdown_pools():
+    """Stop every worker pool (e.g. when the game exits)"""
+    for pool in _POOLS.values():
+        pool.shutdown()
+    _POOLS.clear()
@@ -0,0 +1,156 @@
+# A3 Game with AI
+
+# Members:
+# Banuag, Carl
+# Deen, Marfred
+# Ferolino, Jilliane
+# Rodriguez, Andrea
+# Rulete, Jeric
+# Torres, John Angelo
+
+"""Mutable search position with make/unmake moves for MazeMasterAI.
+
+Instead of copying the wall set for every child, minimax applies a move to
+one SearchBoard, recurses, and reverts it from the undo stack. The Zobrist
+hashes, the cached goal distance field and the wall proximity field are
+updated with every apply and restored on every revert, so a search
+allocates the same small records no matter how full the board is.
+"""
+
+from typing import Dict, List, Optional, Tuple
+
+from bitboard import BitboardGrid
+from distance_field import DistanceField, WallProximityField
+from transposition import ZobristKeys
+
+# Undo record kinds
+PLACE_WALL = 0
+USE_SKILL = 1
+MOVE_RUNNER = 2
+
+
+class SearchBoard:
+    """Walls, runner position, skill flags and side to move for one search"""
+
+    __slots__ = ("grid", "zobrist", "end_pos", "player_pos", "skills", "maximizing",
+                 "key", "wall_hash", "goal_field", "field_cache", "field_cache_limit", "proximity",
+                 "_undo")
+
+    def __init__(self, grid: BitboardGrid, zobrist: ZobristKeys,
+                 player_pos: Tuple[int, int], end_pos: Tuple[int, int],
+                 skills: Tuple[bool, bool, bool], maximizing: bool = True,
+                 field_cache: Optional[Dict[int, DistanceField]] = None,
+                 field_cache_limit: int = 4096,
+                 proximity: Optional[WallProximityField] = None):
+        self.grid = grid.copy()
+        self.zobrist = zobrist
+        self.end_pos = end_pos
+        self.player_pos = player_pos
+        self.skills = list(skills)
+        self.maximizing = maximizing
+        self.wall_hash = zobrist.wall_key(self.grid.tiles_of(self.grid.walls))
+        self.key = (self.wall_hash ^ zobrist.player_key(player_pos)
+                    ^ zobrist.skill_key(*self.skills)
+                    ^ (zobrist.maximizing if maximizing else 0))
+        # Goal-rooted fields keyed by wall hash; shared across searches by the owner
+        self.field_cache = field_cache if field_cache is not None else {}
+        self.field_cache_limit = field_cache_limit
+        self.goal_field: Optional[DistanceField] = None
+        # Nearest-wall distances; an owner's field is patched in place and restored by undo
+        if proximity is None:
+            proximity = WallProximityField(self.grid)
+        else:
+            proximity.sync(self.grid)
+        self.proximity = proximity
+        self._undo: List[tuple] = []
+
+    @property
+    def position_key(self) -> int:
+        """Hash of the walls and runner tile only (no skills or side to move)"""
+        return self.wall_hash ^ self.zobrist.player_key(self.player_pos)
+
+    @property
+    def ply(self) -> int:
+        """Number of moves currently applied on top of the root position"""
+        return len(self._undo)
+
+    # --- Make / unmake -----------------------------------------------------
+
+    def place_wall(self, origin: Tuple[int, int], shape: str):
+        """Add a 3-tile wall and pass the turn"""
+        grid = self.grid
+        tables = grid.tables
+        index = origin[1] * grid.size + origin[0]
+        wall_key = 0
+        for offset in tables.offsets[shape]:
+            wall_key ^= self.zobrist.wall[index + offset]
+        mask = tables.patterns[shape] << index
+        changes = self.proximity.add_walls(mask, record=True)
+        self._undo.append((PLACE_WALL, (mask, wall_key, changes), self.key, self.goal_field))
+        grid.walls |= mask
+        self.wall_hash ^= wall_key
+        self.key ^= wall_key ^ self.zobrist.maximizing
+        self.maximizing = not self.maximizing
+        self.goal_field = None
+
+    def use_skill(self, skill: int):
+        """Spend one of the three Maze Master skills (0-based) and pass the turn"""
+        self._undo.append((USE_SKILL, skill, self.key, self.goal_field))
+        self.skills[skill] = False
+        self.key ^= self.zobrist.skills[skill] ^ self.zobrist.maximizing
+        self.maximizing = not self.maximizing
+
+    def move_runner(self, pos: Tuple[int, int]):
+        """Move the runner to pos and pass the turn"""
+        self._undo.append((MOVE_RUNNER, self.player_pos, self.key, self.goal_field))
+        zobrist = self.zobrist
+        self.key ^= zobrist.player_key(self.player_pos) ^ zobrist.player_key(pos) ^ zobrist.maximizing
+        self.player_pos = pos
+        self.maximizing = not self.maximizing
+
+    def undo(self):
+        """Revert the most recent move"""
+        kind, payload, key, goal_field = self._undo.pop()
+        if kind == PLACE_WALL:
+            mask, wall_key, changes = payload
+            self.grid.walls &= ~mask
+            self.wall_hash ^= wall_key
+            self.proximity.restore(self.grid.walls, changes)
+        elif kind == USE_SKILL:
+            self.skills[payload] = True
+        else:
+            self.player_pos = payload
+        self.key = key
+        self.goal_field = goal_field
+        self.maximizing = not self.maximizing
+
+    def unwind(self):
+        """Revert every applied move, back to the root position"""
+        while self._undo:
+            self.undo()
+
+    # --- Distance queries --------------------------------------------------
+
+    def get_goal_field(self) -> DistanceField:
+        """Goal-rooted distance field for the current walls (cached by wall hash)"""
+        field = self.goal_field
+        if field is None:
+            field = self.field_cache.get(self.wall_hash)
+            if field is None:
+                if len(self.field_cache) >= self.field_cache_limit:
+                    self.field_cache.clear()
+                field = self.field_cache[self.wall_hash] = DistanceField(self.grid, self.end_pos, "bfs")
+            self.goal_field = field
+        return field
+
+    def goal_distance(self, pos: Optional[Tuple[int, int]] = None) -> Optional[int]:
+        """Steps from pos (default: the runner) to the goal, or None if cut off"""
+        return self.get_goal_field().distance(self.player_pos if pos is None else pos)
+
+    def wall_distance(self) -> Optional[int]:
+        """Manhattan distance from the runner to the nearest wall, or None if there are no walls"""
+        return self.proximity.distance(self.player_pos)
+
+    def shortest_path(self) -> Optional[List[Tuple[int, int]]]:
+        """Runner's shortest path to the goal through the current walls"""
+        return self.get_goal_field().path_from(self.player_pos)
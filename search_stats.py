@@ -0,0 +1,79 @@
+# A3 Game with AI
+
+# Members:
+# Banuag, Carl
+# Deen, Marfred
+# Ferolino, Jilliane
+# Rodriguez, Andrea
+# Rulete, Jeric
+# Torres, John Angelo
+
+"""Per-decision search statistics for MazeRunnerAI and MazeMasterAI.
+
+Each decide_move fills a fresh SearchStats, keeps it as the AI's
+last_stats and hands it to the AI's stats_callback if one is set. BFS
+counts cover distance fields and bitboard floods run in this process, so
+searches farmed out to worker processes are not included.
+"""
+
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator
+
+from bitboard import BitboardGrid
+from distance_field import DistanceField
+
+
+def bfs_count() -> int:
+    """Distance fields built plus bitboard flood searches run so far in this process"""
+    return DistanceField.builds + BitboardGrid.floods
+
+
+class SearchStats:
+    """Counters and phase timings of one AI decision"""
+
+    __slots__ = ("nodes", "leaves", "cutoffs", "cache_hits", "cache_misses", "tt_hits", "tt_probes",
+                 "bfs_calls", "astar_calls", "max_depth", "completed_depth", "phase_seconds",
+                 "total_seconds", "error", "_started", "_bfs_start")
+
+    def __init__(self):
+        self.nodes = 0  # Minimax nodes (Maze Master) or path-search expansions (runner)
+        self.leaves = 0  # Leaf evaluations computed (not served from the cache)
+        self.cutoffs = 0  # Alpha-beta and transposition-table cutoffs
+        self.cache_hits = 0  # Evaluation, candidate, distance-field and runner path cache hits
+        self.cache_misses = 0
+        self.tt_hits = 0  # Transposition-table probes that found an entry
+        self.tt_probes = 0
+        self.bfs_calls = 0
+        self.astar_calls = 0  # Runner path searches (A*, Jump Point Search or D* Lite)
+        self.max_depth = 0  # Deepest ply the search reached
+        self.completed_depth = 0  # Deepest fully finished iterative-deepening iteration
+        self.phase_seconds: Dict[str, float] = {}
+        self.total_seconds = 0.0
+        self.error = None  # Message of an exception the decision recovered from
+        self._started = time.perf_counter()
+        self._bfs_start = bfs_count()
+
+    def add_time(self, phase: str, seconds: float):
+        self.phase_seconds[phase] = self.phase_seconds.get(phase, 0.0) + seconds
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Time the enclosed block into phase_seconds[name]"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_time(name, time.perf_counter() - started)
+
+    def finish(self) -> "SearchStats":
+        """Stop the clock and take the BFS count for the decision"""
+        self.total_seconds = time.perf_counter() - self._started
+        self.bfs_calls = bfs_count() - self._bfs_start
+        return self
+
+    def as_dict(self) -> Dict[str, object]:
+        return {name: getattr(self, name) for name in SearchStats.__slots__ if not name.startswith("_")}
+
+    def __repr__(self) -> str:
+        return f"SearchStats({self.as_dict()})"
@@ -0,0 +1,190 @@
+# A3 Game with AI
+
+# Members:
+# Banuag, Carl
+# Deen, Marfred
+# Ferolino, Jilliane
+# Rodriguez, Andrea
+# Rulete, Jeric
+# Torres, John Angelo
+
+"""Headless MazeRunnerAI vs MazeMasterAI self-play tournament.
+
+Plays games on GameState across a process pool, streams one JSON line per
+finished game and prints win rates and decision latency percentiles. Run it
+before and after an AI change to check that playing strength did not move:
+
+    python tournament.py --games 40 --depth 3 --time 0.2 --out results.jsonl
+"""
+
+import argparse
+import json
+import math
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, Iterator, List, Optional, Sequence
+
+from ai_logic import MASTER_STRATEGIES, RUNNER_PLANNERS, MazeMasterAI, MazeRunnerAI
+from game_state import GameState, master_action, runner_action, sync_master_ai, sync_runner_ai
+
+DRAW = "draw"  # Winner recorded when a game hits the ply limit
+
+
+def play_game(game: int, seed: int, grid_size: int, depth: int, time_budget: Optional[float],
+              max_plies: int, runner_planner: str = "astar", master_strategy: str = "minimax") -> Dict[str, object]:
+    """Play one AI-vs-AI game and return its result record"""
+    # The AIs break ties with the global random module; seed it so games replay
+    random.seed(seed)
+    rng = random.Random(seed)
+    state = GameState(grid_size)
+    runner = MazeRunnerAI(grid_size, runner_planner)
+    master = MazeMasterAI(grid_size, strategy=master_strategy)
+    master.max_depth = depth
+    runner_ms: List[float] = []
+    master_ms: List[float] = []
+    runner_fallbacks: List[tuple] = []  # Decisions the rules rejected and replaced
+    master_fallbacks: List[tuple] = []
+    plies = rounds = runner_nodes = master_nodes = 0
+
+    while not state.game_over and plies < max_plies:
+        if state.runner_to_move:
+            started = time.perf_counter()
+            sync_runner_ai(runner, state)
+            action = runner_action(state, runner.decide_move(), rng, runner_fallbacks)
+            runner_ms.append((time.perf_counter() - started) * 1000)
+            runner_nodes += runner.last_stats.nodes
+        else:
+            started = time.perf_counter()
+            sync_master_ai(master, state)
+            action = master_action(state, master.decide_move(state.walls_placed, time_budget), rng,
+                                   master_fallbacks)
+            master_ms.append((time.perf_counter() - started) * 1000)
+            master_nodes += master.last_stats.nodes
+        was_runner_turn = state.runner_to_move
+        state.apply(action)
+        plies += 1
+        if not was_runner_turn and state.runner_to_move:
+            rounds += 1
+
+    return {
+        "game": game,
+        "seed": seed,
+        "winner": state.winner or DRAW,
+        "plies": plies,
+        "rounds": rounds,
+        "coverage": round(state.coverage(), 4),
+        "runner_ms": [round(ms, 3) for ms in runner_ms],
+        "master_ms": [round(ms, 3) for ms in master_ms],
+        "runner_nodes": runner_nodes,
+        "master_nodes": master_nodes,
+        "runner_fallbacks": len(runner_fallbacks),
+        "master_fallbacks": len(master_fallbacks),
+    }
+
+
+def _play_game_args(args: tuple) -> Dict[str, object]:
+    return play_game(*args)
+
+
+def run_tournament(games: int, seed: int, grid_size: int, depth: int, time_budget: Optional[float],
+                   max_plies: int, processes: int, runner_planner: str = "astar",
+                   master_strategy: str = "minimax") -> Iterator[Dict[str, object]]:
+    """Yield game results as they finish; processes <= 1 plays them in this process"""
+    jobs = [(game, seed + game, grid_size, depth, time_budget, max_plies, runner_planner, master_strategy)
+            for game in range(games)]
+    if processes <= 1:
+        yield from map(_play_game_args, jobs)
+        return
+    with ProcessPoolExecutor(max_workers=processes) as executor:
+        futures = [executor.submit(play_game, *job) for job in jobs]
+        for future in as_completed(futures):
+            yield future.result()
+
+
+def percentile(values: Sequence[float], fraction: float) -> float:
+    """Nearest-rank percentile of values (0.0 for an empty list)"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = min(len(ordered), max(1, math.ceil(fraction * len(ordered))))
+    return ordered[rank - 1]
+
+
+def summarize(results: Sequence[Dict[str, object]]) -> Dict[str, object]:
+    """Win rates, latency percentiles and node rates over a set of game results"""
+    total = len(results)
+    wins: Dict[str, int] = {}
+    for result in results:
+        wins[result["winner"]] = wins.get(result["winner"], 0) + 1
+    summary: Dict[str, object] = {
+        "games": total,
+        "win_rate": {winner: count / total for winner, count in sorted(wins.items())} if total else {},
+        "mean_plies": sum(r["plies"] for r in results) / total if total else 0.0,
+        "mean_coverage": sum(r["coverage"] for r in results) / total if total else 0.0,
+    }
+    for side in ("runner", "master"):
+        latencies = [ms for r in results for ms in r[f"{side}_ms"]]
+        nodes = sum(r[f"{side}_nodes"] for r in results)
+        summary[side] = {
+            "decisions": len(latencies),
+            "p50_ms": percentile(latencies, 0.5),
+            "p90_ms": percentile(latencies, 0.9),
+            "p99_ms": percentile(latencies, 0.99),
+            "max_ms": max(latencies, default=0.0),
+            "nodes_per_decision": nodes / len(latencies) if latencies else 0.0,
+            "fallbacks": sum(r[f"{side}_fallbacks"] for r in results),
+        }
+    return summary
+
+
+def print_summary(summary: Dict[str, object]):
+    print(f"Games: {summary['games']}  mean plies: {summary['mean_plies']:.1f}  "
+          f"mean coverage: {summary['mean_coverage']:.1%}")
+    for winner, rate in summary["win_rate"].items():
+        print(f"  {winner:>6} wins {rate:6.1%}")
+    for side in ("runner", "master"):
+        stats = summary[side]
+        print(f"  {side:>6} decisions {stats['decisions']:6d}  p50 {stats['p50_ms']:8.2f} ms  "
+              f"p90 {stats['p90_ms']:8.2f} ms  p99 {stats['p99_ms']:8.2f} ms  max {stats['max_ms']:8.2f} ms  "
+              f"{stats['nodes_per_decision']:.0f} nodes/decision  {stats['fallbacks']} fallbacks")
+
+
+def main(argv: Optional[Sequence[str]] = None):
+    parser = argparse.ArgumentParser(description="Play MazeRunnerAI against MazeMasterAI headlessly.")
+    parser.add_argument("--games", type=int, default=20, help="number of games to play")
+    parser.add_argument("--size", type=int, default=24, help="grid size")
+    parser.add_argument("--depth", type=int, default=3, help="Maze Master iterative-deepening depth")
+    parser.add_argument("--time", type=float, default=None,
+                        help="Maze Master seconds per decision (default: search to --depth)")
+    parser.add_argument("--runner-planner", choices=RUNNER_PLANNERS, default="astar",
+                        help="path planner of the Runner AI")
+    parser.add_argument("--master-strategy", choices=MASTER_STRATEGIES, default="minimax",
+                        help="search strategy of the Maze Master AI")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the first game; game i uses seed + i")
+    parser.add_argument("--max-plies", type=int, default=1000, help="plies before a game counts as a draw")
+    parser.add_argument("--processes", type=int, default=1, help="games played in parallel")
+    parser.add_argument("--out", default=None, help="JSONL file receiving one line per game")
+    args = parser.parse_args(argv)
+
+    results = []
+    out = open(args.out, "w") if args.out else None
+    try:
+        for result in run_tournament(args.games, args.seed, args.size, args.depth, args.time,
+                                     args.max_plies, args.processes, args.runner_planner,
+                                     args.master_strategy):
+            results.append(result)
+            if out is not None:
+                out.write(json.dumps(result) + "\n")
+                out.flush()
+            print(f"game {result['game']:4d}  {result['winner']:>6}  plies {result['plies']:4d}  "
+                  f"coverage {result['coverage']:.1%}", file=sys.stderr)
+    finally:
+        if out is not None:
+            out.close()
+    print_summary(summarize(results))
+
+
+if __name__ == "__main__":
+    main()
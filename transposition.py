@@ -0,0 +1,128 @@
+# A3 Game with AI
+
+# Members:
+# Banuag, Carl
+# Deen, Marfred
+# Ferolino, Jilliane
+# Rodriguez, Andrea
+# Rulete, Jeric
+# Torres, John Angelo
+
+"""Zobrist hashing and a fixed-size transposition table for MazeMasterAI.
+
+A position is hashed as the XOR of one random 64-bit key per wall tile, one
+for the runner's tile, one per available Maze Master skill and one for the
+side to move. Placing or breaking a wall, moving the runner or spending a
+skill each flip a few keys, so child hashes are computed incrementally
+instead of hashing the whole wall set.
+"""
+
+import random
+from array import array
+from typing import Iterable, Optional, Tuple
+
+# Bound types stored with every search result
+EXACT = 0
+LOWER_BOUND = 1  # The search failed high: true value >= stored value
+UPPER_BOUND = 2  # The search failed low: true value <= stored value
+
+ZOBRIST_SEED = 170
+
+
+class ZobristKeys:
+    """Random keys for every hashed component of a search position"""
+
+    def __init__(self, grid_size: int, seed: int = ZOBRIST_SEED):
+        rng = random.Random(seed)
+        cells = grid_size * grid_size
+        self.grid_size = grid_size
+        self.wall = array("Q", (rng.getrandbits(64) for _ in range(cells)))
+        self.player = array("Q", (rng.getrandbits(64) for _ in range(cells)))
+        self.skills = tuple(rng.getrandbits(64) for _ in range(3))
+        self.maximizing = rng.getrandbits(64)
+
+    def wall_key(self, tiles: Iterable[Tuple[int, int]]) -> int:
+        """XOR of the wall keys of the given tiles"""
+        size = self.grid_size
+        wall = self.wall
+        key = 0
+        for x, y in tiles:
+            key ^= wall[y * size + x]
+        return key
+
+    def player_key(self, pos: Tuple[int, int]) -> int:
+        return self.player[pos[1] * self.grid_size + pos[0]]
+
+    def skill_key(self, skill_1_available: bool, skill_2_available: bool, skill_3_available: bool) -> int:
+        key = 0
+        for available, skill in zip((skill_1_available, skill_2_available, skill_3_available), self.skills):
+            if available:
+                key ^= skill
+        return key
+
+    def position_key(self, player_pos: Tuple[int, int], walls: Iterable[Tuple[int, int]]) -> int:
+        """Hash of the board alone (walls and runner), used to cache leaf evaluations"""
+        return self.wall_key(walls) ^ self.player_key(player_pos)
+
+    def node_key(self, player_pos: Tuple[int, int], walls: Iterable[Tuple[int, int]],
+                 skill_1_available: bool, skill_2_available: bool, skill_3_available: bool,
+                 is_maximizing: bool) -> int:
+        """Full search-node hash, computed from scratch (children update it incrementally)"""
+        key = self.position_key(player_pos, walls)
+        key ^= self.skill_key(skill_1_available, skill_2_available, skill_3_available)
+        if is_maximizing:
+            key ^= self.maximizing
+        return key
+
+
+class TranspositionTable:
+    """Fixed-size table of search results with depth-preferred replacement.
+
+    Slots come in pairs: the first keeps the deepest result seen for its
+    bucket (replaced only by an equal-or-deeper search or once it is from an
+    older turn), the second always takes the newest result. Entries survive
+    between turns, so positions reached again after the runner moves are not
+    searched from scratch.
+    """
+
+    def __init__(self, size_bits: int = 18):
+        self.buckets = 1 << size_bits
+        self.mask = self.buckets - 1
+        # Entry layout: (key, depth, value, bound, best_move, generation)
+        self.slots: list = [None] * (2 * self.buckets)
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+
+    def new_search(self):
+        """Age existing entries so the next search may overwrite them first"""
+        self.generation += 1
+
+    def clear(self):
+        self.slots = [None] * (2 * self.buckets)
+        self.generation = 0
+
+    def probe(self, key: int) -> Optional[tuple]:
+        """Return the stored entry for key, or None"""
+        slot = (key & self.mask) << 1
+        for entry in (self.slots[slot], self.slots[slot + 1]):
+            if entry is not None and entry[0] == key:
+                self.hits += 1
+                return entry
+        self.misses += 1
+        return None
+
+    def store(self, key: int, depth: int, value: float, bound: int, best_move=None):
+        slot = (key & self.mask) << 1
+        entry = (key, depth, value, bound, best_move, self.generation)
+        deep = self.slots[slot]
+        if deep is not None and deep[0] == key and depth < deep[1] and deep[3] == EXACT:
+            return  # A shallower (e.g. null-window) re-search must not evict a deeper exact result
+        if (deep is None or deep[0] == key or deep[5] != self.generation
+                or depth >= deep[1]):
+            # Keep an exact result's move if a shallower re-search of the same node has none
+            if deep is not None and deep[0] == key and best_move is None:
+                entry = (key, depth, value, bound, deep[4], self.generation)
+            self.slots[slot] = entry
+        else:
+            self.slots[slot + 1] = entry
@@ -0,0 +1,331 @@
+# A3 Game with AI
+
+# Members:
+# Banuag, Carl
+# Deen, Marfred
+# Ferolino, Jilliane
+# Rodriguez, Andrea
+# Rulete, Jeric
+# Torres, John Angelo
+
+"""Node-aware wall candidate generation for MazeMasterAI.
+
+Candidates come from the runner's shortest-path DAG at the searched node:
+every cell with dist_from_runner + dist_to_goal == shortest distance. Cells
+that are alone in their DAG layer are choke points - every shortest path
+crosses them - so a wall that covers a whole layer is guaranteed to make the
+runner detour. Those placements are measured exactly; the rest are ranked
+by how many shortest paths they cut.
+
+A PathImpactOracle answers those questions per placement without touching
+the walls: path counts through the covered cells come from the DAG by
+inclusion-exclusion, and only placements that cut every shortest path pay
+for a search. That search repairs only the cut region: the runner's and
+the goal's wavefronts are exact up to the step before they first touch the
+covered cells, so they are resumed from checkpoints kept for the position
+and a short wavefront connects the two around the cut, giving up a bounded
+number of steps past the old path length.
+"""
+
+import heapq
+from itertools import combinations
+from typing import Dict, Iterable, List, Tuple
+
+from bitboard import HORIZONTAL, VERTICAL
+from game_state import protected_mask
+from search_board import SearchBoard
+
+# Cutting placements whose detour is measured with a bounded repair search
+EXACT_LENGTHENING_LIMIT = 16
+# Steps past the old path length a repair search follows before it settles for a lower bound
+REPAIR_LIMIT = 256
+# DAG cells (highest path flow first) that seed candidate placements
+SOURCE_CELL_LIMIT = 48
+# Wavefront steps between the checkpoints a repair resumes from
+CHECKPOINT_STRIDE = 8
+
+
+def shortest_path_dag(board: SearchBoard):
+    """Layers, forward and backward path counts of the runner's shortest-path DAG.
+
+    Returns (layers, forward_counts, backward_counts) where layers[k] lists the
+    cell indices k steps from the runner on some shortest path, or None if the
+    runner cannot reach the goal.
+    """
+    goal_dist = board.get_goal_field().dist
+    neighbors = board.grid.tables.neighbors
+    start = board.grid.index(board.player_pos)
+    total = goal_dist[start]
+    if total < 0:
+        return None
+
+    # Walk downhill on the goal distances: those edges are exactly the DAG edges
+    layers: List[List[int]] = [[start]]
+    forward: Dict[int, int] = {start: 1}
+    for _ in range(total):
+        next_layer = []
+        for cell in layers[-1]:
+            downhill = goal_dist[cell] - 1
+            count = forward[cell]
+            for nxt in neighbors[cell]:
+                if goal_dist[nxt] == downhill:
+                    if nxt in forward:
+                        forward[nxt] += count
+                    else:
+                        forward[nxt] = count
+                        next_layer.append(nxt)
+        layers.append(next_layer)
+
+    # The last layer is the goal itself; count paths back up towards the runner
+    # (every downhill neighbor of a DAG cell is itself in the DAG, one layer further on)
+    backward: Dict[int, int] = {cell: 1 for cell in layers[-1]}
+    for layer in reversed(layers[:-1]):
+        for cell in layer:
+            downhill = goal_dist[cell] - 1
+            count = 0
+            for nxt in neighbors[cell]:
+                if goal_dist[nxt] == downhill:
+                    count += backward[nxt]
+            backward[cell] = count
+    return layers, forward, backward
+
+
+class PathImpactOracle:
+    """How a wall placement would change the runner's shortest path, without placing it.
+
+    Built once per position from the goal distances (backward BFS layers)
+    and the shortest-path DAG with its forward and backward path counts.
+    """
+
+    def __init__(self, board: SearchBoard, dag=None, repair_limit: int = REPAIR_LIMIT):
+        self.grid = board.grid
+        self.goal_dist = board.get_goal_field().dist
+        self.start = board.grid.index(board.player_pos)
+        self.goal = board.grid.index(board.end_pos)
+        self.repair_limit = repair_limit
+        dag = shortest_path_dag(board) if dag is None else dag
+        self.reachable = dag is not None
+        if dag is None:
+            return
+        self.layers, self.forward, self.backward = dag
+        self.length = len(self.layers) - 1
+        self.total_paths = self.forward[self.start] * self.backward[self.start]
+        self.layer_of = {cell: depth for depth, layer in enumerate(self.layers) for cell in layer}
+        # Wavefronts from the runner and from the goal, grown as repairs need them: (frontier, seen)
+        # every CHECKPOINT_STRIDE steps, and the furthest step computed with its frontier and seen
+        self.checkpoints: Dict[int, List[Tuple[int, int]]] = {}
+        self.tips: Dict[int, Tuple[int, int, int]] = {}
+
+    def dag_cells(self, cells: Iterable[int]) -> List[int]:
+        """The cells that lie on some shortest path, ordered by layer"""
+        layer_of = self.layer_of
+        return sorted((cell for cell in cells if cell in layer_of), key=layer_of.__getitem__)
+
+    def paths_between(self, a: int, b: int) -> int:
+        """Shortest-path DAG paths from cell a down to cell b (a's layer above b's)"""
+        goal_dist = self.goal_dist
+        neighbors = self.grid.tables.neighbors
+        gap = self.layer_of[b] - self.layer_of[a]
+        if gap == 1:
+            # Adjacent layers: every edge between two DAG cells there is a DAG edge
+            return 1 if b in neighbors[a] else 0
+        target = goal_dist[b]
+        counts = {a: 1}
+        for _ in range(gap):
+            step: Dict[int, int] = {}
+            for cell, count in counts.items():
+                downhill = goal_dist[cell] - 1
+                for nxt in neighbors[cell]:
+                    # Stay inside the DAG and never pass below b's distance
+                    if goal_dist[nxt] == downhill and nxt in self.layer_of and downhill >= target:
+                        step[nxt] = step.get(nxt, 0) + count
+            counts = step
+        return counts.get(b, 0)
+
+    def paths_through_all(self, cells: Tuple[int, ...]) -> int:
+        """Shortest paths passing every one of cells (given in layer order)"""
+        layer_of = self.layer_of
+        count = self.forward[cells[0]] * self.backward[cells[-1]]
+        for a, b in zip(cells, cells[1:]):
+            if layer_of[a] == layer_of[b]:
+                return 0
+            count *= self.paths_between(a, b)
+            if not count:
+                return 0
+        return count
+
+    def cut_paths(self, cells: List[int]) -> int:
+        """Shortest paths through at least one of the DAG cells (in layer order), by inclusion-exclusion"""
+        cut = self.flow(cells)
+        for size in range(2, len(cells) + 1):
+            sign = 1 if size % 2 else -1
+            for subset in combinations(cells, size):
+                cut += sign * self.paths_through_all(subset)
+        return cut
+
+    def flow(self, cells: List[int]) -> int:
+        """Sum of the paths through each DAG cell: an upper bound on cut_paths, exact for one cell"""
+        forward, backward = self.forward, self.backward
+        return sum(forward[cell] * backward[cell] for cell in cells)
+
+    def blocks_all(self, cells: List[int]) -> bool:
+        """Whether walls on these DAG cells (in layer order) would leave no shortest path"""
+        if not cells or self.flow(cells) < self.total_paths:
+            return False
+        forward, backward, total = self.forward, self.backward, self.total_paths
+        if any(forward[cell] * backward[cell] == total for cell in cells):
+            return True  # A choke point: every shortest path crosses it
+        return self.cut_paths(cells) == total
+
+    def spread(self, frontier: int, open_cells: int, seen: int) -> int:
+        """Cells one step from frontier that are open and not yet seen"""
+        tables = self.grid.tables
+        size = self.grid.size
+        return (((frontier & tables.not_last_col) << 1) | ((frontier & tables.not_first_col) >> 1) |
+                (frontier << size) | (frontier >> size)) & open_cells & ~seen
+
+    def clear_wavefront(self, source: int, cut: int) -> Tuple[int, int, int]:
+        """Step, frontier and seen of the wavefront from source just before it first reaches cut.
+
+        Up to there no shortest route from source crosses cut, so walling it
+        off changes none of these distances. The wavefront runs on the
+        current walls and is kept, so later cuts resume from a checkpoint.
+        """
+        if source not in self.tips:
+            self.checkpoints[source] = [(1 << source, 1 << source)]
+            self.tips[source] = (0, 1 << source, 1 << source)
+        checkpoints = self.checkpoints[source]
+        step, frontier, seen = self.tips[source]
+        if seen & cut:
+            # seen only grows, so the checkpoints clear of cut come first
+            low, high = 1, len(checkpoints)
+            while low < high:
+                middle = (low + high) // 2
+                if checkpoints[middle][1] & cut:
+                    high = middle
+                else:
+                    low = middle + 1
+            step = (low - 1) * CHECKPOINT_STRIDE
+            frontier, seen = checkpoints[low - 1]
+        open_cells = self.grid.tables.full & ~self.grid.walls
+        while True:
+            ahead = self.spread(frontier, open_cells, seen)
+            if not ahead or ahead & cut:
+                break
+            frontier = ahead
+            seen |= ahead
+            step += 1
+            if step % CHECKPOINT_STRIDE == 0 and step // CHECKPOINT_STRIDE == len(checkpoints):
+                checkpoints.append((frontier, seen))
+        if step > self.tips[source][0]:
+            self.tips[source] = (step, frontier, seen)
+        return step, frontier, seen
+
+    def lengthening(self, cells: Iterable[int]) -> Tuple[float, bool]:
+        """Extra steps the runner needs once cells are walls, and whether the figure is exact.
+
+        Placements that leave a shortest path cost nothing and need no search.
+        Otherwise only the cut region is searched: the runner's wavefront is
+        exact for a steps (until just before it reaches the cells) and the
+        goal's for b, so the new length is a + b plus the steps a wavefront
+        from the runner's frontier needs to reach the goal's ball around the
+        cells. It gives up repair_limit steps past the old length and returns
+        the limit as a lower bound.
+        """
+        if not self.reachable:
+            return 0, True
+        cells = list(cells)
+        if not self.blocks_all(self.dag_cells(cells)):
+            return 0, True
+
+        cut = 0
+        for cell in cells:
+            cut |= 1 << cell
+        steps, frontier, seen = self.clear_wavefront(self.start, cut)
+        open_cells = self.grid.tables.full & ~self.grid.walls & ~cut
+        # A cut that traps the runner mostly leaves it a small pocket, so the goal's
+        # side is only fetched once the frontier outlives CHECKPOINT_STRIDE steps
+        passed = []
+        while frontier and len(passed) < CHECKPOINT_STRIDE:
+            passed.append(frontier)
+            frontier = self.spread(frontier, open_cells, seen)
+            seen |= frontier
+        if not frontier and not seen >> self.goal & 1:
+            return float('inf'), True
+        goal_steps, _, goal_ball = self.clear_wavefront(self.goal, cut)
+        steps += goal_steps
+        # The two balls are disjoint (a + b < length), so the frontier enters the goal's ball at its edge
+        limit = self.length + self.repair_limit
+        for old_frontier in passed:
+            if old_frontier & goal_ball:
+                return steps - self.length, True
+            steps += 1
+        while frontier:
+            if frontier & goal_ball:
+                return steps - self.length, True
+            if steps >= limit:
+                return self.repair_limit, False
+            frontier = self.spread(frontier, open_cells, seen)
+            seen |= frontier
+            steps += 1
+        return float('inf'), True
+
+
+def rank_wall_placements(board: SearchBoard) -> List[Tuple[Tuple[int, int], bool]]:
+    """Legal (origin, is_horizontal) placements around the DAG, strongest first"""
+    dag = shortest_path_dag(board)
+    if dag is None:
+        return []
+    oracle = PathImpactOracle(board, dag)
+    forward, backward = oracle.forward, oracle.backward
+    layers, layer_of = oracle.layers, oracle.layer_of
+    total_paths = oracle.total_paths
+
+    grid = board.grid
+    size = grid.size
+    tables = grid.tables
+    blocked = grid.bit(board.player_pos) | grid.bit(board.end_pos) | protected_mask(grid, board.end_pos)
+
+    # Horizontal and vertical placements touching the DAG cells that carry the
+    # most shortest paths (every choke point carries all of them)
+    flow = heapq.nlargest(SOURCE_CELL_LIMIT, layer_of, key=lambda cell: forward[cell] * backward[cell])
+    legal = {shape: grid.legal_origins(shape, blocked) for shape in (HORIZONTAL, VERTICAL)}
+    origins = set()
+    for cell in flow:
+        for shape in (HORIZONTAL, VERTICAL):
+            legal_origins = legal[shape]
+            for offset in tables.offsets[shape]:
+                origin_index = cell - offset
+                if origin_index >= 0 and (legal_origins >> origin_index) & 1:
+                    origins.add((origin_index, shape))
+
+    scored = []
+    cutters = []
+    for origin_index, shape in origins:
+        covered = oracle.dag_cells(origin_index + offset for offset in tables.offsets[shape])
+        if not covered:
+            continue
+        # Paths through the covered cells (a path through two of them is counted twice)
+        cut_paths = oracle.flow(covered)
+        # Covering every cell of a layer is the plainest way to block every shortest path
+        per_layer: Dict[int, int] = {}
+        for cell in covered:
+            per_layer[layer_of[cell]] = per_layer.get(layer_of[cell], 0) + 1
+        chokes = any(len(layers[depth]) == count for depth, count in per_layer.items())
+        entry = [0, chokes, min(1.0, cut_paths / total_paths), min(per_layer), origin_index, shape]
+        scored.append(entry)
+        if oracle.blocks_all(covered):
+            cutters.append(entry)
+
+    # Measure the real detour of the strongest placements that leave no shortest path
+    cutters.sort(key=lambda entry: -entry[1])
+    for rank, entry in enumerate(cutters):
+        if rank >= EXACT_LENGTHENING_LIMIT:
+            # Grid paths between two cells all have the same parity, so a detour is at least 2 steps
+            entry[0] = 2
+            continue
+        extra, _ = oracle.lengthening(entry[4] + offset for offset in tables.offsets[entry[5]])
+        entry[0] = max(extra, 2)
+
+    scored.sort(key=lambda entry: (-entry[0], -entry[2], entry[3]))
+    return [((entry[4] % size, entry[4] // size), entry[5] == HORIZONTAL) for entry in scored]